@@ -0,0 +1,360 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Rate limiting and retries shared by all Google Ads API calls.
+
+`CallPolicy.call` runs a call, such as a `search_stream` and the reading of
+its batches, after taking a token from two buckets: one per developer token,
+the unit of the API's quota, and one per customer. Concurrent callers are
+thereby spread out instead of running into quota errors together.
+
+Calls failing with a transient status (RESOURCE_EXHAUSTED, UNAVAILABLE,
+DEADLINE_EXCEEDED, ABORTED) are retried with exponential backoff and full
+jitter. The retry delay of a quota error is honored and also holds back the
+other callers sharing the exhausted quota: the customer for
+RESOURCE_TEMPORARILY_EXHAUSTED, the developer token otherwise. Errors whose
+retry delay exceeds the longest backoff, such as an exhausted daily quota,
+are not retried.
+
+Settings are read from the environment:
+  GOOGLE_ADS_MCP_MAX_RETRIES: retries of a failed call (default 3).
+  GOOGLE_ADS_MCP_QPS: calls per second per developer token, 0 for no limit
+      (default 0).
+  GOOGLE_ADS_MCP_CUSTOMER_QPS: calls per second per customer, 0 for no limit
+      (default 0).
+"""
+
+import datetime
+import importlib
+import logging
+import os
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, TypeVar
+
+from ads_mcp import telemetry
+from ads_mcp.rate_limit import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+_MAX_RETRIES_ENV = "GOOGLE_ADS_MCP_MAX_RETRIES"
+_QPS_ENV = "GOOGLE_ADS_MCP_QPS"
+_CUSTOMER_QPS_ENV = "GOOGLE_ADS_MCP_CUSTOMER_QPS"
+_DEVELOPER_TOKEN_ENV = "GOOGLE_ADS_DEVELOPER_TOKEN"
+
+_DEFAULT_MAX_RETRIES = 3
+_FAILURE_KEY_SUFFIX = ".errors.googleadsfailure-bin"
+INITIAL_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+
+TRANSIENT_CODES = frozenset(
+    ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "DEADLINE_EXCEEDED", "ABORTED")
+)
+
+T = TypeVar("T")
+
+RETRIES = telemetry.counter(
+    "google_ads_mcp_api_retries_total",
+    "Google Ads API calls retried after a transient error, by status.",
+    ("code",),
+)
+GAVE_UP = telemetry.counter(
+    "google_ads_mcp_api_retries_exhausted_total",
+    "Google Ads API calls that failed with a transient error once retries "
+    "were exhausted or not allowed, by status.",
+    ("code",),
+)
+THROTTLED = telemetry.counter(
+    "google_ads_mcp_api_throttled_total",
+    "Google Ads API calls delayed by a rate limit or a quota retry delay, by "
+    "the developer_token or customer scope that delayed them.",
+    ("scope",),
+)
+THROTTLE_SECONDS = telemetry.counter(
+    "google_ads_mcp_api_throttled_seconds_total",
+    "Seconds Google Ads API calls were delayed before being sent, by scope.",
+    ("scope",),
+)
+
+
+def _get_env_number(name: str, default: float, cast: type) -> Any:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        number = cast(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}.")
+    if number < 0:
+        raise ValueError(f"{name} must not be negative.")
+    return number
+
+
+def get_status_code(error: BaseException) -> str | None:
+    """Returns the gRPC status name of a failed call, e.g. "UNAVAILABLE".
+
+    Handles GoogleAdsException, the google.api_core exceptions the client
+    library raises for other failures and raw grpc.RpcError.
+    """
+    # GoogleAdsException wraps the failed call in `error`.
+    call = getattr(error, "error", None)
+    if call is not None and callable(getattr(call, "code", None)):
+        return call.code().name
+    status = getattr(error, "grpc_status_code", None)
+    if status is not None:
+        return status.name
+    if callable(getattr(error, "code", None)):
+        try:
+            return error.code().name
+        except Exception:
+            return None
+    return None
+
+
+def is_transient(error: BaseException) -> bool:
+    """Returns whether a failed call may succeed if retried."""
+    return get_status_code(error) in TRANSIENT_CODES
+
+
+def _get_failure(error: BaseException) -> Any:
+    """Returns the GoogleAdsFailure of a failed call, or None.
+
+    The client library only parses it into a GoogleAdsException for errors
+    it doesn't retry itself; RESOURCE_EXHAUSTED surfaces as a
+    google.api_core exception whose call still carries it in the trailing
+    metadata.
+    """
+    failure = getattr(error, "failure", None)
+    if failure is not None:
+        return failure
+    call = getattr(error, "response", None) or error
+    try:
+        metadata = call.trailing_metadata() or ()
+    except Exception:
+        return None
+    for key, value in metadata:
+        if key.endswith(_FAILURE_KEY_SUFFIX):
+            # google.ads.googleads.<version>.errors.googleadsfailure-bin
+            version = key.split(".")[3]
+            errors = importlib.import_module(
+                f"google.ads.googleads.{version}.errors.types.errors"
+            )
+            try:
+                return errors.GoogleAdsFailure.deserialize(value)
+            except Exception:
+                return None
+    return None
+
+
+def _get_quota_hint(error: BaseException) -> tuple:
+    """Returns the retry delay of a quota error and whether it is per customer.
+
+    The delay is in seconds, None when the error doesn't carry one.
+    """
+    failure = _get_failure(error)
+    delay = None
+    per_customer = False
+    for failure_error in getattr(failure, "errors", ()):
+        quota_error = failure_error.error_code.quota_error
+        per_customer |= getattr(quota_error, "name", "") == (
+            "RESOURCE_TEMPORARILY_EXHAUSTED"
+        )
+        retry_delay = failure_error.details.quota_error_details.retry_delay
+        if not retry_delay:
+            continue
+        if isinstance(retry_delay, datetime.timedelta):
+            seconds = retry_delay.total_seconds()
+        else:
+            seconds = retry_delay.seconds + retry_delay.nanos / 1e9
+        if seconds > 0:
+            delay = max(delay or 0, seconds)
+    return delay, per_customer
+
+
+class CallPolicy:
+    """Rate limits and retries Google Ads API calls; thread-safe."""
+
+    def __init__(
+        self,
+        developer_token_qps: float | None = None,
+        customer_qps: float | None = None,
+        max_retries: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ):
+        """Initializes the policy.
+
+        Args:
+            developer_token_qps: calls per second per developer token,
+                defaults to GOOGLE_ADS_MCP_QPS; 0 means no limit.
+            customer_qps: calls per second per customer, defaults to
+                GOOGLE_ADS_MCP_CUSTOMER_QPS; 0 means no limit.
+            max_retries: retries of a failed call, defaults to
+                GOOGLE_ADS_MCP_MAX_RETRIES.
+            clock: returns the current time in seconds.
+            sleep: waits for the given number of seconds.
+            rng: the source of the backoff jitter.
+        """
+        if developer_token_qps is None:
+            developer_token_qps = _get_env_number(_QPS_ENV, 0, float)
+        if customer_qps is None:
+            customer_qps = _get_env_number(_CUSTOMER_QPS_ENV, 0, float)
+        if max_retries is None:
+            max_retries = _get_env_number(
+                _MAX_RETRIES_ENV, _DEFAULT_MAX_RETRIES, int
+            )
+        self.developer_token_qps = developer_token_qps
+        self.customer_qps = customer_qps
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+        self._buckets: Dict[Hashable, TokenBucket] = {}
+        # (scope, key) -> clock time before which no call is sent
+        self._blocked_until: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def call(
+        self,
+        func: Callable[[], T],
+        customer_id: str | None = None,
+        developer_token: str | None = None,
+    ) -> T:
+        """Runs `func`, retrying it on transient errors.
+
+        Args:
+            func: makes the API call. For streaming calls it must also read
+                the stream, so a failure mid-stream is retried as a whole.
+            customer_id: the customer the call is made for, if any.
+            developer_token: defaults to GOOGLE_ADS_DEVELOPER_TOKEN.
+
+        Raises:
+            The error of the last attempt, once retries are exhausted or for
+            errors that aren't transient.
+        """
+        if developer_token is None:
+            developer_token = os.environ.get(_DEVELOPER_TOKEN_ENV, "")
+        scopes = [("developer_token", developer_token)]
+        if customer_id:
+            scopes.append(("customer", str(customer_id)))
+        attempt = 0
+        while True:
+            self._throttle(scopes)
+            try:
+                return func()
+            except Exception as error:
+                code = get_status_code(error)
+                if code not in TRANSIENT_CODES:
+                    raise
+                delay = self._get_delay(error, attempt, scopes)
+                if attempt >= self.max_retries or delay is None:
+                    GAVE_UP.inc(code)
+                    raise
+                attempt += 1
+                RETRIES.inc(code)
+                logger.warning(
+                    "Google Ads API call failed with %s, retry %d of %d in "
+                    "%.1f s",
+                    code,
+                    attempt,
+                    self.max_retries,
+                    delay,
+                )
+                self._sleep(delay)
+
+    def _throttle(self, scopes: list) -> None:
+        """Waits for the quota retry delays and the rate limits of `scopes`."""
+        for scope in scopes:
+            with self._lock:
+                blocked_until = self._blocked_until.get(scope, 0.0)
+            wait = blocked_until - self._clock()
+            if wait > 0:
+                self._record_wait(scope[0], wait)
+                self._sleep(wait)
+        for scope in scopes:
+            bucket = self._get_bucket(scope)
+            if bucket is not None:
+                wait = bucket.acquire()
+                if wait:
+                    self._record_wait(scope[0], wait)
+
+    def _get_delay(
+        self, error: BaseException, attempt: int, scopes: list
+    ) -> float | None:
+        """Returns the backoff before the next attempt, None to give up."""
+        backoff = self._rng.uniform(
+            0, min(MAX_BACKOFF_SECONDS, INITIAL_BACKOFF_SECONDS * 2**attempt)
+        )
+        retry_delay, per_customer = _get_quota_hint(error)
+        if retry_delay is None:
+            return backoff
+        if retry_delay > MAX_BACKOFF_SECONDS:
+            return None
+        # Other callers sharing the exhausted quota wait as well.
+        scope = scopes[-1] if per_customer else scopes[0]
+        until = self._clock() + retry_delay
+        with self._lock:
+            self._blocked_until[scope] = max(
+                self._blocked_until.get(scope, 0.0), until
+            )
+        return max(retry_delay, backoff)
+
+    def _get_bucket(self, scope: tuple) -> TokenBucket | None:
+        rate = (
+            self.developer_token_qps
+            if scope[0] == "developer_token"
+            else self.customer_qps
+        )
+        if rate <= 0:
+            return None
+        bucket = self._buckets.get(scope)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(scope)
+                if bucket is None:
+                    bucket = TokenBucket(
+                        rate, clock=self._clock, sleep=self._sleep
+                    )
+                    self._buckets[scope] = bucket
+        return bucket
+
+    def _record_wait(self, scope: str, seconds: float) -> None:
+        THROTTLED.inc(scope)
+        THROTTLE_SECONDS.inc(scope, amount=seconds)
+
+
+_policy: CallPolicy | None = None
+_policy_lock = threading.Lock()
+
+
+def get_policy() -> CallPolicy:
+    """Returns the process-wide policy, configured from the environment."""
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = CallPolicy()
+    return _policy
+
+
+def call(
+    func: Callable[[], T],
+    customer_id: str | None = None,
+    developer_token: str | None = None,
+) -> T:
+    """Runs `func` with the process-wide policy, see `CallPolicy.call`."""
+    return get_policy().call(func, customer_id, developer_token)
@@ -19,6 +19,53 @@ server using `@mcp.tool` annotations, thereby 'coordinating' the bootstrapping
 of the server.
 """
 
+import time
+from typing import Any, Dict
+
 from mcp.server.fastmcp import FastMCP
 
-mcp = FastMCP("Google Ads Server")
+from ads_mcp import executor
+from ads_mcp import profiling
+from ads_mcp import telemetry
+
+TOOL_DURATION = telemetry.histogram(
+    "google_ads_mcp_tool_duration_seconds",
+    "End-to-end duration of tool calls, including the conversion of the "
+    "result, by tool and status.",
+    ("tool", "status"),
+)
+
+
+class _InstrumentedFastMCP(FastMCP):
+    """FastMCP recording the duration of every tool call.
+
+    Tool calls are also profiled with `ads_mcp.profiling` when profiling is
+    enabled or requested by the call.
+    """
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        started = time.perf_counter()
+        status = "error"
+        try:
+            request_context = self._mcp_server.request_context
+        except LookupError:
+            request_context = None
+        force = profiling.requested(request_context)
+        # Tools run inline block the event loop thread, which is then the
+        # one to sample; offloaded tools are sampled in their worker.
+        sample_loop = executor.get_max_workers() == 0
+        try:
+            async with profiling.profile_async(
+                f"tool-{name}", force=force, sample_caller=sample_loop
+            ):
+                result = await super().call_tool(name, arguments)
+            status = "ok"
+            return result
+        finally:
+            TOOL_DURATION.observe(time.perf_counter() - started, name, status)
+
+
+mcp = _InstrumentedFastMCP("Google Ads Server")
+
+# Served by the SSE app; the stdio transport has no HTTP routes.
+mcp.custom_route("/metrics", methods=["GET"])(telemetry.metrics_endpoint)
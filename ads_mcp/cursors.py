@@ -0,0 +1,224 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Server-side cursors for paginated tool results.
+
+A cursor keeps the row iterator of a query (usually a generator wrapping a
+`search_stream` call) alive between tool calls, so that each page is read from
+the same underlying stream instead of re-running the query. Cursors expire
+after a period of inactivity, at which point the iterator is closed, which in
+turn cancels the stream.
+
+GOOGLE_ADS_MCP_CURSOR_TTL_SECONDS sets the inactivity timeout (default 300)
+and GOOGLE_ADS_MCP_MAX_CURSORS the number of cursors kept open at once
+(default 32); when the limit is reached the least recently used one is closed.
+"""
+
+import collections
+import itertools
+import logging
+import os
+import secrets
+import threading
+import time
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+_TTL_ENV = "GOOGLE_ADS_MCP_CURSOR_TTL_SECONDS"
+_MAX_CURSORS_ENV = "GOOGLE_ADS_MCP_MAX_CURSORS"
+_DEFAULT_TTL_SECONDS = 300.0
+_DEFAULT_MAX_CURSORS = 32
+
+# Upper bound for a single page, regardless of what the caller asks for.
+MAX_PAGE_SIZE = 10000
+
+_END_OF_ROWS = object()
+
+
+class CursorNotFoundError(ValueError):
+    """Raised when a cursor is unknown, exhausted or has expired."""
+
+
+class _Cursor:
+    """A row iterator together with its paging state."""
+
+    def __init__(self, rows: Iterator[Any], page_size: int, ttl: float):
+        self.rows = rows
+        self.page_size = page_size
+        self.ttl = ttl
+        self.expires_at = time.monotonic() + ttl
+        self.lock = threading.Lock()
+        self._peeked: Any = _END_OF_ROWS
+
+    def read_page(self, page_size: int) -> tuple[List[Any], bool]:
+        """Returns the next page and whether more rows are available."""
+        page: List[Any] = []
+        if self._peeked is not _END_OF_ROWS:
+            page.append(self._peeked)
+            self._peeked = _END_OF_ROWS
+        page.extend(itertools.islice(self.rows, page_size - len(page)))
+        # Look one row ahead so the last page doesn't hand out a cursor
+        # that would only ever return an empty page.
+        self._peeked = next(self.rows, _END_OF_ROWS)
+        self.expires_at = time.monotonic() + self.ttl
+        return page, self._peeked is not _END_OF_ROWS
+
+    def close(self) -> None:
+        close = getattr(self.rows, "close", None)
+        if close is not None:
+            try:
+                close()
+            except Exception:
+                logger.exception("Failed to close cursor iterator")
+
+
+def _get_env_number(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number, got {value!r}.")
+
+
+def _clamp_page_size(page_size: int) -> int:
+    page_size = int(page_size)
+    if page_size <= 0:
+        raise ValueError("page_size must be a positive integer.")
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+class CursorStore:
+    """Thread-safe registry of open cursors."""
+
+    def __init__(
+        self, ttl_seconds: float | None = None, max_cursors: int | None = None
+    ):
+        if ttl_seconds is None:
+            ttl_seconds = _get_env_number(_TTL_ENV, _DEFAULT_TTL_SECONDS)
+        if max_cursors is None:
+            max_cursors = int(
+                _get_env_number(_MAX_CURSORS_ENV, _DEFAULT_MAX_CURSORS)
+            )
+        self._ttl = ttl_seconds
+        self._max_cursors = max(1, max_cursors)
+        self._cursors: collections.OrderedDict[str, _Cursor] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def open(self, rows: Iterator[Any], page_size: int) -> Dict[str, Any]:
+        """Registers `rows` and returns its first page.
+
+        Args:
+            rows: an iterator over the formatted result rows.
+            page_size: the maximum number of rows per page.
+
+        Returns:
+            A dict with the `rows` of the first page and a `next_cursor`, which
+            is None when the first page already holds every row.
+        """
+        cursor = _Cursor(iter(rows), _clamp_page_size(page_size), self._ttl)
+        with cursor.lock:
+            page, has_more = cursor.read_page(cursor.page_size)
+        if not has_more:
+            cursor.close()
+            return {"rows": page, "next_cursor": None}
+
+        cursor_id = secrets.token_urlsafe(16)
+        evicted = []
+        with self._lock:
+            evicted.extend(self._pop_expired())
+            while len(self._cursors) >= self._max_cursors:
+                evicted.append(self._cursors.popitem(last=False)[1])
+            self._cursors[cursor_id] = cursor
+        self._close_all(evicted)
+        return {"rows": page, "next_cursor": cursor_id}
+
+    def next_page(
+        self, cursor_id: str, page_size: int | None = None
+    ) -> Dict[str, Any]:
+        """Returns the next page of an open cursor.
+
+        Args:
+            cursor_id: the `next_cursor` returned by the previous page.
+            page_size: optional override of the page size the cursor was
+                opened with.
+
+        Returns:
+            A dict with the `rows` of the page and a `next_cursor`, which is
+            None once the last page has been returned.
+
+        Raises:
+            CursorNotFoundError: if the cursor is unknown or has expired.
+        """
+        with self._lock:
+            expired = self._pop_expired()
+            cursor = self._cursors.get(cursor_id)
+            if cursor is not None:
+                self._cursors.move_to_end(cursor_id)
+        self._close_all(expired)
+        if cursor is None:
+            raise CursorNotFoundError(
+                f"Cursor {cursor_id!r} is unknown or has expired; "
+                "run the search again."
+            )
+
+        size = cursor.page_size if page_size is None else page_size
+        with cursor.lock:
+            page, has_more = cursor.read_page(_clamp_page_size(size))
+
+        with self._lock:
+            registered = self._cursors.get(cursor_id) is cursor
+            if registered and not has_more:
+                del self._cursors[cursor_id]
+        if not (registered and has_more):
+            cursor.close()
+        return {"rows": page, "next_cursor": cursor_id if has_more else None}
+
+    def close(self, cursor_id: str) -> bool:
+        """Closes a cursor early. Returns False if it was not open."""
+        with self._lock:
+            cursor = self._cursors.pop(cursor_id, None)
+        if cursor is None:
+            return False
+        self._close_all([cursor])
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cursors)
+
+    def _pop_expired(self) -> List[_Cursor]:
+        """Removes expired cursors; must be called with the lock held."""
+        now = time.monotonic()
+        expired_ids = [
+            cursor_id
+            for cursor_id, cursor in self._cursors.items()
+            if cursor.expires_at <= now
+        ]
+        return [self._cursors.pop(cursor_id) for cursor_id in expired_ids]
+
+    @staticmethod
+    def _close_all(cursors: List[_Cursor]) -> None:
+        for cursor in cursors:
+            # A cursor that is being read right now is closed by its reader
+            # once it notices it was unregistered; never block on it here.
+            if cursor.lock.acquire(blocking=False):
+                try:
+                    cursor.close()
+                finally:
+                    cursor.lock.release()
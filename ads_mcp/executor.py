@@ -0,0 +1,130 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Worker pool used to run blocking Google Ads API calls off the event loop.
+
+The Google Ads client is synchronous: `search_stream` blocks while it waits on
+gRPC and while the caller iterates the batches. Tools registered with the MCP
+server are therefore wrapped with `offload`, which runs them in a bounded
+thread pool so that a single slow report can't stall the other clients of an
+SSE server.
+
+The pool size is read from the GOOGLE_ADS_MCP_MAX_WORKERS environment variable
+and doubles as the per-process cap on concurrent tool executions. Setting it to
+0 disables offloading and tools run inline, as they did originally.
+"""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import os
+import threading
+from typing import Any, Callable, TypeVar
+
+from ads_mcp import profiling
+
+logger = logging.getLogger(__name__)
+
+_MAX_WORKERS_ENV = "GOOGLE_ADS_MCP_MAX_WORKERS"
+_DEFAULT_MAX_WORKERS = 8
+
+T = TypeVar("T")
+
+_executor: concurrent.futures.ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_max_workers() -> int:
+    """Returns the configured worker count, 0 meaning tools run inline."""
+    value = os.environ.get(_MAX_WORKERS_ENV)
+    if not value:
+        return _DEFAULT_MAX_WORKERS
+    try:
+        max_workers = int(value)
+    except ValueError:
+        raise ValueError(
+            f"{_MAX_WORKERS_ENV} must be an integer, got {value!r}."
+        )
+    if max_workers < 0:
+        raise ValueError(f"{_MAX_WORKERS_ENV} must not be negative.")
+    return max_workers
+
+
+def get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    """Returns the process-wide worker pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                max_workers = get_max_workers() or _DEFAULT_MAX_WORKERS
+                logger.info(
+                    "Starting Google Ads worker pool with %d workers",
+                    max_workers,
+                )
+                _executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=max_workers,
+                    thread_name_prefix="ads-mcp-worker",
+                )
+    return _executor
+
+
+def shutdown(wait: bool = True) -> None:
+    """Shuts down the worker pool; a new one is created on next use."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+
+async def run_in_worker(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Runs `func` in the worker pool and waits for it without blocking.
+
+    Args:
+        func: the blocking callable to run.
+        *args: positional arguments for `func`.
+        **kwargs: keyword arguments for `func`.
+
+    Returns:
+        The return value of `func`.
+    """
+    loop = asyncio.get_running_loop()
+    # The worker joins the profile of the calling tool, if there is one.
+    return await loop.run_in_executor(
+        get_executor(), functools.partial(profiling.bind(func), *args, **kwargs)
+    )
+
+
+def offload(func: Callable[..., T]) -> Callable[..., Any]:
+    """Wraps a blocking tool function so it runs in the worker pool.
+
+    The wrapper keeps the name, docstring and signature of `func`, so it can be
+    registered with `mcp.add_tool` in place of the original function. When
+    offloading is disabled the function is returned unchanged.
+
+    Args:
+        func: the blocking tool function.
+
+    Returns:
+        A coroutine function with the same signature as `func`.
+    """
+    if get_max_workers() == 0:
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await run_in_worker(func, *args, **kwargs)
+
+    return wrapper
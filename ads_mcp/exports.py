@@ -0,0 +1,309 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Export of search results to local files.
+
+`export` writes rows, given as lists of values in the order of the fields,
+to a new file as they are produced, so a search of hundreds of thousands of
+rows is streamed from the API to disk without being held in memory. The file
+is written under a temporary name and renamed once complete, so a failed
+export never leaves a truncated file behind.
+
+Formats:
+  ndjson: one JSON object per line, keyed by field name.
+  csv: a header line with the field names, then one line per row. Repeated
+      and message values are written as JSON.
+  parquet: row groups of PARQUET_ROW_GROUP_SIZE rows. Requires pyarrow,
+      which is not a dependency of the server. The schema is built from the
+      column types given by the caller, not inferred from the first rows, as
+      a column empty in the first row group may be filled in later ones.
+      Columns of unknown type and message values are written as JSON
+      strings.
+
+Settings are read from the environment:
+  GOOGLE_ADS_MCP_EXPORT_DIR: directory the files are written to (default
+      "exports").
+  GOOGLE_ADS_MCP_EXPORT_RESOURCES: 1 also serves every export as an MCP
+      resource, for clients that can't read the server's file system
+      (default 0).
+"""
+
+import contextlib
+import csv
+import datetime
+import itertools
+import json
+import logging
+import os
+import re
+import secrets
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DIRECTORY_ENV = "GOOGLE_ADS_MCP_EXPORT_DIR"
+_DEFAULT_DIRECTORY = "exports"
+_RESOURCES_ENV = "GOOGLE_ADS_MCP_EXPORT_RESOURCES"
+
+PARQUET_ROW_GROUP_SIZE = 50_000
+
+# (type name, repeated) of a column, as returned by utils.get_row_value_types,
+# or None when unknown.
+ColumnType = Tuple[str, bool] | None
+
+EXTENSIONS = {"ndjson": ".ndjson", "csv": ".csv", "parquet": ".parquet"}
+MIME_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+# Order in which the types of a column are listed. Other types are written
+# as strings.
+_JSON_TYPES = {
+    type(None): "null",
+    bool: "boolean",
+    int: "integer",
+    float: "number",
+    str: "string",
+    list: "array",
+    dict: "object",
+}
+
+
+def get_directory() -> str:
+    return os.environ.get(_DIRECTORY_ENV) or _DEFAULT_DIRECTORY
+
+
+def serve_as_resources() -> bool:
+    """Returns whether exports are also served as MCP resources."""
+    return os.environ.get(_RESOURCES_ENV, "0").lower() in ("1", "true")
+
+
+def check_format(format: str) -> None:
+    """Raises ValueError if files can't be exported in `format`."""
+    if format not in EXTENSIONS:
+        raise ValueError(
+            f"Unknown export format {format!r}, expected one of: "
+            f"{', '.join(EXTENSIONS)}."
+        )
+    if format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError(
+                "Exporting to parquet requires pyarrow, install it with "
+                "`pip install pyarrow` or use the ndjson or csv format."
+            )
+
+
+def export(
+    rows: Iterable[List[Any]],
+    fields: List[str],
+    format: str,
+    name: str,
+    directory: str | None = None,
+    column_types: List[ColumnType] | None = None,
+) -> Dict[str, Any]:
+    """Writes `rows` to a new file and describes it.
+
+    Args:
+        rows: lists of values in the order of `fields`, consumed once.
+        fields: the names of the columns.
+        format: one of "ndjson", "csv" or "parquet".
+        name: the start of the file name, e.g. the resource searched.
+        directory: where to write the file, defaults to
+            GOOGLE_ADS_MCP_EXPORT_DIR.
+        column_types: the type of each column, used for the parquet schema;
+            columns are of unknown type when omitted.
+
+    Returns:
+        {"path", "format", "row_count", "size_bytes", "columns"}, the columns
+        being [{"name": ..., "type": ...}] with the JSON types seen in the
+        column, e.g. "integer" or "integer|string".
+    """
+    check_format(format)
+    directory = directory or get_directory()
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+    file_name = (
+        f"{_UNSAFE_NAME.sub('_', name)}-{stamp}-{secrets.token_hex(4)}"
+        f"{EXTENSIONS[format]}"
+    )
+    path = os.path.abspath(os.path.join(directory, file_name))
+    partial_path = path + ".partial"
+
+    if column_types is None:
+        column_types = [None] * len(fields)
+    schema = _Schema(fields)
+    try:
+        _WRITERS[format](
+            partial_path, fields, schema.observe(rows), column_types
+        )
+        os.replace(partial_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(partial_path)
+        raise
+    logger.info("Exported %d rows to %s", schema.row_count, path)
+    return {
+        "path": path,
+        "format": format,
+        "row_count": schema.row_count,
+        "size_bytes": os.path.getsize(path),
+        "columns": schema.columns(),
+    }
+
+
+class _Schema:
+    """Counts the rows passing through and the value types of each column."""
+
+    def __init__(self, fields: List[str]):
+        self.fields = fields
+        self.row_count = 0
+        self._types = [set() for _ in fields]
+
+    def observe(self, rows: Iterable[List[Any]]) -> Iterator[List[Any]]:
+        for row in rows:
+            for types, value in zip(self._types, row):
+                types.add(type(value))
+            self.row_count += 1
+            yield row
+
+    def columns(self) -> List[Dict[str, str]]:
+        return [
+            {"name": field, "type": _describe_types(types)}
+            for field, types in zip(self.fields, self._types)
+        ]
+
+
+def _describe_types(types: set) -> str:
+    names = {_JSON_TYPES.get(t, "string") for t in types}
+    if len(names) > 1:
+        # A column is only null where a value couldn't be read.
+        names.discard("null")
+    order = list(_JSON_TYPES.values())
+    return "|".join(sorted(names, key=order.index)) or "null"
+
+
+def _write_ndjson(
+    path: str,
+    fields: List[str],
+    rows: Iterable[List[Any]],
+    column_types: List[ColumnType],
+) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        for row in rows:
+            file.write(
+                json.dumps(
+                    dict(zip(fields, row)),
+                    ensure_ascii=False,
+                    separators=(",", ":"),
+                    default=str,
+                )
+            )
+            file.write("\n")
+
+
+def _write_csv(
+    path: str,
+    fields: List[str],
+    rows: Iterable[List[Any]],
+    column_types: List[ColumnType],
+) -> None:
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(fields)
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def _write_parquet(
+    path: str,
+    fields: List[str],
+    rows: Iterable[List[Any]],
+    column_types: List[ColumnType],
+) -> None:
+    import pyarrow
+    from pyarrow import parquet
+
+    schema = pyarrow.schema(
+        (field, _get_arrow_type(pyarrow, column_type))
+        for field, column_type in zip(fields, column_types)
+    )
+    encoders = [
+        _get_parquet_encoder(column_type) for column_type in column_types
+    ]
+    with parquet.ParquetWriter(path, schema) as writer:
+        rows = iter(rows)
+        while chunk := list(itertools.islice(rows, PARQUET_ROW_GROUP_SIZE)):
+            columns = [
+                [encode(row[index]) for row in chunk]
+                for index, encode in enumerate(encoders)
+            ]
+            writer.write_table(pyarrow.table(columns, schema=schema))
+
+
+def _get_arrow_type(pyarrow: Any, column_type: ColumnType) -> Any:
+    """Returns the Arrow type of a column, strings for unknown types."""
+    if column_type is None:
+        return pyarrow.string()
+    name, repeated = column_type
+    item_type = {
+        "integer": pyarrow.int64(),
+        "number": pyarrow.float64(),
+        "boolean": pyarrow.bool_(),
+        "bytes": pyarrow.binary(),
+    }.get(name, pyarrow.string())
+    return pyarrow.list_(item_type) if repeated else item_type
+
+
+def _get_parquet_encoder(column_type: ColumnType) -> Callable[[Any], Any]:
+    """Returns the conversion of the values of a column to its Arrow type."""
+    if column_type is None:
+        return _json_string
+    name, repeated = column_type
+    if name != "object":
+        return _identity
+    if repeated:
+        return lambda values: (
+            None if values is None else [_json_string(v) for v in values]
+        )
+    return _json_string
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _json_string(value: Any) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+_WRITERS: Dict[
+    str,
+    Callable[[str, List[str], Iterable[List[Any]], List[ColumnType]], None],
+] = {
+    "ndjson": _write_ndjson,
+    "csv": _write_csv,
+    "parquet": _write_parquet,
+}
@@ -0,0 +1,530 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Local stand-in for the Google Ads API, for load tests and benchmarks.
+
+Serves `GoogleAdsService.SearchStream`, `GoogleAdsService.Search` and
+`CustomerService.ListAccessibleCustomers` over plaintext gRPC, so the MCP
+server can be exercised through its real client path: the service pool,
+`MCPHeaderInterceptor`, the interceptors of the client library and the
+batching of `search_stream`. Point the server at it with
+`utils.use_fake_server(address)` or the GOOGLE_ADS_MCP_FAKE_SERVER
+environment variable.
+
+Rows are synthesized for the fields selected by the query: every field is set
+to a value derived from the row number and its type. The number of rows, the
+size of the stream batches, a latency per batch and injected errors are
+configurable, and can be changed while the server runs.
+
+Usage:
+    python -m ads_mcp.fake_server [--port PORT] [--rows N] [--batch-size N]
+        [--batch-latency SECONDS] [--error-rate FRACTION]
+        [--error-code RESOURCE_EXHAUSTED|UNAVAILABLE]
+"""
+
+import argparse
+import collections
+import datetime
+import importlib
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent import futures
+from typing import Any, Deque, Dict, Iterator, List, Sequence, Tuple
+
+import grpc
+from google.ads.googleads import client as client_module
+from google.protobuf import descriptor
+
+from ads_mcp import utils
+
+_QUERY = re.compile(
+    r"^\s*SELECT\s+(?P<fields>.+?)\s+FROM\s+(?P<resource>\w+)",
+    re.IGNORECASE | re.DOTALL,
+)
+_LIMIT = re.compile(r"\bLIMIT\s+(\d+)\s*$", re.IGNORECASE)
+
+# Error codes that can be injected, and the quota error reported with them.
+INJECTABLE_ERRORS = ("RESOURCE_EXHAUSTED", "UNAVAILABLE")
+
+_FIRST_DATE = datetime.date(2025, 1, 1)
+_MAX_CACHED_QUERIES = 32
+_MAX_RECORDED_CALLS = 1000
+
+
+class FakeServerConfig:
+    """Behavior of the fake server; attributes may be changed at any time."""
+
+    def __init__(
+        self,
+        rows: int = 1000,
+        batch_size: int = 10000,
+        batch_latency: float = 0.0,
+        page_size: int = 10000,
+        customers: int = 3,
+        error_rate: float = 0.0,
+        error_code: str = "RESOURCE_EXHAUSTED",
+        error_after_batches: int = 0,
+        retry_delay: float = 0.0,
+    ):
+        """Initializes the configuration.
+
+        Args:
+            rows: the number of rows returned by each query, before LIMIT.
+            batch_size: the number of rows per SearchStream response.
+            batch_latency: seconds to wait before sending each batch or page.
+            page_size: the number of rows per Search page.
+            customers: the number of accessible customers.
+            error_rate: the probability for a call to fail with `error_code`.
+            error_code: the status code of injected errors, one of
+                INJECTABLE_ERRORS.
+            error_after_batches: the number of batches a failing SearchStream
+                call sends before the error.
+            retry_delay: seconds reported as the retry delay of injected
+                RESOURCE_EXHAUSTED errors, 0 for none.
+        """
+        self.rows = rows
+        self.batch_size = batch_size
+        self.batch_latency = batch_latency
+        self.page_size = page_size
+        self.customers = customers
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.error_after_batches = error_after_batches
+        self.retry_delay = retry_delay
+
+
+class FakeGoogleAdsServer:
+    """In-process gRPC server implementing a subset of the Google Ads API."""
+
+    def __init__(
+        self,
+        config: FakeServerConfig | None = None,
+        version: str | None = None,
+        address: str = "localhost:0",
+        max_workers: int = 16,
+    ):
+        """Initializes the server; call `start` to serve.
+
+        Args:
+            config: the behavior of the server, defaults to FakeServerConfig().
+            version: the API version served, defaults to the default version
+                of the client library.
+            address: the address to listen on; port 0 picks a free port.
+            max_workers: the number of calls served concurrently.
+        """
+        self.config = config or FakeServerConfig()
+        self.version = version or client_module._DEFAULT_VERSION
+        self.address = address
+        # (method, metadata) of the most recent calls.
+        self.calls: Deque[Tuple[str, Dict[str, str]]] = collections.deque(
+            maxlen=_MAX_RECORDED_CALLS
+        )
+        self._max_workers = max_workers
+        self._server = None
+        self._forced_errors: Deque[str] = collections.deque()
+        self._batches: "collections.OrderedDict[tuple, List[bytes]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        prefix = f"google.ads.googleads.{self.version}"
+        ads_types = importlib.import_module(
+            f"{prefix}.services.types.google_ads_service"
+        )
+        customer_types = importlib.import_module(
+            f"{prefix}.services.types.customer_service"
+        )
+        self._errors = importlib.import_module(f"{prefix}.errors.types.errors")
+        self._quota_error = importlib.import_module(
+            f"{prefix}.errors.types.quota_error"
+        ).QuotaErrorEnum.QuotaError
+        self._query_error = importlib.import_module(
+            f"{prefix}.errors.types.query_error"
+        ).QueryErrorEnum.QueryError
+        self._row_class = ads_types.GoogleAdsRow.pb()
+        self._stream_response_class = (
+            ads_types.SearchGoogleAdsStreamResponse.pb()
+        )
+        self._search_response_class = ads_types.SearchGoogleAdsResponse.pb()
+        self._customers_response_class = (
+            customer_types.ListAccessibleCustomersResponse.pb()
+        )
+        self._failure_key = f"{prefix}.errors.googleadsfailure-bin"
+        stream_request = ads_types.SearchGoogleAdsStreamRequest.pb()
+        search_request = ads_types.SearchGoogleAdsRequest.pb()
+        customers_request = customer_types.ListAccessibleCustomersRequest.pb()
+        self._handlers = [
+            grpc.method_handlers_generic_handler(
+                f"{prefix}.services.GoogleAdsService",
+                {
+                    "SearchStream": grpc.unary_stream_rpc_method_handler(
+                        self._search_stream,
+                        request_deserializer=stream_request.FromString,
+                        # Batches are serialized once and cached.
+                        response_serializer=_identity,
+                    ),
+                    "Search": grpc.unary_unary_rpc_method_handler(
+                        self._search,
+                        request_deserializer=search_request.FromString,
+                        response_serializer=_serialize,
+                    ),
+                },
+            ),
+            grpc.method_handlers_generic_handler(
+                f"{prefix}.services.CustomerService",
+                {
+                    "ListAccessibleCustomers": (
+                        grpc.unary_unary_rpc_method_handler(
+                            self._list_accessible_customers,
+                            request_deserializer=customers_request.FromString,
+                            response_serializer=_serialize,
+                        )
+                    ),
+                },
+            ),
+        ]
+
+    def start(self) -> str:
+        """Starts serving and returns the address to connect to."""
+        server = grpc.server(
+            futures.ThreadPoolExecutor(
+                max_workers=self._max_workers,
+                thread_name_prefix="fake-google-ads",
+            )
+        )
+        server.add_generic_rpc_handlers(self._handlers)
+        host = self.address.rsplit(":", 1)[0]
+        port = server.add_insecure_port(self.address)
+        server.start()
+        self._server = server
+        self.address = f"{host}:{port}"
+        return self.address
+
+    def stop(self, grace: float | None = None) -> None:
+        if self._server is not None:
+            self._server.stop(grace).wait()
+            self._server = None
+
+    def __enter__(self) -> "FakeGoogleAdsServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def fail_next(self, code: str = "RESOURCE_EXHAUSTED", count: int = 1):
+        """Makes the next `count` calls fail with the status code `code`."""
+        _check_error_code(code)
+        with self._lock:
+            self._forced_errors.extend([code] * count)
+
+    def _search_stream(self, request, context) -> Iterator[bytes]:
+        self._record("SearchStream", context)
+        error_code = self._next_error()
+        batches = self._get_batches(request.customer_id, request.query, context)
+        for i, batch in enumerate(batches):
+            if error_code and i >= self.config.error_after_batches:
+                break
+            if self.config.batch_latency:
+                time.sleep(self.config.batch_latency)
+            yield batch
+        if error_code:
+            self._abort(context, error_code)
+
+    def _search(self, request, context):
+        self._record("Search", context)
+        error_code = self._next_error()
+        if error_code:
+            self._abort(context, error_code)
+        fields, rows = self._get_rows(
+            request.customer_id, request.query, context
+        )
+        start = int(request.page_token or 0)
+        end = start + self.config.page_size
+        if self.config.batch_latency:
+            time.sleep(self.config.batch_latency)
+        response = self._search_response_class(
+            results=rows[start:end],
+            next_page_token=str(end) if end < len(rows) else "",
+        )
+        response.field_mask.paths.extend(fields)
+        if request.search_settings.return_total_results_count:
+            response.total_results_count = len(rows)
+        return response
+
+    def _list_accessible_customers(self, request, context):
+        self._record("ListAccessibleCustomers", context)
+        error_code = self._next_error()
+        if error_code:
+            self._abort(context, error_code)
+        return self._customers_response_class(
+            resource_names=[
+                f"customers/{1_000_000_000 + i}"
+                for i in range(self.config.customers)
+            ]
+        )
+
+    def _record(self, method: str, context) -> None:
+        self.calls.append((method, dict(context.invocation_metadata())))
+
+    def _next_error(self) -> str | None:
+        with self._lock:
+            if self._forced_errors:
+                return self._forced_errors.popleft()
+        if self.config.error_rate and random.random() < self.config.error_rate:
+            _check_error_code(self.config.error_code)
+            return self.config.error_code
+        return None
+
+    def _get_batches(
+        self, customer_id: str, query: str, context
+    ) -> List[bytes]:
+        """Returns the serialized SearchStream responses of a query.
+
+        Responses are cached per query, and also per customer only when the
+        query selects a field whose value depends on the customer.
+        """
+        per_customer = "customer.id" in query or "resource_name" in query
+        key = (
+            customer_id if per_customer else None,
+            query,
+            self.config.rows,
+            self.config.batch_size,
+        )
+        with self._lock:
+            batches = self._batches.get(key)
+            if batches is not None:
+                self._batches.move_to_end(key)
+                return batches
+        fields, rows = self._get_rows(customer_id, query, context)
+        batch_size = max(self.config.batch_size, 1)
+        batches = []
+        for start in range(0, max(len(rows), 1), batch_size):
+            response = self._stream_response_class(
+                results=rows[start : start + batch_size],
+                request_id=uuid.uuid4().hex,
+            )
+            response.field_mask.paths.extend(fields)
+            batches.append(response.SerializeToString())
+        with self._lock:
+            self._batches[key] = batches
+            while len(self._batches) > _MAX_CACHED_QUERIES:
+                self._batches.popitem(last=False)
+        return batches
+
+    def _get_rows(
+        self, customer_id: str, query: str, context
+    ) -> Tuple[List[str], List[Any]]:
+        match = _QUERY.match(query)
+        if not match:
+            self._abort_invalid(
+                context, self._query_error.UNEXPECTED_END_OF_QUERY, query
+            )
+        fields = [field.strip() for field in match.group("fields").split(",")]
+        count = self.config.rows
+        limit = _LIMIT.search(query)
+        if limit:
+            count = min(count, int(limit.group(1)))
+        rows = []
+        for i in range(count):
+            row = self._row_class()
+            for field in fields:
+                if not _set_field(row, field, i, customer_id):
+                    self._abort_invalid(
+                        context,
+                        self._query_error.UNRECOGNIZED_FIELD,
+                        f"Unrecognized field in the query: '{field}'.",
+                    )
+            rows.append(row)
+        return fields, rows
+
+    def _abort(self, context, code: str) -> None:
+        error_code = {}
+        details = None
+        if code == "RESOURCE_EXHAUSTED":
+            error_code["quota_error"] = self._quota_error.RESOURCE_EXHAUSTED
+            if self.config.retry_delay:
+                details = {
+                    "quota_error_details": {
+                        "retry_delay": datetime.timedelta(
+                            seconds=self.config.retry_delay
+                        )
+                    }
+                }
+        self._abort_with_failure(
+            context,
+            getattr(grpc.StatusCode, code),
+            error_code,
+            f"Injected {code} error from the fake Google Ads server.",
+            details,
+        )
+
+    def _abort_invalid(self, context, query_error: Any, message: str) -> None:
+        self._abort_with_failure(
+            context,
+            grpc.StatusCode.INVALID_ARGUMENT,
+            {"query_error": query_error},
+            message,
+        )
+
+    def _abort_with_failure(
+        self,
+        context,
+        status: grpc.StatusCode,
+        error_code: dict,
+        message: str,
+        details: dict | None = None,
+    ) -> None:
+        request_id = uuid.uuid4().hex
+        metadata = [("request-id", request_id)]
+        if error_code:
+            failure = self._errors.GoogleAdsFailure(
+                errors=[
+                    {
+                        "error_code": error_code,
+                        "message": message,
+                        "details": details,
+                    }
+                ],
+                request_id=request_id,
+            )
+            metadata.append(
+                (
+                    self._failure_key,
+                    self._errors.GoogleAdsFailure.serialize(failure),
+                )
+            )
+        context.set_trailing_metadata(metadata)
+        context.abort(status, message)
+
+
+def _identity(value: bytes) -> bytes:
+    return value
+
+
+def _serialize(message: Any) -> bytes:
+    return message.SerializeToString()
+
+
+def _check_error_code(code: str) -> None:
+    if code not in INJECTABLE_ERRORS:
+        raise ValueError(
+            f"Can't inject {code!r} errors, use one of {INJECTABLE_ERRORS}."
+        )
+
+
+def _set_field(row: Any, path: str, i: int, customer_id: str) -> bool:
+    """Sets the field `path` of a raw GoogleAdsRow to a synthetic value.
+
+    Returns:
+        False if the row has no such field.
+    """
+    *parents, name = path.split(".")
+    message = row
+    for parent in parents:
+        field = _get_field_descriptor(message, parent)
+        if (
+            field is None
+            or field.type != descriptor.FieldDescriptor.TYPE_MESSAGE
+        ):
+            return False
+        message = getattr(message, field.name)
+    field = _get_field_descriptor(message, name)
+    if field is None:
+        return False
+    if field.type == descriptor.FieldDescriptor.TYPE_MESSAGE:
+        getattr(message, field.name).SetInParent()
+        return True
+    value = _synthetic_value(field, path, i, customer_id)
+    if utils._is_repeated_field(field):
+        getattr(message, field.name).append(value)
+    else:
+        setattr(message, field.name, value)
+    return True
+
+
+def _get_field_descriptor(message: Any, name: str) -> Any:
+    # Reserved words such as `type` are declared with a trailing underscore.
+    fields = message.DESCRIPTOR.fields_by_name
+    return fields.get(name) or fields.get(f"{name}_")
+
+
+def _synthetic_value(field: Any, path: str, i: int, customer_id: str) -> Any:
+    types = descriptor.FieldDescriptor
+    if field.type == types.TYPE_ENUM:
+        values = field.enum_type.values
+        # Skips UNSPECIFIED and UNKNOWN when there are other values.
+        real = values[2:] or values
+        return real[i % len(real)].number
+    if field.type == types.TYPE_BOOL:
+        return i % 2 == 0
+    if field.type in (types.TYPE_DOUBLE, types.TYPE_FLOAT):
+        return (i % 1000) / 10
+    if field.type == types.TYPE_STRING:
+        if field.name == "resource_name":
+            resource = path.rsplit(".", 1)[0]
+            return f"customers/{customer_id}/{resource}s/{i}"
+        if path in ("segments.date", "segments.week"):
+            return (_FIRST_DATE + datetime.timedelta(days=i % 365)).isoformat()
+        if path in ("segments.month", "segments.quarter"):
+            return _FIRST_DATE.replace(month=1 + i % 12).isoformat()
+        return f"{field.name} {i}"
+    if field.type == types.TYPE_BYTES:
+        return str(i).encode()
+    if path == "customer.id":
+        return int(customer_id)
+    return i
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=50051)
+    parser.add_argument("--version", default=None)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--batch-latency", type=float, default=0.0)
+    parser.add_argument("--customers", type=int, default=3)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--error-code", choices=INJECTABLE_ERRORS, default="RESOURCE_EXHAUSTED"
+    )
+    args = parser.parse_args(argv)
+
+    config = FakeServerConfig(
+        rows=args.rows,
+        batch_size=args.batch_size,
+        batch_latency=args.batch_latency,
+        customers=args.customers,
+        error_rate=args.error_rate,
+        error_code=args.error_code,
+    )
+    server = FakeGoogleAdsServer(
+        config, args.version, f"{args.host}:{args.port}"
+    )
+    address = server.start()
+    print(f"Fake Google Ads API {server.version} listening on {address}")
+    print(f"Run the MCP server with GOOGLE_ADS_MCP_FAKE_SERVER={address}")
+    try:
+        server._server.wait_for_termination()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory index of the GAQL resources and fields in gaql_resources.json.
+
+The index is loaded on first use. It answers the schema lookups of the
+reference tools, so the full field table no longer has to be shipped in the
+description of the `search` tool, and lets `search` reject invalid fields,
+conditions and orderings before making a request.
+"""
+
+import difflib
+import json
+import re
+import sys
+import threading
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+import ads_mcp.utils as utils
+
+SELECTABLE = 1
+FILTERABLE = 2
+SORTABLE = 4
+
+_FLAGS = (
+    ("selectable", SELECTABLE),
+    ("filterable", FILTERABLE),
+    ("sortable", SORTABLE),
+)
+
+# Resources whose fields can be selected from any other resource, as long as
+# the API doesn't report an incompatibility through `selectable_with`.
+_SHARED_RESOURCES = ("metrics", "segments")
+
+# The field a condition or ordering starts with, e.g. `campaign.status` in
+# "campaign.status = 'ENABLED'".
+_LEADING_FIELD = re.compile(r"^\s*([A-Za-z_]\w*(?:\.\w+)+)")
+
+_index: "GaqlIndex | None" = None
+_index_lock = threading.Lock()
+
+
+class _Resource:
+    __slots__ = ("fields", "selectable_with")
+
+    def __init__(
+        self,
+        fields: Dict[str, Tuple[str, ...]],
+        selectable_with: FrozenSet[str] | None,
+    ):
+        self.fields = fields
+        self.selectable_with = selectable_with
+
+
+class GaqlIndex:
+    """Lookup tables of GAQL resources and their fields."""
+
+    def __init__(self, resources: List[Dict[str, Any]]):
+        """Builds the index.
+
+        Args:
+            resources: the entries of gaql_resources.json, each with a
+                `resource` name, lists of `selectable`, `filterable` and
+                `sortable` fields and, optionally, the `selectable_with`
+                list reported by the API for the resource.
+        """
+        self._resources: Dict[str, _Resource] = {}
+        self._flags: Dict[str, int] = {}
+        for entry in resources:
+            fields = {}
+            for kind, flag in _FLAGS:
+                names = tuple(sys.intern(name) for name in entry.get(kind, ()))
+                for name in names:
+                    self._flags[name] = self._flags.get(name, 0) | flag
+                fields[kind] = names
+            selectable_with = entry.get("selectable_with")
+            if selectable_with is not None:
+                selectable_with = frozenset(
+                    sys.intern(name) for name in selectable_with
+                )
+            self._resources[sys.intern(entry["resource"])] = _Resource(
+                fields, selectable_with
+            )
+        self._fields = sorted(self._flags)
+
+    @classmethod
+    def from_file(cls, path: Any) -> "GaqlIndex":
+        with open(path, "r") as file:
+            return cls(json.load(file))
+
+    def resource_names(self) -> List[str]:
+        """Returns the names of all resources, sorted."""
+        return sorted(self._resources)
+
+    def describe(self, resource: str) -> Dict[str, Any]:
+        """Returns the selectable, filterable and sortable fields of a resource.
+
+        Raises:
+            ValueError: if the resource is unknown.
+        """
+        entry = self._get_resource(resource)
+        return {
+            "resource": resource,
+            **{kind: list(names) for kind, names in entry.fields.items()},
+        }
+
+    def find_fields(
+        self, text: str, resource: str | None = None, limit: int = 50
+    ) -> List[str]:
+        """Returns fields containing `text`, prefix matches first.
+
+        Args:
+            text: the text to look for, matched case-insensitively.
+            resource: optionally restricts the search to the fields of one
+                resource.
+            limit: the maximum number of fields to return.
+
+        Raises:
+            ValueError: if the resource is unknown.
+        """
+        if resource is None:
+            candidates = self._fields
+        else:
+            candidates = self._get_resource(resource).fields["selectable"]
+        needle = text.strip().lower()
+        prefix_matches = []
+        substring_matches = []
+        for field in candidates:
+            lowered = field.lower()
+            if lowered.startswith(needle):
+                prefix_matches.append(field)
+            elif needle in lowered:
+                substring_matches.append(field)
+        return (prefix_matches + substring_matches)[: max(limit, 0)]
+
+    def get_flags(self, field: str) -> int:
+        """Returns the SELECTABLE, FILTERABLE and SORTABLE bits of a field."""
+        return self._flags.get(field, 0)
+
+    def validate_query(
+        self,
+        fields: Sequence[str],
+        resource: str,
+        conditions: Sequence[str] | None = None,
+        orderings: Sequence[str] | None = None,
+    ) -> None:
+        """Checks the parts of a search against the index.
+
+        Conditions and orderings that don't start with a field name are left
+        for the API to check.
+
+        Raises:
+            ValueError: naming the first invalid resource, field, condition or
+                ordering.
+        """
+        entry = self._get_resource(resource)
+        for field in fields:
+            field = field.strip()
+            self._check_field(field, SELECTABLE, "fields", field)
+            if not self._is_selectable_with(field, resource, entry):
+                raise ValueError(
+                    f"Field '{field}' can't be selected together with "
+                    f"resource '{resource}'."
+                )
+        for condition in conditions or ():
+            match = _LEADING_FIELD.match(condition)
+            if match:
+                self._check_field(
+                    match.group(1), FILTERABLE, "conditions", condition
+                )
+        for ordering in orderings or ():
+            match = _LEADING_FIELD.match(ordering)
+            if match:
+                self._check_field(
+                    match.group(1), SORTABLE, "orderings", ordering
+                )
+
+    def _check_field(self, field: str, flag: int, part: str, clause: str):
+        flags = self._flags.get(field)
+        if flags is None:
+            message = f"Unknown field '{field}' in {part}: '{clause}'."
+            suggestions = difflib.get_close_matches(field, self._fields)
+            if suggestions:
+                message += f" Did you mean: {', '.join(suggestions)}?"
+            raise ValueError(message)
+        if not flags & flag:
+            kind = next(kind for kind, bit in _FLAGS if bit == flag)
+            raise ValueError(
+                f"Field '{field}' in {part} is not {kind}: '{clause}'."
+            )
+
+    def _is_selectable_with(
+        self, field: str, resource: str, entry: _Resource
+    ) -> bool:
+        field_resource = field.split(".", 1)[0]
+        if field_resource == resource:
+            return True
+        if entry.selectable_with is None:
+            # Without compatibility data only metrics, segments and attributed
+            # resources can be told apart, and all of them are plausible.
+            return True
+        if field_resource in _SHARED_RESOURCES:
+            return field in entry.selectable_with
+        return field_resource in entry.selectable_with
+
+    def _get_resource(self, resource: str) -> _Resource:
+        entry = self._resources.get(resource)
+        if entry is None:
+            raise ValueError(self._unknown_resource_message(resource))
+        return entry
+
+    def _unknown_resource_message(self, resource: str) -> str:
+        message = f"Unknown resource '{resource}'."
+        suggestions = difflib.get_close_matches(resource, self._resources)
+        if suggestions:
+            message += f" Did you mean: {', '.join(suggestions)}?"
+        return message
+
+
+def get_index() -> GaqlIndex:
+    """Returns the process-wide index, loading it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = GaqlIndex.from_file(
+                    utils.get_gaql_resources_filepath()
+                )
+    return _index
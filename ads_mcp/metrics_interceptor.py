@@ -0,0 +1,100 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Interceptor recording the latency and status of Google Ads API calls."""
+
+import functools
+import time
+from typing import Tuple
+
+import grpc
+
+from ads_mcp import telemetry
+
+RPC_DURATION = telemetry.histogram(
+    "google_ads_mcp_rpc_duration_seconds",
+    "Duration of Google Ads API calls until the last response, by status.",
+    ("service", "method", "code"),
+)
+
+
+@functools.lru_cache(maxsize=64)
+def _split_method(method: str) -> Tuple[str, str]:
+    """Returns the service and method names of a full gRPC method name.
+
+    For example "/google.ads.googleads.v21.services.GoogleAdsService/Search"
+    gives ("GoogleAdsService", "Search").
+    """
+    if isinstance(method, bytes):
+        method = method.decode()
+    service, _, name = method.rpartition("/")
+    return service.rpartition(".")[2], name
+
+
+def _get_error_code(error: Exception) -> str:
+    # GoogleAdsException wraps the failed call in `error`.
+    call = getattr(error, "error", error)
+    code = getattr(call, "code", None)
+    if callable(code):
+        try:
+            return code().name
+        except Exception:
+            pass
+    return grpc.StatusCode.UNKNOWN.name
+
+
+class MetricsInterceptor(
+    grpc.UnaryUnaryClientInterceptor, grpc.UnaryStreamClientInterceptor
+):
+    """Records the duration of every call per service, method and status.
+
+    Streaming calls are measured until the stream completes, so the duration
+    covers all the batches of a `search_stream`.
+    """
+
+    def _intercept(self, continuation, client_call_details, request):
+        started = time.perf_counter()
+        service, method = _split_method(client_call_details.method)
+        try:
+            response = continuation(client_call_details, request)
+        except Exception as error:
+            RPC_DURATION.observe(
+                time.perf_counter() - started,
+                service,
+                method,
+                _get_error_code(error),
+            )
+            raise
+
+        def record(call) -> None:
+            try:
+                code = call.code().name
+            except Exception:
+                code = grpc.StatusCode.UNKNOWN.name
+            RPC_DURATION.observe(
+                time.perf_counter() - started, service, method, code
+            )
+
+        # Runs right away for calls that already completed.
+        response.add_done_callback(record)
+        return response
+
+    def intercept_unary_stream(
+        self, continuation, client_call_details, request
+    ):
+        return self._intercept(continuation, client_call_details, request)
+
+    def intercept_unary_unary(self, continuation, client_call_details, request):
+        return self._intercept(continuation, client_call_details, request)
@@ -0,0 +1,420 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Opt-in sampling profiles and allocation summaries of individual operations.
+
+`profile(name)` brackets an operation, such as a tool call or a phase of the
+sheets sync. While it runs, a background thread samples the stacks of the
+threads taking part every few milliseconds, and tracemalloc traces the
+allocations. When it ends, two files are written and their paths logged:
+
+  <name>.collapsed: the sampled stacks in the collapsed format read by
+      flamegraph.pl and speedscope, one line per distinct stack with its
+      sample count;
+  <name>.txt: the wall time, the number of samples, the traced memory peak
+      and the lines holding the most memory, near the peak and at the end.
+
+The sampler also watches the traced memory and takes an allocation snapshot
+each time it doubles, so transient allocations such as a result being
+converted show up even though they are freed before the end. Doubling keeps
+the cost of the snapshots within about twice that of the last one.
+
+Tracing allocations slows allocation-heavy code down several times, which
+also inflates its share of the samples; it can be turned off to get the
+stacks alone.
+
+The thread entering `profile` is sampled. Work handed to other threads is
+sampled too when the callable is wrapped with `bind` before being submitted.
+Coroutines such as tool calls use `profile_async` instead, which leaves the
+event loop thread out, since it also runs the other clients' requests, and
+writes the files off the loop.
+
+Settings are read from the environment:
+  GOOGLE_ADS_MCP_PROFILE: 1 profiles every tool call and sync phase (default
+      0). Tool calls can also be profiled one at a time, see `requested`.
+  GOOGLE_ADS_MCP_PROFILE_DIR: directory the files are written to (default
+      "profiles").
+  GOOGLE_ADS_MCP_PROFILE_MEMORY: 0 skips the allocation tracing (default 1).
+"""
+
+import contextlib
+import contextvars
+import datetime
+import functools
+import itertools
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Tuple, TypeVar
+
+import anyio
+
+logger = logging.getLogger(__name__)
+
+_ENABLED_ENV = "GOOGLE_ADS_MCP_PROFILE"
+_DIRECTORY_ENV = "GOOGLE_ADS_MCP_PROFILE_DIR"
+_DEFAULT_DIRECTORY = "profiles"
+_MEMORY_ENV = "GOOGLE_ADS_MCP_PROFILE_MEMORY"
+
+# Request header and `_meta` key asking for the profile of one tool call.
+HEADER = "x-ads-mcp-profile"
+META_KEY = "profile"
+
+SAMPLE_INTERVAL_SECONDS = 0.005
+TOP_ALLOCATIONS = 25
+_PEAK_SNAPSHOT_MIN_BYTES = 1 << 20
+
+T = TypeVar("T")
+
+enabled = os.environ.get(_ENABLED_ENV, "0").lower() in ("1", "true")
+trace_memory = os.environ.get(_MEMORY_ENV, "1").lower() not in ("0", "false")
+
+_current: contextvars.ContextVar["Profile | None"] = contextvars.ContextVar(
+    "ads_mcp_profile", default=None
+)
+_sequence = itertools.count(1)
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+_OWN_FILES = (tracemalloc.__file__, __file__)
+
+# tracemalloc is process-wide: it runs while at least one profile is open,
+# and overlapping profiles share its peak.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_owns_tracing = False
+
+
+def get_directory() -> str:
+    return os.environ.get(_DIRECTORY_ENV) or _DEFAULT_DIRECTORY
+
+
+def requested(context: Any) -> bool:
+    """Returns whether an MCP request asks to be profiled.
+
+    A request is profiled when its HTTP request carries the x-ads-mcp-profile
+    header, as sent to the SSE app, or when the `_meta` of the tool call has
+    a true `profile` entry.
+
+    Args:
+        context: the request context of the tool call, or None.
+    """
+    if context is None:
+        return False
+    request = getattr(context, "request", None)
+    headers = getattr(request, "headers", None)
+    if headers is not None and headers.get(HEADER, "0").lower() in (
+        "1",
+        "true",
+    ):
+        return True
+    meta = getattr(context, "meta", None)
+    return bool(meta is not None and getattr(meta, META_KEY, False))
+
+
+def current() -> "Profile | None":
+    """Returns the profile opened by the calling context, if any."""
+    return _current.get()
+
+
+class Profile:
+    """Stack samples and allocations of one profiled operation."""
+
+    def __init__(
+        self,
+        name: str,
+        directory: str,
+        interval: float = SAMPLE_INTERVAL_SECONDS,
+        memory: bool = True,
+    ):
+        self.name = name
+        self.directory = directory
+        self.interval = interval
+        self.memory = memory
+        self.samples: Dict[Tuple[str, ...], int] = {}
+        self.sample_count = 0
+        self.wall_seconds = 0.0
+        self.peak_bytes = 0
+        self.paths: Tuple[str, str] | None = None
+        # thread id -> root frame label of its stacks
+        self._threads: Dict[int, str] = {}
+        self._labels: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: threading.Thread | None = None
+        self._started = 0.0
+        self._start_traced = 0
+        self._peak_snapshot: tracemalloc.Snapshot | None = None
+        self._peak_snapshot_traced = 0
+
+    @contextlib.contextmanager
+    def thread(self, label: str | None = None) -> Iterator[None]:
+        """Samples the calling thread until the block exits.
+
+        Args:
+            label: the root of the thread's stacks, defaults to the thread
+                name. Labels such as an account id split the profile of a
+                thread pool by task.
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            previous = self._threads.get(ident)
+            self._threads[ident] = label or threading.current_thread().name
+        try:
+            yield
+        finally:
+            with self._lock:
+                if previous is None:
+                    del self._threads[ident]
+                else:
+                    self._threads[ident] = previous
+
+    def start(self) -> None:
+        self._sampler = threading.Thread(
+            target=self._run_sampler,
+            name=f"profiler-{self.name}",
+            daemon=True,
+        )
+        if self.memory:
+            _start_tracing()
+            self._start_traced = tracemalloc.get_traced_memory()[0]
+            self._peak_snapshot_traced = self._start_traced
+        self._started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self.wall_seconds = time.perf_counter() - self._started
+        self._stop.set()
+        self._sampler.join()
+        at_peak = held = None
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            self.peak_bytes = max(peak - self._start_traced, 0)
+            held = tracemalloc.take_snapshot()
+            at_peak, self._peak_snapshot = self._peak_snapshot, None
+            _stop_tracing()
+        self.paths = self._write(at_peak, held)
+
+    def _run_sampler(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads.items())
+            for ident, root in threads:
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(root)
+                key = tuple(reversed(stack))
+                self.samples[key] = self.samples.get(key, 0) + 1
+                self.sample_count += 1
+            del frames
+            if self.memory:
+                self._watch_memory()
+
+    def _watch_memory(self) -> None:
+        """Snapshots the allocations when the traced memory has grown."""
+        traced = tracemalloc.get_traced_memory()[0]
+        threshold = max(
+            self._start_traced + _PEAK_SNAPSHOT_MIN_BYTES,
+            2 * self._peak_snapshot_traced - self._start_traced,
+        )
+        if traced > threshold:
+            self._peak_snapshot = tracemalloc.take_snapshot()
+            self._peak_snapshot_traced = traced
+
+    def _label(self, code: Any) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = (
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                f"{code.co_firstlineno})"
+            )
+            self._labels[code] = label
+        return label
+
+    def _write(
+        self,
+        at_peak: tracemalloc.Snapshot | None,
+        held: tracemalloc.Snapshot | None,
+    ) -> Tuple[str, str]:
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(
+            self.directory,
+            f"{datetime.datetime.now():%Y%m%d-%H%M%S}-{next(_sequence)}-"
+            f"{_UNSAFE_NAME.sub('_', self.name)}",
+        )
+        collapsed_path = base + ".collapsed"
+        with open(collapsed_path, "w") as file:
+            for stack, count in sorted(self.samples.items()):
+                file.write(f"{';'.join(stack)} {count}\n")
+
+        summary_path = base + ".txt"
+        with open(summary_path, "w") as file:
+            file.write(f"name: {self.name}\n")
+            file.write(f"wall time: {self.wall_seconds:.3f} s\n")
+            file.write(
+                f"samples: {self.sample_count} every "
+                f"{self.interval * 1000:g} ms\n"
+            )
+            if self.memory:
+                file.write(f"traced memory peak: {self.peak_bytes} bytes\n")
+                traced = self._peak_snapshot_traced - self._start_traced
+                _write_allocations(
+                    file,
+                    f"largest allocations near the peak ({traced} bytes)",
+                    at_peak,
+                )
+                _write_allocations(
+                    file, "largest allocations still held at the end", held
+                )
+        return collapsed_path, summary_path
+
+
+@contextlib.contextmanager
+def profile(name: str, force: bool = False) -> Iterator[Profile | None]:
+    """Profiles the block if profiling is enabled or `force` is set.
+
+    Profiles don't nest: inside a profiled block this is a no-op, so a tool
+    call and the work it triggers end up in one profile.
+
+    Yields:
+        The Profile, or None when the block isn't profiled.
+    """
+    session, token = _open(name, force)
+    if session is None:
+        yield None
+        return
+    try:
+        with session.thread():
+            yield session
+    finally:
+        _current.reset(token)
+        _close(session)
+
+
+@contextlib.asynccontextmanager
+async def profile_async(
+    name: str, force: bool = False, sample_caller: bool = False
+) -> AsyncIterator[Profile | None]:
+    """Profiles an awaited block, such as a tool call, like `profile`.
+
+    The calling thread runs the event loop and is only sampled with
+    `sample_caller`, e.g. when tools run inline and block the loop anyway;
+    otherwise the samples come from the threads joining through `bind`, such
+    as the workers of `executor.run_in_worker`. The profile is stopped and
+    written in a worker thread, as the allocation snapshot and the files
+    would stall the loop.
+
+    Yields:
+        The Profile, or None when the block isn't profiled.
+    """
+    session, token = _open(name, force)
+    if session is None:
+        yield None
+        return
+    try:
+        with session.thread() if sample_caller else contextlib.nullcontext():
+            yield session
+    finally:
+        _current.reset(token)
+        await anyio.to_thread.run_sync(_close, session)
+
+
+def _open(
+    name: str, force: bool
+) -> Tuple[Profile | None, contextvars.Token | None]:
+    """Starts a profile unless disabled or already inside one."""
+    if not (enabled or force) or _current.get() is not None:
+        return None, None
+    session = Profile(name, get_directory(), memory=trace_memory)
+    token = _current.set(session)
+    session.start()
+    return session, token
+
+
+def _close(session: Profile) -> None:
+    """Stops a profile and writes its files, logging failures."""
+    try:
+        session.stop()
+    except Exception:
+        logger.exception("Failed to write the profile of %s", session.name)
+    else:
+        logger.info(
+            "Profile of %s written to %s and %s", session.name, *session.paths
+        )
+
+
+def bind(func: Callable[..., T], label: str | None = None) -> Callable[..., T]:
+    """Wraps `func` so the thread running it joins the current profile.
+
+    Call it from the profiled context, before handing `func` to another
+    thread. Returns `func` unchanged when nothing is being profiled.
+    """
+    session = _current.get()
+    if session is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _current.set(session)
+        try:
+            with session.thread(label):
+                return func(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return wrapper
+
+
+def _start_tracing() -> None:
+    global _tracing_users, _owns_tracing
+    with _tracing_lock:
+        if not _tracing_users:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                _owns_tracing = True
+            tracemalloc.reset_peak()
+        _tracing_users += 1
+
+
+def _stop_tracing() -> None:
+    global _tracing_users, _owns_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if not _tracing_users and _owns_tracing:
+            tracemalloc.stop()
+            _owns_tracing = False
+
+
+def _write_allocations(
+    file: Any, title: str, snapshot: tracemalloc.Snapshot | None
+) -> None:
+    if snapshot is None:
+        return
+    stats = [
+        stat
+        for stat in snapshot.statistics("lineno")
+        if stat.traceback[0].filename not in _OWN_FILES
+    ]
+    file.write(f"{title}:\n")
+    for stat in stats[:TOP_ALLOCATIONS]:
+        file.write(f"  {stat}\n")
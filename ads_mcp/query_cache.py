@@ -0,0 +1,277 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""In-memory cache of GAQL search results.
+
+Entries are keyed on a canonical form of the query and evicted in LRU order
+once the cache holds too many entries or cells (rows times fields, used as a
+cheap proxy for memory). How long an entry stays fresh depends on the
+`segments.date` window of the query:
+
+  - windows that ended before the conversion-lag horizon no longer change and
+    are kept for hours;
+  - windows that ended recently may still receive late conversions and are
+    kept for half an hour;
+  - windows touching today, and queries without a date window, are kept for a
+    few minutes.
+
+Settings are read from the environment:
+  GOOGLE_ADS_MCP_CACHE_MAX_ENTRIES: maximum number of cached queries, 0
+      disables the cache (default 256).
+  GOOGLE_ADS_MCP_CACHE_MAX_CELLS: maximum number of cached cells (default
+      2,000,000).
+  GOOGLE_ADS_MCP_CONVERSION_LAG_DAYS: days after which a date is considered
+      closed (default 30).
+"""
+
+import collections
+import datetime
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Sequence
+
+_MAX_ENTRIES_ENV = "GOOGLE_ADS_MCP_CACHE_MAX_ENTRIES"
+_MAX_CELLS_ENV = "GOOGLE_ADS_MCP_CACHE_MAX_CELLS"
+_CONVERSION_LAG_ENV = "GOOGLE_ADS_MCP_CONVERSION_LAG_DAYS"
+
+_DEFAULT_MAX_ENTRIES = 256
+_DEFAULT_MAX_CELLS = 2_000_000
+_DEFAULT_CONVERSION_LAG_DAYS = 30
+
+LIVE_TTL_SECONDS = 5 * 60
+RECENT_TTL_SECONDS = 30 * 60
+CLOSED_TTL_SECONDS = 6 * 60 * 60
+
+# Quoted GAQL literals, which must survive whitespace normalization as is.
+_QUOTED = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")""")
+_WHITESPACE = re.compile(r"\s+")
+_DATE = r"""['"](\d{4}-\d{2}-\d{2})['"]"""
+_DATE_COMPARISON = re.compile(
+    rf"^segments\.date\s*(<=|<|=|>=|>)\s*{_DATE}$", re.IGNORECASE
+)
+_DATE_BETWEEN = re.compile(
+    rf"^segments\.date\s+BETWEEN\s+{_DATE}\s+AND\s+{_DATE}$", re.IGNORECASE
+)
+_DATE_SEGMENT = re.compile(
+    r"\bsegments\.(date|week|month|quarter|year)\b", re.IGNORECASE
+)
+
+
+def normalize_clause(clause: str) -> str:
+    """Collapses whitespace outside of quoted literals."""
+    parts = _QUOTED.split(str(clause))
+    for i in range(0, len(parts), 2):
+        parts[i] = _WHITESPACE.sub(" ", parts[i])
+    return "".join(parts).strip()
+
+
+def make_key(
+    customer_id: str,
+    fields: Sequence[str],
+    resource: str,
+    conditions: Sequence[str] | None = None,
+    orderings: Sequence[str] | None = None,
+    limit: int | str | None = None,
+) -> Hashable:
+    """Returns the cache key of a search.
+
+    Conditions are combined with AND, so their order doesn't matter and they
+    are sorted. Fields and orderings keep their order since it shapes the
+    result.
+    """
+    return (
+        str(customer_id).strip(),
+        tuple(normalize_clause(field) for field in fields),
+        normalize_clause(resource),
+        tuple(sorted(normalize_clause(c) for c in conditions or ())),
+        tuple(normalize_clause(o) for o in orderings or ()),
+        str(limit).strip() if limit else None,
+    )
+
+
+def get_date_window_end(
+    conditions: Sequence[str] | None,
+) -> datetime.date | None:
+    """Returns the last date covered by the conditions of a query.
+
+    Returns None when the query has no date window, or when the window is
+    open-ended or can't be parsed (for example DURING literals); callers
+    should treat that as touching today.
+    """
+    end = None
+    has_date_condition = False
+    for condition in conditions or ():
+        condition = normalize_clause(condition)
+        if not _DATE_SEGMENT.search(condition):
+            continue
+        has_date_condition = True
+        between = _DATE_BETWEEN.match(condition)
+        comparison = _DATE_COMPARISON.match(condition)
+        if between:
+            upper = datetime.date.fromisoformat(between.group(2))
+        elif comparison and comparison.group(1) in ("<=", "<", "="):
+            upper = datetime.date.fromisoformat(comparison.group(2))
+            if comparison.group(1) == "<":
+                upper -= datetime.timedelta(days=1)
+        else:
+            continue
+        end = upper if end is None else min(end, upper)
+    if not has_date_condition:
+        return None
+    return end
+
+
+def _get_env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer, got {value!r}.")
+
+
+class _Entry:
+    __slots__ = ("rows", "cells", "expires_at")
+
+    def __init__(self, rows: List[Any], cells: int, expires_at: float):
+        self.rows = rows
+        self.cells = cells
+        self.expires_at = expires_at
+
+
+class QueryCache:
+    """Thread-safe LRU cache of search results with date-aware TTLs."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        max_cells: int | None = None,
+        conversion_lag_days: int | None = None,
+    ):
+        if max_entries is None:
+            max_entries = _get_env_int(_MAX_ENTRIES_ENV, _DEFAULT_MAX_ENTRIES)
+        if max_cells is None:
+            max_cells = _get_env_int(_MAX_CELLS_ENV, _DEFAULT_MAX_CELLS)
+        if conversion_lag_days is None:
+            conversion_lag_days = _get_env_int(
+                _CONVERSION_LAG_ENV, _DEFAULT_CONVERSION_LAG_DAYS
+            )
+        self.max_entries = max_entries
+        self.max_cells = max_cells
+        self.conversion_lag_days = conversion_lag_days
+        self._entries: collections.OrderedDict[Hashable, _Entry] = (
+            collections.OrderedDict()
+        )
+        self._cells = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.max_cells > 0
+
+    def ttl_for(
+        self,
+        conditions: Sequence[str] | None,
+        today: datetime.date | None = None,
+    ) -> float:
+        """Returns how long the result of a query with `conditions` is fresh.
+
+        Args:
+            conditions: the WHERE clauses of the query.
+            today: the current date, only meant to be overridden in tests.
+        """
+        today = today or datetime.date.today()
+        end = get_date_window_end(conditions)
+        # Accounts may be a day behind the server's time zone, so yesterday
+        # still counts as live.
+        if end is None or end >= today - datetime.timedelta(days=1):
+            return LIVE_TTL_SECONDS
+        horizon = today - datetime.timedelta(days=self.conversion_lag_days)
+        if end < horizon:
+            return CLOSED_TTL_SECONDS
+        return RECENT_TTL_SECONDS
+
+    def get(self, key: Hashable) -> List[Any] | None:
+        """Returns a copy of the cached rows for `key`, or None on a miss."""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._remove(key)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return list(entry.rows)
+
+    def put(
+        self, key: Hashable, rows: List[Any], width: int, ttl: float
+    ) -> bool:
+        """Caches `rows`, returning False if they don't fit in the cache.
+
+        Args:
+            key: the key returned by `make_key`.
+            rows: the result rows.
+            width: the number of fields per row.
+            ttl: seconds the rows stay fresh, see `ttl_for`.
+        """
+        cells = len(rows) * max(width, 1)
+        if not self.enabled or cells > self.max_cells or ttl <= 0:
+            return False
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(
+                list(rows), cells, time.monotonic() + ttl
+            )
+            self._cells += cells
+            while (
+                len(self._entries) > self.max_entries
+                or self._cells > self.max_cells
+            ):
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._cells = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the hit/miss counters and the current size."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "entries": len(self._entries),
+                "cells": self._cells,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        """Drops an entry; must be called with the lock held."""
+        self._cells -= self._entries.pop(key).cells
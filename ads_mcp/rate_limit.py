@@ -0,0 +1,96 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token bucket rate limiter shared by threads.
+
+A bucket refills at `rate` tokens per second up to `capacity`. `acquire`
+reserves its tokens immediately, letting the balance go negative, and sleeps
+outside the lock until the reservation is covered. Callers are therefore
+served in arrival order and no thread spins while waiting.
+"""
+
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """Thread-safe token bucket."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Initializes a full bucket.
+
+        Args:
+            rate: tokens added per second; 0 or less disables the limit.
+            capacity: the largest burst, defaults to one second of tokens.
+            clock: returns the current time in seconds.
+            sleep: waits for the given number of seconds.
+        """
+        self.rate = rate
+        self.capacity = max(capacity if capacity else rate, 1)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def acquire(self, tokens: float = 1) -> float:
+        """Takes `tokens` from the bucket, waiting until they are available.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        if not self.enabled:
+            return 0.0
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Can't acquire {tokens} tokens from a bucket holding "
+                f"{self.capacity}."
+            )
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = max(0.0, -self._tokens / self.rate)
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Takes `tokens` from the bucket if they are available right away."""
+        if not self.enabled:
+            return True
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def _refill(self) -> None:
+        """Adds the tokens accrued since the last call; needs the lock."""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
@@ -13,17 +13,18 @@
 # limitations under the License.
 """Entry point for the MCP server."""
 import os
-import uvicorn
 from ads_mcp.coordinator import mcp
 # The following imports are necessary to register the tools with the `mcp`
 # object, even though they are not directly used in this file.
-from ads_mcp.tools import search, core  # noqa: F401
+from ads_mcp.tools import search, core, reference  # noqa: F401
 
 
 def run_server() -> None:
     """Run the MCP server with SSE transport for remote connections."""
     transport = os.environ.get("MCP_TRANSPORT", "stdio")
     if transport == "sse":
+        import uvicorn
+
         port = int(os.environ.get("PORT", "8080"))
         app = mcp.sse_app()
         uvicorn.run(app, host="0.0.0.0", port=port)
@@ -0,0 +1,196 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pool of Google Ads API service clients sharing one gRPC channel.
+
+`GoogleAdsClient.get_service` opens a new gRPC channel, and therefore a new
+TLS connection, for every service client it returns. The pool instead keeps
+one service client per (service name, credentials) and builds all of them on
+a single keep-alive channel per credentials, wired with the same interceptors
+`get_service` would install. Service clients and channels are thread-safe, so
+the pooled clients are shared by all worker threads.
+
+The keep-alive interval is read from the GOOGLE_ADS_MCP_KEEPALIVE_SECONDS
+environment variable (default 60, 0 disables keep-alive pings).
+"""
+
+import importlib
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Hashable, List
+
+logger = logging.getLogger(__name__)
+
+_KEEPALIVE_ENV = "GOOGLE_ADS_MCP_KEEPALIVE_SECONDS"
+_DEFAULT_KEEPALIVE_SECONDS = 60
+_KEEPALIVE_TIMEOUT_MS = 20_000
+
+
+def get_keepalive_seconds() -> int:
+    """Returns the configured keep-alive interval, 0 meaning disabled."""
+    value = os.environ.get(_KEEPALIVE_ENV)
+    if not value:
+        return _DEFAULT_KEEPALIVE_SECONDS
+    try:
+        seconds = int(value)
+    except ValueError:
+        raise ValueError(f"{_KEEPALIVE_ENV} must be an integer, got {value!r}.")
+    if seconds < 0:
+        raise ValueError(f"{_KEEPALIVE_ENV} must not be negative.")
+    return seconds
+
+
+def _keepalive_options(seconds: int) -> List[tuple]:
+    if not seconds:
+        return []
+    return [
+        ("grpc.keepalive_time_ms", seconds * 1000),
+        ("grpc.keepalive_timeout_ms", _KEEPALIVE_TIMEOUT_MS),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+
+class ServicePool:
+    """Thread-safe cache of service clients built on shared channels."""
+
+    def __init__(
+        self,
+        extra_interceptors: Callable[[], List[Any]] = list,
+        keepalive_seconds: int | None = None,
+        insecure: bool = False,
+    ):
+        """Initializes the pool.
+
+        Args:
+            extra_interceptors: returns the interceptors to run before the
+                ones installed by the Google Ads client library, called once
+                per channel.
+            keepalive_seconds: the keep-alive interval of the channels,
+                defaults to GOOGLE_ADS_MCP_KEEPALIVE_SECONDS.
+            insecure: opens plaintext channels without call credentials, for
+                local test servers such as `ads_mcp.fake_server`.
+        """
+        if keepalive_seconds is None:
+            keepalive_seconds = get_keepalive_seconds()
+        self._extra_interceptors = extra_interceptors
+        self._keepalive_seconds = keepalive_seconds
+        self._insecure = insecure
+        self._channels: Dict[Hashable, Any] = {}
+        self._services: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, client: Any, name: str) -> Any:
+        """Returns the service client `name`, e.g. "GoogleAdsService".
+
+        Args:
+            client: the GoogleAdsClient providing the credentials, developer
+                token, login customer id and API version.
+            name: the name of the service.
+        """
+        key = (name, *_channel_key(client))
+        service = self._services.get(key)
+        if service is None:
+            with self._lock:
+                service = self._services.get(key)
+                if service is None:
+                    service = self._build_service(client, name)
+                    self._services[key] = service
+        return service
+
+    def close(self) -> None:
+        """Closes the channels and forgets all service clients."""
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels.clear()
+            self._services.clear()
+        for channel in channels:
+            channel.close()
+
+    def _build_service(self, client: Any, name: str) -> Any:
+        """Builds a service client; must be called with the lock held."""
+        from google.ads.googleads import client as client_module
+        from google.ads.googleads import util
+
+        version = client.version or client_module._DEFAULT_VERSION
+        service_module = importlib.import_module(
+            f"google.ads.googleads.{version}.services.services."
+            f"{util.convert_upper_case_to_snake_case(name)}"
+        )
+        service_client_class = getattr(service_module, f"{name}Client")
+        transport_class = service_client_class.get_transport_class()
+        endpoint = client.endpoint or service_client_class.DEFAULT_ENDPOINT
+
+        channel_key = (*_channel_key(client), endpoint)
+        channel = self._channels.get(channel_key)
+        if channel is None:
+            channel = self._build_channel(
+                client, version, endpoint, transport_class
+            )
+            self._channels[channel_key] = channel
+
+        transport = transport_class(
+            channel=channel, client_info=client_module._CLIENT_INFO
+        )
+        return service_client_class(transport=transport)
+
+    def _build_channel(
+        self, client: Any, version: str, endpoint: str, transport_class: Any
+    ) -> Any:
+        """Opens a channel with the interceptors of `get_service`."""
+        import grpc
+        from google.ads.googleads import client as client_module
+        from google.ads.googleads.interceptors import (
+            ExceptionInterceptor,
+            LoggingInterceptor,
+            MetadataInterceptor,
+        )
+
+        logger.info("Opening gRPC channel to %s", endpoint)
+        options = client_module._GRPC_CHANNEL_OPTIONS + _keepalive_options(
+            self._keepalive_seconds
+        )
+        if self._insecure:
+            channel = grpc.insecure_channel(endpoint, options=options)
+        else:
+            channel = transport_class.create_channel(
+                host=endpoint,
+                credentials=client.credentials,
+                options=options,
+            )
+        interceptors = self._extra_interceptors() + [
+            MetadataInterceptor(
+                client.developer_token,
+                client.login_customer_id,
+                client.linked_customer_id,
+                client.use_cloud_org_for_api_access,
+            ),
+            LoggingInterceptor(client_module._logger, version, endpoint),
+            ExceptionInterceptor(version, use_proto_plus=client.use_proto_plus),
+        ]
+        return grpc.intercept_channel(channel, *interceptors)
+
+
+def _channel_key(client: Any) -> tuple:
+    """Returns what a channel's interceptors depend on besides the endpoint."""
+    return (
+        client.credentials,
+        client.developer_token,
+        client.login_customer_id,
+        client.linked_customer_id,
+        client.use_cloud_org_for_api_access,
+        client.use_proto_plus,
+        client.version,
+    )
@@ -1,5 +1,7 @@
 """Configuration for Google Sheets sync."""
 
+import os
+
 # Google Sheet settings
 SPREADSHEET_ID = "1QHQzY8razWXJHSdj2TE5EpayidyLBCi94QjFLQBN6OI"
 SHEET_NAME = "[FOR TEST] GOOGLE DATA"
@@ -7,6 +9,36 @@ SHEET_NAME = "[FOR TEST] GOOGLE DATA"
 # Discord webhook for notifications
 DISCORD_WEBHOOK_URL = "https://discord.com/api/webhooks/1449129401064100091/mwhW59cwQOV4yIRCmKi1pENP-0Nb2ZDHy55402uVTmby01sQbFxfPY6yN7IpLqBFS0uL"
 
+# Concurrency and rate limits, shared by all accounts of a sync
+# Number of accounts processed at once
+SYNC_WORKERS = int(os.environ.get("SHEETS_SYNC_WORKERS", "8"))
+# Google Ads API requests per second
+ADS_REQUESTS_PER_SECOND = float(os.environ.get("SHEETS_SYNC_ADS_QPS", "10"))
+# Google Sheets API requests per minute (the default quota is 60 per user)
+SHEETS_REQUESTS_PER_MINUTE = float(
+    os.environ.get("SHEETS_SYNC_SHEETS_PER_MINUTE", "55")
+)
+
+# Number of finished sync jobs kept for the status endpoint
+SYNC_JOB_HISTORY = int(os.environ.get("SHEETS_SYNC_JOB_HISTORY", "20"))
+
+# KPIs of closed periods are kept in a local SQLite file and not queried again.
+# An empty path disables the cache
+PERIOD_CACHE_PATH = os.environ.get(
+    "SHEETS_SYNC_CACHE_PATH", "cache/sheets_sync_periods.sqlite3"
+)
+# Days after its end before a period is closed, i.e. no longer receives late
+# conversions
+CONVERSION_LAG_DAYS = int(os.environ.get("SHEETS_SYNC_CONVERSION_LAG_DAYS", "30"))
+
+# Sheet writes are buffered for the whole sync and sent in as few batchUpdate
+# calls as possible. Buffered cells are flushed early once there are this many
+SHEETS_FLUSH_CELLS = int(os.environ.get("SHEETS_SYNC_FLUSH_CELLS", "100000"))
+# Upper bound on the JSON body of a single batchUpdate call
+SHEETS_MAX_REQUEST_BYTES = int(
+    os.environ.get("SHEETS_SYNC_MAX_REQUEST_BYTES", "2000000")
+)
+
 # Column header mappings (header name -> metrics key)
 # These map your sheet headers to the GAQL field names
 COLUMN_MAPPINGS = {
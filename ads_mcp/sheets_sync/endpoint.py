@@ -5,18 +5,66 @@ from starlette.responses import JSONResponse
 from starlette.routing import Route
 import logging
 
+from ads_mcp import telemetry
+from ads_mcp.sheets_sync.jobs import JobRunner, SyncJob
+
 logger = logging.getLogger(__name__)
 
 
+def _run_sync_job(job: SyncJob):
+    from ads_mcp.sheets_sync.run_sync import run_sync
+    run_sync(progress=job, **job.options)
+
+
+# Syncs run on a background thread, one at a time
+job_runner = JobRunner(_run_sync_job)
+
+
 async def trigger_sync(request):
-    """Endpoint to trigger the sheets sync."""
-    try:
-        from ads_mcp.sheets_sync.run_sync import run_sync
-        run_sync()
-        return JSONResponse({"status": "success", "message": "Sync completed"})
-    except Exception as e:
-        logger.error(f"Sync failed: {e}")
-        return JSONResponse({"status": "error", "message": str(e)}, status_code=500)
+    """Endpoint to trigger the sheets sync.
+    
+    Returns immediately with the ID of the job. If a sync is already queued or
+    running, the trigger is coalesced into it and its ID is returned, unless
+    the options differ, which is rejected with 409.
+    
+    Pass `?full_refresh=true` to query closed periods again instead of using
+    the period cache.
+    """
+    full_refresh = request.query_params.get("full_refresh", "").lower() in ("1", "true", "yes")
+    job, created = job_runner.submit(full_refresh=full_refresh)
+    if not created and job.options != {"full_refresh": full_refresh}:
+        return JSONResponse(
+            {
+                "status": "error",
+                "message": "A sync with different options is already in progress",
+                "job_id": job.id,
+            },
+            status_code=409,
+        )
+    return JSONResponse(
+        {
+            "status": "accepted",
+            "message": "Sync started" if created else "Sync already in progress",
+            "job_id": job.id,
+            "coalesced": not created,
+            "status_url": str(request.url_for("sync_status", job_id=job.id)),
+        },
+        status_code=202,
+    )
+
+
+async def sync_status(request):
+    """Endpoint reporting the status and progress of a sync job.
+    
+    `latest` can be used as the job ID to get the most recent job.
+    """
+    job_id = request.path_params["job_id"]
+    job = job_runner.latest() if job_id == "latest" else job_runner.get(job_id)
+    if job is None:
+        return JSONResponse(
+            {"status": "error", "message": f"Unknown job: {job_id}"}, status_code=404
+        )
+    return JSONResponse(job.to_dict())
 
 
 async def health_check(request):
@@ -26,7 +74,9 @@ async def health_check(request):
 
 routes = [
     Route("/sync-sheets", trigger_sync, methods=["GET", "POST"]),
+    Route("/sync-sheets/{job_id}", sync_status, methods=["GET"], name="sync_status"),
     Route("/health", health_check, methods=["GET"]),
+    Route("/metrics", telemetry.metrics_endpoint, methods=["GET"]),
 ]
 
 sync_app = Starlette(routes=routes)
@@ -0,0 +1,225 @@
+"""Background jobs for the sheets sync endpoint.
+
+A sync runs on a worker thread so the HTTP handler can return right away with
+a job ID. Only one sync runs at a time: a trigger received while a job is
+queued or running joins that job instead of starting another one.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ads_mcp import telemetry
+from ads_mcp.sheets_sync.config import SYNC_JOB_HISTORY
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+# Outcome of an account that has no row in the sheet; not a job status
+SKIPPED = "skipped"
+
+SYNC_DURATION = telemetry.histogram(
+    "sheets_sync_job_duration_seconds",
+    "Duration of sync jobs, by final status.",
+    ("status",),
+    buckets=(10, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+SYNC_ACCOUNTS = telemetry.counter(
+    "sheets_sync_accounts_total",
+    "Accounts processed by sync jobs, by result (succeeded, failed or "
+    "skipped). Accounts whose row then failed to be written are also counted "
+    "as write_failed.",
+    ("result",),
+)
+SYNC_TRIGGERS = telemetry.counter(
+    "sheets_sync_triggers_total",
+    "Sync triggers, by whether they started a job or joined a running one.",
+    ("outcome",),
+)
+
+
+class SyncJob:
+    """State and progress of one sync, updated by the sync as it runs."""
+
+    def __init__(
+        self, options: Dict[str, Any], clock: Callable[[], float] = time.time
+    ):
+        self.id = uuid.uuid4().hex
+        self.options = options
+        self.status = QUEUED
+        self.error: Optional[str] = None
+        self.triggers = 1
+        self.total = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.skipped = 0
+        self.created_at = clock()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def active(self) -> bool:
+        return self.status in (QUEUED, RUNNING)
+
+    def start(self, total: int):
+        """Record the number of accounts the sync will process."""
+        with self._lock:
+            self.total = total
+
+    def account_finished(self, result: str = SUCCEEDED):
+        """Record that an account was processed.
+
+        Args:
+            result: SUCCEEDED, FAILED, or SKIPPED for an account that has
+                no row in the sheet.
+        """
+        with self._lock:
+            if result == FAILED:
+                self.failed += 1
+            elif result == SKIPPED:
+                self.skipped += 1
+            else:
+                self.succeeded += 1
+        SYNC_ACCOUNTS.inc(result)
+
+    def write_failed(self):
+        """Record that the row of an account counted as processed wasn't written."""
+        with self._lock:
+            self.succeeded -= 1
+            self.failed += 1
+        SYNC_ACCOUNTS.inc("write_failed")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the job to finish, returning False on timeout."""
+        return self._done.wait(timeout)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the job status as reported by the status endpoint."""
+        with self._lock:
+            finished = self.succeeded + self.failed + self.skipped
+            now = self.finished_at or self._clock()
+            eta = None
+            if self.status == RUNNING and finished and self.total:
+                elapsed = now - self.started_at
+                eta = round(elapsed / finished * (self.total - finished), 1)
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "error": self.error,
+                "triggers": self.triggers,
+                "options": self.options,
+                "accounts": {
+                    "total": self.total,
+                    "done": finished,
+                    "succeeded": self.succeeded,
+                    "failed": self.failed,
+                    "skipped": self.skipped,
+                },
+                "eta_seconds": eta,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+    def _set_status(self, status: str, error: Optional[str] = None):
+        with self._lock:
+            self.status = status
+            self.error = error
+            if status == RUNNING:
+                self.started_at = self._clock()
+            elif status in (SUCCEEDED, FAILED):
+                self.finished_at = self._clock()
+        if not self.active:
+            SYNC_DURATION.observe(self.finished_at - self.started_at, status)
+            self._done.set()
+
+
+class JobRunner:
+    """Runs sync jobs one at a time on a background thread."""
+
+    def __init__(
+        self,
+        target: Callable[[SyncJob], Any],
+        history: int = SYNC_JOB_HISTORY,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize the runner.
+
+        Args:
+            target: runs the sync, reporting its progress to the given job
+                and reading its options from `job.options`.
+            history: the number of finished jobs kept for status lookups.
+            clock: returns the current time in seconds since the epoch.
+        """
+        self._target = target
+        self._history = max(history, 1)
+        self._clock = clock
+        self._jobs: "OrderedDict[str, SyncJob]" = OrderedDict()
+        self._current: Optional[SyncJob] = None
+        self._lock = threading.Lock()
+
+    def submit(self, **options: Any) -> Tuple[SyncJob, bool]:
+        """Start a sync, or join the one already queued or running.
+
+        Args:
+            options: the options of the sync. A job already queued or running
+                is returned even if its options differ.
+
+        Returns:
+            The job and whether it was created by this call.
+        """
+        with self._lock:
+            if self._current is not None and self._current.active:
+                if self._current.options == options:
+                    self._current.triggers += 1
+                    SYNC_TRIGGERS.inc("coalesced")
+                logger.info(
+                    f"Sync job {self._current.id} already {self._current.status}, coalescing trigger"
+                )
+                return self._current, False
+            job = SyncJob(options, self._clock)
+            SYNC_TRIGGERS.inc("started")
+            self._current = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self._history:
+                self._jobs.popitem(last=False)
+
+        logger.info(f"Queued sync job {job.id}")
+        thread = threading.Thread(
+            target=self._run,
+            args=(job,),
+            name=f"sheets-sync-job-{job.id[:8]}",
+            daemon=True,
+        )
+        thread.start()
+        return job, True
+
+    def get(self, job_id: str) -> Optional[SyncJob]:
+        """Return a job by ID, None if unknown or no longer kept."""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self) -> Optional[SyncJob]:
+        """Return the most recently submitted job."""
+        with self._lock:
+            return self._current
+
+    def _run(self, job: SyncJob):
+        job._set_status(RUNNING)
+        try:
+            self._target(job)
+        except Exception as e:
+            logger.error(f"Sync job {job.id} failed: {e}")
+            job._set_status(FAILED, str(e))
+        else:
+            logger.info(f"Sync job {job.id} finished")
+            job._set_status(SUCCEEDED)
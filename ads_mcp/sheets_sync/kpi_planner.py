@@ -0,0 +1,263 @@
+"""Plan the Google Ads queries behind the KPI metrics of an account.
+
+Instead of one query per period, the KPIs are fetched with:
+
+- one query segmented by `segments.date` over the union of all periods, for
+  the additive metrics (cost, clicks, conversions, ...). They are summed per
+  period locally, and ratios such as CTR or CPC are recomputed from the sums;
+- one query segmented by `segments.month` for the ratio and share metrics
+  that can't be re-derived (impression shares, conversion rates, ...), since
+  every KPI period is a calendar month or the month to date. Periods that
+  don't fit a month are given a query of their own.
+"""
+
+import calendar
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+Period = Tuple[Union[date, datetime], Union[date, datetime]]
+
+ACCOUNT_NAME_FIELD = "customer.descriptive_name"
+
+# Metrics that can be summed over days
+ADDITIVE_FIELDS = [
+    "metrics.cost_micros",
+    "metrics.impressions",
+    "metrics.clicks",
+    "metrics.conversions",
+    "metrics.conversions_value",
+    "metrics.all_conversions",
+    "metrics.all_conversions_value",
+    "metrics.interactions",
+    "metrics.engagements",
+    "metrics.active_view_measurable_cost_micros",
+    "metrics.invalid_clicks",
+]
+
+
+def _ratio(
+    numerator: str, denominator: str, scale: float = 1
+) -> Callable[[Dict[str, Any]], float]:
+    def compute(totals: Dict[str, Any]) -> float:
+        if not totals[denominator]:
+            return 0
+        return totals[numerator] * scale / totals[denominator]
+
+    return compute
+
+
+# Ratio metrics recomputed from the additive totals, in the units the API
+# reports them (CPC, CPM and cost per conversion stay in micros)
+DERIVED_FIELDS = {
+    "metrics.ctr": _ratio("metrics.clicks", "metrics.impressions"),
+    "metrics.average_cpc": _ratio("metrics.cost_micros", "metrics.clicks"),
+    "metrics.average_cpm": _ratio(
+        "metrics.cost_micros", "metrics.impressions", 1000
+    ),
+    "metrics.average_cost": _ratio(
+        "metrics.cost_micros", "metrics.interactions"
+    ),
+    "metrics.interaction_rate": _ratio(
+        "metrics.interactions", "metrics.impressions"
+    ),
+    "metrics.cost_per_conversion": _ratio(
+        "metrics.cost_micros", "metrics.conversions"
+    ),
+    "metrics.cost_per_all_conversions": _ratio(
+        "metrics.cost_micros", "metrics.all_conversions"
+    ),
+    "metrics.engagement_rate": _ratio(
+        "metrics.engagements", "metrics.impressions"
+    ),
+}
+
+# Ratio and share metrics that need their own query per period
+RATIO_FIELDS = [
+    "metrics.conversions_from_interactions_rate",
+    "metrics.all_conversions_from_interactions_rate",
+    "metrics.search_impression_share",
+    "metrics.search_exact_match_impression_share",
+    "metrics.search_budget_lost_impression_share",
+    "metrics.search_rank_lost_impression_share",
+    "metrics.content_impression_share",
+    "metrics.content_budget_lost_impression_share",
+    "metrics.content_rank_lost_impression_share",
+    "metrics.active_view_cpm",
+    "metrics.active_view_measurability",
+    "metrics.invalid_click_rate",
+]
+
+
+class PlannedQuery(NamedTuple):
+    """A query of the plan and how its rows map to periods."""
+
+    query: str
+    # The segment rows are split by, None when the query returns one row
+    segment: Optional[str]
+    # Period of each segment value, or {None: period} for a single row.
+    # Empty for the additive query, whose rows are matched by date range.
+    periods: Dict[Optional[str], str]
+
+
+def _format_date(dt: Union[date, datetime]) -> str:
+    return dt.strftime("%Y-%m-%d")
+
+
+def _month_end(dt: Union[date, datetime]) -> int:
+    return calendar.monthrange(dt.year, dt.month)[1]
+
+
+def _query(
+    fields: List[str], start: Union[date, datetime], end: Union[date, datetime]
+) -> str:
+    return (
+        f"SELECT {', '.join(fields)} FROM customer "
+        f"WHERE segments.date BETWEEN '{_format_date(start)}' AND '{_format_date(end)}'"
+    )
+
+
+def plan_queries(
+    kpi_periods: Dict[str, Period], daily_periods: Dict[str, Period]
+) -> List[PlannedQuery]:
+    """Return the queries needed for the KPIs of `kpi_periods`.
+
+    Args:
+        kpi_periods: periods needing every KPI, by name.
+        daily_periods: periods needing only additive metrics, by name.
+    """
+    all_periods = list(kpi_periods.values()) + list(daily_periods.values())
+    plan = [
+        PlannedQuery(
+            _query(
+                ["segments.date", ACCOUNT_NAME_FIELD] + ADDITIVE_FIELDS,
+                min(start for start, _ in all_periods),
+                max(end for _, end in all_periods),
+            ),
+            "segments.date",
+            {},
+        )
+    ]
+    if not kpi_periods:
+        return plan
+
+    # A period can be read from the month-segmented query if it starts on the
+    # 1st and ends either with its month or with the query's date range, as
+    # rows of partial months only cover the dates inside the range.
+    candidates = {
+        name: (start, end)
+        for name, (start, end) in kpi_periods.items()
+        if start.day == 1 and (start.year, start.month) == (end.year, end.month)
+    }
+    months: Dict[str, str] = {}
+    if candidates:
+        range_end = max(end for _, end in candidates.values())
+        for name, (start, end) in candidates.items():
+            month = _format_date(start)
+            if month not in months and (
+                end.day == _month_end(end) or end == range_end
+            ):
+                months[month] = name
+    if months:
+        plan.append(
+            PlannedQuery(
+                _query(
+                    ["segments.month"] + RATIO_FIELDS,
+                    min(kpi_periods[name][0] for name in months.values()),
+                    max(kpi_periods[name][1] for name in months.values()),
+                ),
+                "segments.month",
+                months,
+            )
+        )
+    for name, (start, end) in kpi_periods.items():
+        if name not in months.values():
+            plan.append(
+                PlannedQuery(
+                    _query(RATIO_FIELDS, start, end), None, {None: name}
+                )
+            )
+    return plan
+
+
+def _get_field(row: Any, field: str) -> Any:
+    value = row
+    for part in field.split("."):
+        value = getattr(value, part)
+    return value
+
+
+def collect_period_values(
+    plan: List[PlannedQuery],
+    results: List[Optional[List[Any]]],
+    kpi_periods: Dict[str, Period],
+    daily_periods: Dict[str, Period],
+) -> Dict[str, Dict[str, Any]]:
+    """Compute the metric values of each period from the results of a plan.
+
+    Args:
+        plan: the queries returned by `plan_queries`.
+        results: the rows of each query, None for queries that failed.
+        kpi_periods: the periods the plan was made for.
+        daily_periods: the periods the plan was made for.
+
+    Returns:
+        The values of each period keyed by GAQL field name, as the API would
+        return them (micros are not converted). Fields of failed queries are
+        left out, and so is the account name when no row was returned.
+    """
+    values: Dict[str, Dict[str, Any]] = {
+        name: {} for name in list(kpi_periods) + list(daily_periods)
+    }
+    account_name = None
+    for planned, rows in zip(plan, results):
+        if rows is None:
+            continue
+        if not planned.periods:
+            account_name = _collect_additive(
+                rows, values, {**kpi_periods, **daily_periods}
+            )
+            for name in kpi_periods:
+                totals = values[name]
+                for field, compute in DERIVED_FIELDS.items():
+                    totals[field] = compute(totals)
+            continue
+        for name in planned.periods.values():
+            values[name].update((field, 0) for field in RATIO_FIELDS)
+        for row in rows:
+            key = _get_field(row, planned.segment) if planned.segment else None
+            name = planned.periods.get(key)
+            if name is not None:
+                values[name].update(
+                    (field, _get_field(row, field)) for field in RATIO_FIELDS
+                )
+    if account_name is not None:
+        for name in values:
+            values[name][ACCOUNT_NAME_FIELD] = account_name
+    return values
+
+
+def _collect_additive(
+    rows: List[Any],
+    values: Dict[str, Dict[str, Any]],
+    periods: Dict[str, Period],
+) -> Optional[str]:
+    """Sum the date-segmented rows into each period, returning the account name."""
+    bounds = [
+        (name, _format_date(start), _format_date(end))
+        for name, (start, end) in periods.items()
+    ]
+    for name, _, _ in bounds:
+        values[name].update((field, 0) for field in ADDITIVE_FIELDS)
+    account_name = None
+    for row in rows:
+        day = row.segments.date
+        account_name = _get_field(row, ACCOUNT_NAME_FIELD)
+        row_values = [
+            (field, _get_field(row, field)) for field in ADDITIVE_FIELDS
+        ]
+        for name, start, end in bounds:
+            if start <= day <= end:
+                totals = values[name]
+                for field, value in row_values:
+                    totals[field] += value
+    return account_name
@@ -5,9 +5,16 @@ from typing import Any, Dict, List, Optional
 import logging
 
 import ads_mcp.utils as utils
+from ads_mcp import api_calls
+from ads_mcp.sheets_sync import kpi_planner, period_cache
+from ads_mcp.sheets_sync.config import ADS_REQUESTS_PER_SECOND
 
 logger = logging.getLogger(__name__)
 
+# Shared by all sync workers so parallel accounts stay under the API rate;
+# transient errors and quota errors are retried with backoff
+_ads_calls = api_calls.CallPolicy(developer_token_qps=ADS_REQUESTS_PER_SECOND)
+
 
 def _get_date_ranges() -> Dict[str, tuple]:
     """Calculate date ranges for current month, last month, 2 months ago, 1 year ago."""
@@ -48,159 +55,180 @@ def _get_date_ranges() -> Dict[str, tuple]:
     }
 
 
-def _format_date(dt: datetime) -> str:
-    return dt.strftime("%Y-%m-%d")
+def _run_query(customer_id: str, query: str) -> Optional[Dict[str, Any]]:
+    rows = _run_query_rows(customer_id, query)
+    return rows[0] if rows else None
 
 
-def _run_query(customer_id: str, query: str) -> Optional[Dict[str, Any]]:
+def _run_query_rows(customer_id: str, query: str) -> Optional[List[Any]]:
+    """Return all rows of a query, or None if it failed.
+    
+    Raises the error of transient failures, such as quota errors, that
+    persist after the retries, so the account fails instead of having zeros
+    written for the missing metrics.
+    """
+    def read_rows() -> List[Any]:
+        result = ga_service.search_stream(customer_id=customer_id, query=query)
+        return [row for batch in result for row in batch.results]
+    
     try:
         ga_service = utils.get_googleads_service("GoogleAdsService")
-        result = ga_service.search_stream(customer_id=customer_id, query=query)
-        for batch in result:
-            for row in batch.results:
-                return row
-        return None
+        return _ads_calls.call(read_rows, customer_id)
     except Exception as e:
+        if api_calls.is_transient(e):
+            raise
         logger.error(f"Query failed for {customer_id}: {e}")
         return None
 
 
-def _extract_metric(row: Any, field: str) -> Any:
-    try:
-        parts = field.split(".")
-        value = row
-        for part in parts:
-            value = getattr(value, part)
-        if "micros" in field:
-            return float(value) / 1_000_000
-        return value
-    except Exception:
-        return 0
+def _convert_metric(field: str, value: Any) -> Any:
+    """Convert a raw API value for the sheet; micros become currency units."""
+    if "micros" in field:
+        return float(value) / 1_000_000
+    return value
+
+
+# Sheet metric key -> GAQL field, for every KPI period
+_PERIOD_METRICS = [
+    ("cost", "metrics.cost_micros"),
+    ("impressions", "metrics.impressions"),
+    ("clicks", "metrics.clicks"),
+    ("conversions", "metrics.conversions"),
+    ("conversion_value", "metrics.conversions_value"),
+    ("all_conversions", "metrics.all_conversions"),
+    ("all_conversion_value", "metrics.all_conversions_value"),
+    ("ctr", "metrics.ctr"),
+    ("average_cpc", "metrics.average_cpc"),
+    ("average_cpm", "metrics.average_cpm"),
+    ("average_cost", "metrics.average_cost"),
+    ("interactions", "metrics.interactions"),
+    ("interaction_rate", "metrics.interaction_rate"),
+    ("cost_per_conversion", "metrics.cost_per_conversion"),
+    ("cost_per_all_conversions", "metrics.cost_per_all_conversions"),
+    ("conversion_rate", "metrics.conversions_from_interactions_rate"),
+    ("all_conversion_rate", "metrics.all_conversions_from_interactions_rate"),
+    ("search_impression_share", "metrics.search_impression_share"),
+    ("search_exact_match_impression_share", "metrics.search_exact_match_impression_share"),
+    ("search_budget_lost_impression_share", "metrics.search_budget_lost_impression_share"),
+    ("search_rank_lost_impression_share", "metrics.search_rank_lost_impression_share"),
+    ("content_impression_share", "metrics.content_impression_share"),
+    ("content_budget_lost_impression_share", "metrics.content_budget_lost_impression_share"),
+    ("content_rank_lost_impression_share", "metrics.content_rank_lost_impression_share"),
+    ("engagements", "metrics.engagements"),
+    ("engagement_rate", "metrics.engagement_rate"),
+    ("active_view_cpm", "metrics.active_view_cpm"),
+    ("active_view_measurability", "metrics.active_view_measurability"),
+    ("active_view_measurable_cost_micros", "metrics.active_view_measurable_cost_micros"),
+    ("invalid_clicks", "metrics.invalid_clicks"),
+    ("invalid_click_rate", "metrics.invalid_click_rate"),
+]
+
+# Sheet metrics not available on the CUSTOMER resource
+_UNAVAILABLE_METRICS = [
+    "average_cpv",
+    "absolute_top_impression_percentage",
+    "top_impression_percentage",
+    "phone_calls",
+    "phone_impressions",
+    "phone_through_rate",
+]
+
+_PERIOD_SUFFIXES = {
+    "current": "",
+    "last_month": "_last_month",
+    "two_months_ago": "_2_months_ago",
+    "one_year_ago": "_1_year_ago",
+}
+
+# Daily period -> (sheet metric key, GAQL field)
+_DAILY_METRICS = {
+    "yesterday": [
+        ("spend_yesterday", "metrics.cost_micros"),
+        ("conversions_yesterday", "metrics.conversions"),
+    ],
+    "two_days_ago": [("spend_2_days_ago", "metrics.cost_micros")],
+    "three_days_ago": [("spend_3_days_ago", "metrics.cost_micros")],
+}
 
 
-def get_account_metrics(customer_id: str) -> Dict[str, Any]:
-    """Get all KPI metrics for a single account."""
+# Fields stored for each KPI period in the period cache
+_KPI_FIELDS = kpi_planner.ADDITIVE_FIELDS + list(kpi_planner.DERIVED_FIELDS) + kpi_planner.RATIO_FIELDS
+_KPI_METRIC_SET = period_cache.metric_set_id(_KPI_FIELDS)
+
+
+def get_account_metrics(customer_id: str, full_refresh: bool = False) -> Dict[str, Any]:
+    """Get all KPI metrics for a single account.
+    
+    KPIs of closed periods are read from the period cache when available;
+    `full_refresh` queries them again and replaces the cached values.
+    """
     
     date_ranges = _get_date_ranges()
     metrics = {"customer_id": customer_id}
     
-    # Base query fields - only metrics compatible with CUSTOMER resource
-    base_fields = """
-        metrics.cost_micros,
-        metrics.impressions,
-        metrics.clicks,
-        metrics.conversions,
-        metrics.conversions_value,
-        metrics.all_conversions,
-        metrics.all_conversions_value,
-        metrics.ctr,
-        metrics.average_cpc,
-        metrics.average_cpm,
-        metrics.average_cost,
-        metrics.interactions,
-        metrics.interaction_rate,
-        metrics.cost_per_conversion,
-        metrics.cost_per_all_conversions,
-        metrics.conversions_from_interactions_rate,
-        metrics.all_conversions_from_interactions_rate,
-        metrics.search_impression_share,
-        metrics.search_exact_match_impression_share,
-        metrics.search_budget_lost_impression_share,
-        metrics.search_rank_lost_impression_share,
-        metrics.content_impression_share,
-        metrics.content_budget_lost_impression_share,
-        metrics.content_rank_lost_impression_share,
-        metrics.engagements,
-        metrics.engagement_rate,
-        metrics.active_view_cpm,
-        metrics.active_view_measurability,
-        metrics.active_view_measurable_cost_micros,
-        metrics.invalid_clicks,
-        metrics.invalid_click_rate
-    """
+    kpi_periods = {period: date_ranges[period] for period in _PERIOD_SUFFIXES}
+    daily_periods = {period: date_ranges[period] for period in _DAILY_METRICS}
     
-    period_suffixes = {
-        "current": "",
-        "last_month": "_last_month",
-        "two_months_ago": "_2_months_ago",
-        "one_year_ago": "_1_year_ago",
+    cache = period_cache.get_period_cache()
+    today = datetime.now().date()
+    closed_periods = {
+        period
+        for period, (_, end) in kpi_periods.items()
+        if cache and period_cache.is_closed(end, today)
+    }
+    cached_values = {}
+    if not full_refresh:
+        for period in closed_periods:
+            start, end = kpi_periods[period]
+            period_values = cache.get(customer_id, start, end, _KPI_METRIC_SET)
+            if period_values is not None:
+                cached_values[period] = period_values
+    fetch_periods = {
+        period: dates for period, dates in kpi_periods.items() if period not in cached_values
     }
     
-    for period, suffix in period_suffixes.items():
-        start, end = date_ranges[period]
-        query = f"""
-            SELECT
-                customer.descriptive_name,
-                {base_fields}
-            FROM customer
-            WHERE segments.date >= '{_format_date(start)}'
-              AND segments.date <= '{_format_date(end)}'
-        """
-        
-        row = _run_query(customer_id, query)
-        if row:
-            if period == "current":
-                try:
-                    metrics["account_name"] = row.customer.descriptive_name
-                except:
-                    metrics["account_name"] = ""
-            
-            metrics[f"cost{suffix}"] = _extract_metric(row, "metrics.cost_micros")
-            metrics[f"impressions{suffix}"] = _extract_metric(row, "metrics.impressions")
-            metrics[f"clicks{suffix}"] = _extract_metric(row, "metrics.clicks")
-            metrics[f"conversions{suffix}"] = _extract_metric(row, "metrics.conversions")
-            metrics[f"conversion_value{suffix}"] = _extract_metric(row, "metrics.conversions_value")
-            metrics[f"all_conversions{suffix}"] = _extract_metric(row, "metrics.all_conversions")
-            metrics[f"all_conversion_value{suffix}"] = _extract_metric(row, "metrics.all_conversions_value")
-            metrics[f"ctr{suffix}"] = _extract_metric(row, "metrics.ctr")
-            metrics[f"average_cpc{suffix}"] = _extract_metric(row, "metrics.average_cpc")
-            metrics[f"average_cpm{suffix}"] = _extract_metric(row, "metrics.average_cpm")
-            metrics[f"average_cpv{suffix}"] = 0
-            metrics[f"average_cost{suffix}"] = _extract_metric(row, "metrics.average_cost")
-            metrics[f"interactions{suffix}"] = _extract_metric(row, "metrics.interactions")
-            metrics[f"interaction_rate{suffix}"] = _extract_metric(row, "metrics.interaction_rate")
-            metrics[f"cost_per_conversion{suffix}"] = _extract_metric(row, "metrics.cost_per_conversion")
-            metrics[f"cost_per_all_conversions{suffix}"] = _extract_metric(row, "metrics.cost_per_all_conversions")
-            metrics[f"conversion_rate{suffix}"] = _extract_metric(row, "metrics.conversions_from_interactions_rate")
-            metrics[f"all_conversion_rate{suffix}"] = _extract_metric(row, "metrics.all_conversions_from_interactions_rate")
-            metrics[f"search_impression_share{suffix}"] = _extract_metric(row, "metrics.search_impression_share")
-            metrics[f"search_exact_match_impression_share{suffix}"] = _extract_metric(row, "metrics.search_exact_match_impression_share")
-            metrics[f"search_budget_lost_impression_share{suffix}"] = _extract_metric(row, "metrics.search_budget_lost_impression_share")
-            metrics[f"search_rank_lost_impression_share{suffix}"] = _extract_metric(row, "metrics.search_rank_lost_impression_share")
-            metrics[f"absolute_top_impression_percentage{suffix}"] = 0  # Not available on CUSTOMER
-            metrics[f"top_impression_percentage{suffix}"] = 0  # Not available on CUSTOMER
-            metrics[f"content_impression_share{suffix}"] = _extract_metric(row, "metrics.content_impression_share")
-            metrics[f"content_budget_lost_impression_share{suffix}"] = _extract_metric(row, "metrics.content_budget_lost_impression_share")
-            metrics[f"content_rank_lost_impression_share{suffix}"] = _extract_metric(row, "metrics.content_rank_lost_impression_share")
-            metrics[f"engagements{suffix}"] = _extract_metric(row, "metrics.engagements")
-            metrics[f"engagement_rate{suffix}"] = _extract_metric(row, "metrics.engagement_rate")
-            metrics[f"active_view_cpm{suffix}"] = _extract_metric(row, "metrics.active_view_cpm")
-            metrics[f"active_view_measurability{suffix}"] = _extract_metric(row, "metrics.active_view_measurability")
-            metrics[f"active_view_measurable_cost_micros{suffix}"] = _extract_metric(row, "metrics.active_view_measurable_cost_micros")
-            metrics[f"invalid_clicks{suffix}"] = _extract_metric(row, "metrics.invalid_clicks")
-            metrics[f"invalid_click_rate{suffix}"] = _extract_metric(row, "metrics.invalid_click_rate")
-            metrics[f"phone_calls{suffix}"] = 0  # Not available on CUSTOMER
-            metrics[f"phone_impressions{suffix}"] = 0  # Not available on CUSTOMER
-            metrics[f"phone_through_rate{suffix}"] = 0  # Not available on CUSTOMER
-    
-    # Yesterday, 2 days ago, 3 days ago spend and conversions
-    for period in ["yesterday", "two_days_ago", "three_days_ago"]:
-        start, end = date_ranges[period]
-        query = f"""
-            SELECT metrics.cost_micros, metrics.conversions
-            FROM customer
-            WHERE segments.date >= '{_format_date(start)}'
-              AND segments.date <= '{_format_date(end)}'
-        """
-        row = _run_query(customer_id, query)
-        if row:
-            if period == "yesterday":
-                metrics["spend_yesterday"] = _extract_metric(row, "metrics.cost_micros")
-                metrics["conversions_yesterday"] = _extract_metric(row, "metrics.conversions")
-            elif period == "two_days_ago":
-                metrics["spend_2_days_ago"] = _extract_metric(row, "metrics.cost_micros")
-            elif period == "three_days_ago":
-                metrics["spend_3_days_ago"] = _extract_metric(row, "metrics.cost_micros")
+    # Additive metrics for all periods come from one date-segmented query,
+    # ratio metrics from one month-segmented query
+    plan = kpi_planner.plan_queries(fetch_periods, daily_periods)
+    results = [_run_query_rows(customer_id, planned.query) for planned in plan]
+    values = kpi_planner.collect_period_values(plan, results, fetch_periods, daily_periods)
+    
+    for period in closed_periods & fetch_periods.keys():
+        period_values = values[period]
+        # Periods missing fields because a query failed are not stored
+        if all(field in period_values for field in _KPI_FIELDS):
+            start, end = kpi_periods[period]
+            cache.put(
+                customer_id,
+                start,
+                end,
+                _KPI_METRIC_SET,
+                {field: period_values[field] for field in _KPI_FIELDS},
+            )
+    values.update(cached_values)
+    
+    for period, suffix in _PERIOD_SUFFIXES.items():
+        period_values = values[period]
+        if not period_values:
+            continue
+        for key, field in _PERIOD_METRICS:
+            if field in period_values:
+                metrics[f"{key}{suffix}"] = _convert_metric(field, period_values[field])
+        for key in _UNAVAILABLE_METRICS:
+            metrics[f"{key}{suffix}"] = 0
+    
+    for period, keys in _DAILY_METRICS.items():
+        for key, field in keys:
+            if field in values[period]:
+                metrics[key] = _convert_metric(field, values[period][field])
+    
+    if results[0] is not None:
+        account_name = values["current"].get(kpi_planner.ACCOUNT_NAME_FIELD)
+        if account_name is None:
+            # Accounts without any activity in the periods return no rows
+            row = _run_query(customer_id, "SELECT customer.descriptive_name FROM customer")
+            account_name = row.customer.descriptive_name if row else ""
+        metrics["account_name"] = account_name
     
     metrics["daily_budget"] = _get_total_daily_budget(customer_id)
     metrics["last_updated"] = datetime.now().strftime("%m/%d/%Y %H:%M:%S")
@@ -209,34 +237,31 @@ def get_account_metrics(customer_id: str) -> Dict[str, Any]:
 
 
 def _get_total_daily_budget(customer_id: str) -> float:
-    try:
-        ga_service = utils.get_googleads_service("GoogleAdsService")
-        query = """
-            SELECT campaign.id, campaign_budget.amount_micros, campaign_budget.explicitly_shared
-            FROM campaign
-            WHERE campaign.status = 'ENABLED' AND campaign.serving_status = 'SERVING'
-        """
-        result = ga_service.search_stream(customer_id=customer_id, query=query)
-        total_budget = 0.0
-        seen_budgets = set()
-        for batch in result:
-            for row in batch.results:
-                budget_micros = row.campaign_budget.amount_micros
-                is_shared = row.campaign_budget.explicitly_shared
-                budget_key = budget_micros if is_shared else row.campaign.id
-                if budget_key not in seen_budgets:
-                    seen_budgets.add(budget_key)
-                    total_budget += budget_micros / 1_000_000
-        return total_budget
-    except Exception as e:
-        logger.error(f"Failed to get daily budget for {customer_id}: {e}")
+    query = """
+        SELECT campaign.id, campaign_budget.amount_micros, campaign_budget.explicitly_shared
+        FROM campaign
+        WHERE campaign.status = 'ENABLED' AND campaign.serving_status = 'SERVING'
+    """
+    rows = _run_query_rows(customer_id, query)
+    if rows is None:
+        logger.error(f"Failed to get daily budget for {customer_id}")
         return 0.0
+    total_budget = 0.0
+    seen_budgets = set()
+    for row in rows:
+        budget_micros = row.campaign_budget.amount_micros
+        is_shared = row.campaign_budget.explicitly_shared
+        budget_key = budget_micros if is_shared else row.campaign.id
+        if budget_key not in seen_budgets:
+            seen_budgets.add(budget_key)
+            total_budget += budget_micros / 1_000_000
+    return total_budget
 
 
 def get_accessible_customer_ids() -> List[str]:
     try:
         customer_service = utils.get_googleads_service("CustomerService")
-        response = customer_service.list_accessible_customers()
+        response = _ads_calls.call(customer_service.list_accessible_customers)
         return [rn.replace("customers/", "") for rn in response.resource_names]
     except Exception as e:
         logger.error(f"Failed to get accessible customers: {e}")
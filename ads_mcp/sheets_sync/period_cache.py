@@ -0,0 +1,137 @@
+"""Persistent cache of the KPI values of closed periods.
+
+Once the conversion-lag window after its end has passed, the metrics of a
+period no longer change, so they are stored in a local SQLite file keyed by
+(customer_id, period start, period end, metric set) and read back on the next
+syncs instead of being queried again. The metric set identifies the fields
+stored, so changing the KPI fields invalidates the cached entries.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Union
+
+from ads_mcp.sheets_sync.config import CONVERSION_LAG_DAYS, PERIOD_CACHE_PATH
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS period_metrics (
+    customer_id TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    metric_set TEXT NOT NULL,
+    metric_values TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (customer_id, start_date, end_date, metric_set)
+)
+"""
+
+_cache: Optional["PeriodCache"] = None
+_cache_lock = threading.Lock()
+
+
+def metric_set_id(fields: Iterable[str]) -> str:
+    """Return a short ID for a set of metric fields."""
+    digest = hashlib.sha1(",".join(sorted(fields)).encode())
+    return digest.hexdigest()[:16]
+
+
+def is_closed(
+    end: Union[date, datetime],
+    today: Optional[date] = None,
+    lag_days: int = CONVERSION_LAG_DAYS,
+) -> bool:
+    """Return whether a period ending on `end` can no longer change."""
+    if isinstance(end, datetime):
+        end = end.date()
+    today = today or date.today()
+    return end <= today - timedelta(days=lag_days)
+
+
+def _format_date(dt: Union[date, datetime]) -> str:
+    return dt.strftime("%Y-%m-%d")
+
+
+class PeriodCache:
+    """Thread-safe SQLite store of period metric values."""
+
+    def __init__(self, path: str):
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(_SCHEMA)
+
+    def get(
+        self,
+        customer_id: str,
+        start: Union[date, datetime],
+        end: Union[date, datetime],
+        metric_set: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Return the stored values of a period, None if not cached."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT metric_values FROM period_metrics WHERE customer_id = ? "
+                "AND start_date = ? AND end_date = ? AND metric_set = ?",
+                (
+                    customer_id,
+                    _format_date(start),
+                    _format_date(end),
+                    metric_set,
+                ),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(
+        self,
+        customer_id: str,
+        start: Union[date, datetime],
+        end: Union[date, datetime],
+        metric_set: str,
+        values: Dict[str, Any],
+    ):
+        """Store the values of a period, replacing any previous ones."""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO period_metrics VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    customer_id,
+                    _format_date(start),
+                    _format_date(end),
+                    metric_set,
+                    json.dumps(values),
+                    time.time(),
+                ),
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+def get_period_cache() -> Optional[PeriodCache]:
+    """Return the process-wide cache, None if disabled or it can't be opened."""
+    global _cache
+    if _cache is None and PERIOD_CACHE_PATH:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = PeriodCache(PERIOD_CACHE_PATH)
+                except (OSError, sqlite3.Error) as e:
+                    logger.error(
+                        f"Could not open period cache {PERIOD_CACHE_PATH}: {e}"
+                    )
+                    return None
+    return _cache
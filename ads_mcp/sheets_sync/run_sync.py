@@ -1,17 +1,20 @@
 """Main entry point for Google Sheets sync job."""
 
+import argparse
 import logging
 import requests
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
-from ads_mcp.sheets_sync.config import DISCORD_WEBHOOK_URL
+from ads_mcp import profiling
+from ads_mcp.sheets_sync.config import DISCORD_WEBHOOK_URL, SYNC_WORKERS
+from ads_mcp.sheets_sync.jobs import FAILED, SKIPPED, SUCCEEDED, SyncJob
 from ads_mcp.sheets_sync.metrics import get_account_metrics
 from ads_mcp.sheets_sync.sheets_writer import (
+    SheetIndex,
+    SheetWriteBuffer,
     get_sheet_data,
-    find_account_row,
-    find_under_management_accounts,
-    update_account_row,
 )
 
 logging.basicConfig(
@@ -75,10 +78,60 @@ def send_discord_summary(success_count: int, error_count: int, errors: List[str]
     )
 
 
-def run_sync():
-    """Main sync function - pull data from Google Ads and write to Sheets."""
+def process_account(
+    account_id: str,
+    sheet_index: SheetIndex,
+    write_buffer: SheetWriteBuffer,
+    full_refresh: bool = False,
+) -> Optional[int]:
+    """Pull metrics for one account and buffer the update of its row.
+
+    Returns the row index, or None if the account has no row in the sheet.
+    Raises on errors.
+    """
+    logger.info(f"Processing account: {account_id}")
+    
+    # Find row for this account
+    row_index = sheet_index.find_row(account_id)
+    
+    if row_index == -1:
+        logger.warning(f"Account {account_id} not found in sheet, skipping")
+        return None
+    
+    # Get metrics from Google Ads
+    metrics = get_account_metrics(account_id, full_refresh=full_refresh)
+    
+    if not metrics:
+        raise Exception("No metrics returned")
+    
+    # Queue the row update, written with the other accounts
+    if not write_buffer.add_mapped_row(row_index, sheet_index.mapped_columns, metrics):
+        raise Exception("Failed to update row")
+    
+    return row_index
+
+
+def _account_result(future: Future) -> str:
+    """Return the job outcome of a finished process_account call."""
+    if future.exception() is not None:
+        return FAILED
+    # Accounts without a row in the sheet aren't counted by the summary either
+    if future.result() is None:
+        return SKIPPED
+    return SUCCEEDED
+
+
+def run_sync(progress: Optional[SyncJob] = None, full_refresh: bool = False):
+    """Main sync function - pull data from Google Ads and write to Sheets.
+    
+    Args:
+        progress: optional job the number of accounts and their outcome are
+            reported to as the sync runs.
+        full_refresh: query the KPIs of closed periods again instead of
+            reading them from the period cache.
+    """
     logger.info("=" * 50)
-    logger.info("Starting Google Sheets sync")
+    logger.info("Starting Google Sheets sync" + (" (full refresh)" if full_refresh else ""))
     logger.info("=" * 50)
     
     success_count = 0
@@ -88,54 +141,78 @@ def run_sync():
     try:
         # Get current sheet data
         logger.info("Fetching sheet data...")
-        values, headers = get_sheet_data()
-        
-        if not values:
-            raise Exception("Sheet is empty or could not be read")
-        
-        logger.info(f"Found {len(values) - 1} rows in sheet")
+        with profiling.profile("sync-sheet-read"):
+            values, headers = get_sheet_data()
+            
+            if not values:
+                raise Exception("Sheet is empty or could not be read")
+            
+            logger.info(f"Found {len(values) - 1} rows in sheet")
+            
+            # Index the sheet once; all lookups below are dict lookups
+            sheet_index = SheetIndex(values, headers)
         
         # Find accounts to process
-        account_ids = find_under_management_accounts(values, headers)
+        account_ids = sheet_index.under_management
         logger.info(f"Found {len(account_ids)} accounts under management")
         
         if not account_ids:
             logger.warning("No accounts to process")
             return
         
-        # Process each account
-        for account_id in account_ids:
-            try:
-                logger.info(f"Processing account: {account_id}")
-                
-                # Find row for this account
-                row_index = find_account_row(values, headers, account_id)
-                
-                if row_index == -1:
-                    logger.warning(f"Account {account_id} not found in sheet, skipping")
-                    continue
-                
-                # Get metrics from Google Ads
-                metrics = get_account_metrics(account_id)
-                
-                if not metrics:
-                    raise Exception("No metrics returned")
-                
-                # Update the row
-                success = update_account_row(row_index, headers, metrics)
-                
-                if success:
-                    success_count += 1
-                    logger.info(f"✓ Successfully updated account {account_id}")
-                else:
-                    raise Exception("Failed to update row")
-                
-            except Exception as e:
+        if progress:
+            progress.start(len(account_ids))
+        
+        # Process accounts concurrently; the Ads and Sheets rate limiters are
+        # shared by all workers
+        workers = max(1, min(SYNC_WORKERS, len(account_ids)))
+        logger.info(f"Processing accounts with {workers} workers")
+        write_buffer = SheetWriteBuffer()
+        processed = []
+        # When profiled, the stacks of each account are rooted at its id
+        with profiling.profile("sync-account-metrics"), ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="sheets-sync"
+        ) as pool:
+            futures = [
+                pool.submit(
+                    profiling.bind(process_account, label=account_id),
+                    account_id, sheet_index, write_buffer, full_refresh,
+                )
+                for account_id in account_ids
+            ]
+            if progress:
+                for future in futures:
+                    future.add_done_callback(
+                        lambda f: progress.account_finished(_account_result(f))
+                    )
+            # Results are collected in sheet order to keep the summary stable
+            for account_id, future in zip(account_ids, futures):
+                try:
+                    row_index = future.result()
+                    if row_index is not None:
+                        processed.append((account_id, row_index))
+                except Exception as e:
+                    error_count += 1
+                    error_msg = f"{account_id}: {str(e)}"
+                    error_messages.append(error_msg)
+                    logger.error(f"✗ Error processing {account_id}: {e}")
+                    send_discord_error(str(e), account_id)
+        
+        # Write the remaining rows; earlier flushes may have happened while
+        # the workers were running
+        with profiling.profile("sync-sheet-write"):
+            write_buffer.flush()
+        for account_id, row_index in processed:
+            if row_index in write_buffer.failed_rows:
                 error_count += 1
-                error_msg = f"{account_id}: {str(e)}"
-                error_messages.append(error_msg)
-                logger.error(f"✗ Error processing {account_id}: {e}")
-                send_discord_error(str(e), account_id)
+                error_messages.append(f"{account_id}: Failed to update row")
+                logger.error(f"✗ Error processing {account_id}: Failed to update row")
+                send_discord_error("Failed to update row", account_id)
+                if progress:
+                    progress.write_failed()
+            else:
+                success_count += 1
+                logger.info(f"✓ Successfully updated account {account_id}")
         
     except Exception as e:
         logger.error(f"Fatal error during sync: {e}")
@@ -151,4 +228,11 @@ def run_sync():
 
 
 if __name__ == "__main__":
-    run_sync()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--full-refresh",
+        action="store_true",
+        help="query closed periods again instead of using the period cache",
+    )
+    args = parser.parse_args()
+    run_sync(full_refresh=args.full_refresh)
@@ -1,49 +1,130 @@
 """Write data to Google Sheets."""
 
+import functools
 import os
 import json
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import httplib2
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
+from googleapiclient.http import HttpRequest
 
-from ads_mcp.sheets_sync.config import SPREADSHEET_ID, SHEET_NAME, COLUMN_MAPPINGS
+from ads_mcp.rate_limit import TokenBucket
+from ads_mcp.sheets_sync.config import (
+    SPREADSHEET_ID,
+    SHEET_NAME,
+    COLUMN_MAPPINGS,
+    SHEETS_FLUSH_CELLS,
+    SHEETS_MAX_REQUEST_BYTES,
+    SHEETS_REQUESTS_PER_MINUTE,
+)
 
 logger = logging.getLogger(__name__)
 
 # Scopes for Google Sheets API
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
+# Shared by all sync workers; the Sheets quota is counted per minute, so
+# bursts are kept small.
+_sheets_rate_limiter = TokenBucket(SHEETS_REQUESTS_PER_MINUTE / 60, capacity=5)
 
-def _get_sheets_service():
-    """Create Google Sheets API service using service account credentials."""
+# Timeout of a single Sheets API request, in seconds
+HTTP_TIMEOUT_SECONDS = 120
+
+_credentials: Optional[service_account.Credentials] = None
+_sheets_service = None
+_service_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def _get_credentials() -> service_account.Credentials:
+    """Load the service account credentials, once per process.
+    
+    The same credentials object is used by every thread, so its access token
+    is refreshed once when it expires instead of once per client.
+    """
+    global _credentials
+    if _credentials is None:
+        with _service_lock:
+            if _credentials is None:
+                _credentials = _load_credentials()
+    return _credentials
+
+
+def _load_credentials() -> service_account.Credentials:
+    """Create service account credentials from the environment."""
     
     # Try to load credentials from environment variable (JSON string)
     creds_json = os.environ.get("GOOGLE_SHEETS_CREDENTIALS")
     
     if creds_json:
         creds_dict = json.loads(creds_json)
-        credentials = service_account.Credentials.from_service_account_info(
+        return service_account.Credentials.from_service_account_info(
             creds_dict, scopes=SCOPES
         )
-    else:
-        # Fallback: load from file
-        creds_file = os.environ.get(
-            "GOOGLE_SHEETS_CREDENTIALS_FILE",
-            "credentials/sheets_service_account.json"
-        )
-        credentials = service_account.Credentials.from_service_account_file(
-            creds_file, scopes=SCOPES
+    
+    # Fallback: load from file
+    creds_file = os.environ.get(
+        "GOOGLE_SHEETS_CREDENTIALS_FILE",
+        "credentials/sheets_service_account.json"
+    )
+    return service_account.Credentials.from_service_account_file(
+        creds_file, scopes=SCOPES
+    )
+
+
+def _get_http() -> AuthorizedHttp:
+    """Get this thread's authorized HTTP transport.
+    
+    httplib2 connections can't be shared between threads, so each thread
+    keeps its own, reusing the open keep-alive connection across requests.
+    """
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = AuthorizedHttp(
+            _get_credentials(), http=httplib2.Http(timeout=HTTP_TIMEOUT_SECONDS)
         )
+        _thread_local.http = http
+    return http
+
+
+def _build_request(http, *args, **kwargs) -> HttpRequest:
+    """Build a request sent over the calling thread's transport."""
+    return HttpRequest(_get_http(), *args, **kwargs)
+
+
+def _get_sheets_service():
+    """Get the Google Sheets API service, built once per process.
     
-    return build("sheets", "v4", credentials=credentials)
+    The service is built from the discovery document bundled with
+    google-api-python-client, so no discovery request is made. It is shared
+    by all threads, which send their requests through their own transport.
+    """
+    global _sheets_service
+    if _sheets_service is None:
+        credentials = _get_credentials()
+        with _service_lock:
+            if _sheets_service is None:
+                _sheets_service = build(
+                    "sheets",
+                    "v4",
+                    credentials=credentials,
+                    requestBuilder=_build_request,
+                    static_discovery=True,
+                    cache_discovery=False,
+                )
+    return _sheets_service
 
 
 def get_sheet_data() -> tuple[List[List[Any]], List[str]]:
     """Get current sheet data and headers."""
     service = _get_sheets_service()
     
+    _sheets_rate_limiter.acquire()
     result = service.spreadsheets().values().get(
         spreadsheetId=SPREADSHEET_ID,
         range=f"'{SHEET_NAME}'"
@@ -58,74 +139,90 @@ def get_sheet_data() -> tuple[List[List[Any]], List[str]]:
     return values, headers
 
 
-def find_account_row(values: List[List[Any]], headers: List[str], account_id: str) -> int:
-    """Find the row index for a given account ID. Returns -1 if not found."""
-    
-    # Find ACCOUNT-ID column
-    account_col = -1
-    for i, header in enumerate(headers):
-        h = header.strip().upper().replace(" ", "-")
-        if h in ["ACCOUNT-ID", "ACCOUNT_ID", "ACCOUNTID"]:
-            account_col = i
-            break
-    
-    if account_col == -1:
-        logger.error("Could not find ACCOUNT-ID column")
-        return -1
+def _mapped_columns(headers: List[str]) -> List[Tuple[int, str]]:
+    """Return (column index, metrics key) for every header in COLUMN_MAPPINGS."""
+    return [
+        (i, COLUMN_MAPPINGS[header.strip()])
+        for i, header in enumerate(headers)
+        if header.strip() in COLUMN_MAPPINGS
+    ]
+
+
+def _normalize_account_id(value: Any) -> str:
+    return str(value).replace("-", "").replace(".0", "").strip()
+
+
+class SheetIndex:
+    """Lookup tables over the sheet, built once per sync.
     
-    # Normalize search ID (remove dashes)
-    search_id = account_id.replace("-", "").strip()
+    Attributes:
+        account_col: index of the ACCOUNT-ID column, -1 if missing.
+        management_col: index of the 'Under Management' column, -1 if missing.
+        header_columns: stripped header -> column index.
+        mapped_columns: (column index, metrics key) of every mapped header.
+        account_rows: normalized account ID -> index of its first row.
+        under_management: account IDs to sync, in sheet order.
+    """
     
-    # Search for account (start from row 1, skip header)
-    for row_idx, row in enumerate(values[1:], start=1):
-        if len(row) > account_col:
-            row_id = str(row[account_col]).replace("-", "").replace(".0", "").strip()
-            if row_id == search_id:
-                return row_idx
+    def __init__(self, values: List[List[Any]], headers: List[str]):
+        self.account_col = -1
+        self.management_col = -1
+        self.header_columns: Dict[str, int] = {}
+        self.mapped_columns = _mapped_columns(headers)
+        
+        for i, header in enumerate(headers):
+            header_clean = header.strip()
+            self.header_columns.setdefault(header_clean, i)
+            
+            h = header_clean.upper().replace(" ", "-")
+            if h in ["ACCOUNT-ID", "ACCOUNT_ID", "ACCOUNTID"]:
+                if self.account_col == -1:
+                    self.account_col = i
+            elif "UNDER" in h and "MANAGEMENT" in h:
+                self.management_col = i
+        
+        self.account_rows: Dict[str, int] = {}
+        self.under_management: List[str] = []
+        self.under_management_set: Set[str] = set()
+        
+        if self.account_col == -1:
+            logger.error("Could not find ACCOUNT-ID column")
+            return
+        if self.management_col == -1:
+            logger.warning("Could not find 'Under Management' column, returning all accounts")
+        
+        account_col = self.account_col
+        mgmt_col = self.management_col
+        for row_idx, row in enumerate(values[1:], start=1):
+            if len(row) <= account_col:
+                continue
+            acc_id = _normalize_account_id(row[account_col])
+            self.account_rows.setdefault(acc_id, row_idx)
+            if not acc_id:
+                continue
+            if mgmt_col == -1:
+                # Return all account IDs if no management column
+                managed = bool(row[account_col])
+            else:
+                managed = len(row) > mgmt_col and str(row[mgmt_col]).strip().lower() == "yes"
+            if managed:
+                self.under_management.append(acc_id)
+                self.under_management_set.add(acc_id)
     
-    return -1
+    def find_row(self, account_id: str) -> int:
+        """Return the row index of an account ID, -1 if not found."""
+        # Normalize search ID (remove dashes)
+        return self.account_rows.get(account_id.replace("-", "").strip(), -1)
+
+
+def find_account_row(values: List[List[Any]], headers: List[str], account_id: str) -> int:
+    """Find the row index for a given account ID. Returns -1 if not found."""
+    return SheetIndex(values, headers).find_row(account_id)
 
 
 def find_under_management_accounts(values: List[List[Any]], headers: List[str]) -> List[str]:
     """Find all account IDs where 'Under Management' = 'Yes'."""
-    
-    # Find column indices
-    account_col = -1
-    mgmt_col = -1
-    
-    for i, header in enumerate(headers):
-        h = header.strip().upper().replace(" ", "-")
-        if h in ["ACCOUNT-ID", "ACCOUNT_ID", "ACCOUNTID"]:
-            account_col = i
-        elif "UNDER" in h and "MANAGEMENT" in h:
-            mgmt_col = i
-    
-    if account_col == -1:
-        logger.error("Could not find ACCOUNT-ID column")
-        return []
-    
-    if mgmt_col == -1:
-        logger.warning("Could not find 'Under Management' column, returning all accounts")
-        # Return all account IDs if no management column
-        accounts = []
-        for row in values[1:]:
-            if len(row) > account_col and row[account_col]:
-                acc_id = str(row[account_col]).replace("-", "").replace(".0", "").strip()
-                if acc_id:
-                    accounts.append(acc_id)
-        return accounts
-    
-    # Find accounts under management
-    accounts = []
-    for row in values[1:]:
-        if len(row) > max(account_col, mgmt_col):
-            mgmt_status = str(row[mgmt_col]).strip().lower() if len(row) > mgmt_col else ""
-            if mgmt_status == "yes":
-                acc_id = str(row[account_col]).replace("-", "").replace(".0", "").strip()
-                if acc_id:
-                    accounts.append(acc_id)
-    
-    return accounts
+    return SheetIndex(values, headers).under_management
 
 
 def update_account_row(
@@ -134,55 +231,183 @@ def update_account_row(
     metrics: Dict[str, Any]
 ) -> bool:
     """Update a single row with metrics data."""
+    buffer = SheetWriteBuffer()
+    if not buffer.add_row(row_index, headers, metrics):
+        return False
+    return not buffer.flush()
+
+
+class SheetWriteBuffer:
+    """Collects row updates and writes them with few batchUpdate calls.
+
+    Adjacent cells of a row are merged into one range, and rows with the same
+    columns that follow each other are merged into one block. Blocks are sent
+    in batchUpdate calls of at most `max_request_bytes`. The buffer is safe to
+    fill from several threads.
+    """
     
-    service = _get_sheets_service()
+    def __init__(
+        self,
+        flush_cells: int = SHEETS_FLUSH_CELLS,
+        max_request_bytes: int = SHEETS_MAX_REQUEST_BYTES,
+    ):
+        """Create an empty buffer.
+        
+        Args:
+            flush_cells: flush as soon as this many cells are buffered, 0 to
+                only write on explicit flush() calls.
+            max_request_bytes: upper bound on the body of one batchUpdate.
+        """
+        self.flush_cells = flush_cells
+        self.max_request_bytes = max_request_bytes
+        # Rows whose write failed, across all flushes
+        self.failed_rows: Set[int] = set()
+        self._rows: Dict[int, Dict[int, Any]] = {}
+        self._cell_count = 0
+        self._lock = threading.Lock()
+        # Serializes flushes so rows are written in the order they were added
+        self._flush_lock = threading.Lock()
     
-    # Build the update data
-    # We need to map metrics to the correct columns
-    updates = []
+    def add_row(self, row_index: int, headers: List[str], metrics: Dict[str, Any]) -> bool:
+        """Buffer the mapped metrics of one row.
+        
+        Returns False if none of the headers is mapped to a metric.
+        """
+        return self.add_mapped_row(row_index, _mapped_columns(headers), metrics)
     
-    for col_idx, header in enumerate(headers):
-        # Normalize header for matching
-        header_clean = header.strip()
+    def add_mapped_row(
+        self,
+        row_index: int,
+        mapped_columns: List[Tuple[int, str]],
+        metrics: Dict[str, Any],
+    ) -> bool:
+        """Buffer one row given the (column index, metrics key) of each mapped column.
         
-        # Check if this header is in our mappings
-        if header_clean in COLUMN_MAPPINGS:
-            metric_key = COLUMN_MAPPINGS[header_clean]
+        Returns False if there are no mapped columns.
+        """
+        cells = {}
+        for col_idx, metric_key in mapped_columns:
             value = metrics.get(metric_key, "")
+            cells[col_idx] = "" if value is None else value
+        
+        if not cells:
+            logger.warning(f"No updates to make for row {row_index}")
+            return False
+        
+        with self._lock:
+            previous = self._rows.get(row_index)
+            if previous is not None:
+                self._cell_count -= len(previous)
+            self._rows[row_index] = cells
+            self._cell_count += len(cells)
+            should_flush = self.flush_cells and self._cell_count >= self.flush_cells
+        if should_flush:
+            self.flush()
+        return True
+    
+    def pending_cells(self) -> int:
+        with self._lock:
+            return self._cell_count
+    
+    def flush(self) -> Set[int]:
+        """Write the buffered rows.
+        
+        Returns:
+            The rows of this flush that failed to be written; they are also
+            added to `failed_rows`.
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, {}
+                self._cell_count = 0
+            if not rows:
+                return set()
             
-            # Format the value appropriately
-            if value is None:
-                value = ""
-            elif isinstance(value, float):
-                # Keep as number for Sheets
-                pass
-            
-            updates.append({
-                "range": f"'{SHEET_NAME}'!{_col_letter(col_idx)}{row_index + 1}",
-                "values": [[value]]
-            })
+            failed = set()
+            chunks = _chunk_ranges(_merge_ranges(rows), self.max_request_bytes)
+            logger.info(
+                f"Writing {sum(len(r) for r in rows.values())} cells of {len(rows)} rows "
+                f"in {len(chunks)} request(s)"
+            )
+            service = _get_sheets_service()
+            for data, chunk_rows in chunks:
+                body = {
+                    "valueInputOption": "USER_ENTERED",
+                    "data": data
+                }
+                try:
+                    _sheets_rate_limiter.acquire()
+                    service.spreadsheets().values().batchUpdate(
+                        spreadsheetId=SPREADSHEET_ID,
+                        body=body
+                    ).execute()
+                except Exception as e:
+                    logger.error(f"Failed to update rows {min(chunk_rows)}-{max(chunk_rows)}: {e}")
+                    failed.update(chunk_rows)
+            self.failed_rows.update(failed)
+            return failed
+
+
+def _merge_ranges(rows: Dict[int, Dict[int, Any]]) -> List[Tuple[Dict[str, Any], List[int]]]:
+    """Merge buffered cells into value ranges.
     
-    if not updates:
-        logger.warning(f"No updates to make for row {row_index}")
-        return False
+    Returns:
+        (range, row indices) pairs, the range in batchUpdate format.
+    """
+    # Runs of adjacent columns per row: (first col, last col) -> row -> values
+    runs: Dict[Tuple[int, int], Dict[int, List[Any]]] = {}
+    for row_index, cells in rows.items():
+        columns = sorted(cells)
+        start = 0
+        for i in range(1, len(columns) + 1):
+            if i == len(columns) or columns[i] != columns[i - 1] + 1:
+                span = (columns[start], columns[i - 1])
+                runs.setdefault(span, {})[row_index] = [cells[c] for c in columns[start:i]]
+                start = i
     
-    # Batch update
-    body = {
-        "valueInputOption": "USER_ENTERED",
-        "data": updates
-    }
-    
-    try:
-        service.spreadsheets().values().batchUpdate(
-            spreadsheetId=SPREADSHEET_ID,
-            body=body
-        ).execute()
-        return True
-    except Exception as e:
-        logger.error(f"Failed to update row {row_index}: {e}")
-        return False
+    ranges = []
+    for (first_col, last_col), run_rows in sorted(runs.items()):
+        row_indices = sorted(run_rows)
+        block = [row_indices[0]]
+        for row_index in row_indices[1:] + [None]:
+            if row_index is not None and row_index == block[-1] + 1:
+                block.append(row_index)
+                continue
+            ranges.append((
+                {
+                    "range": (
+                        f"'{SHEET_NAME}'!{_col_letter(first_col)}{block[0] + 1}:"
+                        f"{_col_letter(last_col)}{block[-1] + 1}"
+                    ),
+                    "values": [run_rows[r] for r in block]
+                },
+                block
+            ))
+            block = [row_index]
+    return ranges
+
+
+def _chunk_ranges(
+    ranges: List[Tuple[Dict[str, Any], List[int]]],
+    max_request_bytes: int
+) -> List[Tuple[List[Dict[str, Any]], Set[int]]]:
+    """Split ranges into batchUpdate payloads of at most max_request_bytes."""
+    chunks = []
+    data, chunk_rows, size = [], set(), 0
+    for value_range, row_indices in ranges:
+        range_size = len(json.dumps(value_range)) + 2
+        if data and size + range_size > max_request_bytes:
+            chunks.append((data, chunk_rows))
+            data, chunk_rows, size = [], set(), 0
+        data.append(value_range)
+        chunk_rows.update(row_indices)
+        size += range_size
+    if data:
+        chunks.append((data, chunk_rows))
+    return chunks
 
 
+@functools.lru_cache(maxsize=None)
 def _col_letter(col_idx: int) -> str:
     """Convert column index to letter (0=A, 1=B, ..., 26=AA, etc.)."""
     result = ""
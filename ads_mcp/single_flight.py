@@ -0,0 +1,84 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Single-flight execution of identical concurrent calls.
+
+`SingleFlight.do(key, func)` runs `func` unless a call with the same key is
+already in flight, in which case it waits for that call and returns its
+result, or raises its error. Nothing is kept once the call returns, so
+unlike a cache it never serves a result that was computed before the
+request arrived.
+
+Waiters block their thread; callers running in a worker pool therefore hold
+a worker while they wait, but make no API call of their own.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls by key; thread-safe."""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> Tuple[T, bool]:
+        """Runs `func`, or joins the call with the same key in flight.
+
+        Returns:
+            The result and whether it was shared from another caller's call.
+
+        Raises:
+            The error of the call, also to the callers that joined it.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = func()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Returns the number of calls currently running."""
+        with self._lock:
+            return len(self._calls)
@@ -0,0 +1,226 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Process-wide counters and histograms in the Prometheus text format.
+
+Metrics sit on the hot path of every search, so they are kept minimal: a
+sample is a dict lookup and an addition under a per-metric lock, and
+histograms find their bucket with a bisection. Labels are passed
+positionally, in the order of the metric's label names.
+
+All metrics are served by `metrics_endpoint`, mounted as `/metrics` on the
+SSE app of the MCP server and on the sheets sync app. Recording can be turned
+off with GOOGLE_ADS_MCP_METRICS=0.
+"""
+
+import bisect
+import os
+import threading
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+_ENABLED_ENV = "GOOGLE_ADS_MCP_METRICS"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a cache hit to a multi-minute report.
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+    120.0,
+)
+
+enabled = os.environ.get(_ENABLED_ENV, "1").lower() not in ("0", "false")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """A monotonically increasing count per label values."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        """Adds `amount` to the count of the given label values."""
+        if not enabled:
+            return
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def collect(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            yield (
+                f"{self.name}{_format_labels(self.labelnames, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Histogram:
+    """Counts of observed values per bucket, with their sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [count per bucket, then +Inf], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Records `value` for the given label values."""
+        if not enabled:
+            return
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = ([0] * (len(self.buckets) + 1), [0.0])
+                self._values[labels] = state
+            state[0][index] += 1
+            state[1][0] += value
+
+    def get_count(self, *labels: str) -> int:
+        with self._lock:
+            state = self._values.get(labels)
+            return sum(state[0]) if state else 0
+
+    def get_sum(self, *labels: str) -> float:
+        with self._lock:
+            state = self._values.get(labels)
+            return state[1][0] if state else 0.0
+
+    def collect(self) -> Iterator[str]:
+        with self._lock:
+            values = [
+                (labels, list(counts), total[0])
+                for labels, (counts, total) in self._values.items()
+            ]
+        bounds = self.buckets + (float("inf"),)
+        for labels, counts, total in sorted(values):
+            cumulative = 0
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                label_text = _format_labels(
+                    self.labelnames + ("le",), labels + (_format_value(bound),)
+                )
+                yield f"{self.name}_bucket{label_text} {cumulative}"
+            label_text = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(total)}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Registry:
+    """A set of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: Dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(
+            Histogram(name, documentation, labelnames, buckets)
+        )
+
+    def render(self) -> str:
+        """Returns all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered.")
+            self._metrics[metric.name] = metric
+        return metric
+
+
+REGISTRY = Registry()
+counter = REGISTRY.counter
+histogram = REGISTRY.histogram
+
+
+async def metrics_endpoint(request):
+    """Starlette endpoint serving the metrics of REGISTRY."""
+    from starlette.responses import Response
+
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
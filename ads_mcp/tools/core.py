@@ -14,25 +14,30 @@
 
 """Tools for exposing simple, core API methods to the MCP server."""
 
-from typing import List
+from typing import TYPE_CHECKING, List
 from ads_mcp.coordinator import mcp
+from ads_mcp import api_calls
+from ads_mcp import executor
 
 import ads_mcp.utils as utils
 
-from google.ads.googleads.v21.services.types.customer_service import (
-    ListAccessibleCustomersResponse,
-)
+if TYPE_CHECKING:
+    from google.ads.googleads.v21.services.types.customer_service import (
+        ListAccessibleCustomersResponse,
+    )
 
 
-@mcp.tool()
 def list_accessible_customers() -> List[str]:
     """Returns ids of customers directly accessible by the user authenticating the call."""
     ga_service = utils.get_googleads_service("CustomerService")
-    accessible_customers: ListAccessibleCustomersResponse = (
-        ga_service.list_accessible_customers()
+    accessible_customers: ListAccessibleCustomersResponse = api_calls.call(
+        ga_service.list_accessible_customers
     )
     # remove customer/ from the start of each resource
     return [
         cust_rn.removeprefix("customers/")
         for cust_rn in accessible_customers.resource_names
     ]
+
+
+mcp.add_tool(executor.offload(list_accessible_customers))
@@ -0,0 +1,55 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tools for looking up the GAQL resources and fields usable with search."""
+
+from typing import Any, Dict, List
+from ads_mcp.coordinator import mcp
+from ads_mcp import gaql_index
+
+
+@mcp.tool()
+def list_gaql_resources() -> List[str]:
+    """Returns the names of all resources that can be used in the FROM clause of search.
+
+    Metrics and segments are listed as the `metrics` and `segments` resources.
+    """
+    return gaql_index.get_index().resource_names()
+
+
+@mcp.tool()
+def describe_gaql_resource(resource: str) -> Dict[str, Any]:
+    """Returns the fields of a resource usable with search.
+
+    Args:
+        resource: The resource name, for example campaign, metrics or segments
+
+    Returns the selectable fields (usable in fields), the filterable fields
+    (usable in conditions) and the sortable fields (usable in orderings).
+    """
+    return gaql_index.get_index().describe(resource)
+
+
+@mcp.tool()
+def find_gaql_fields(
+    text: str, resource: str = None, limit: int = 50
+) -> List[str]:
+    """Finds GAQL fields whose name contains the given text, prefix matches first.
+
+    Args:
+        text: Part of the field name, for example impression_share or campaign.bidding
+        resource: Optional. Only search the fields of this resource
+        limit: The maximum number of fields to return
+    """
+    return gaql_index.get_index().find_fields(text, resource, limit)
@@ -14,10 +14,62 @@
 
 """Tools for exposing the API Search method to the MCP server."""
 
-from typing import Any, Dict, List
+import asyncio
+import contextlib
+import os
+import time
+from typing import Any, Dict, Iterator, List
+from mcp.server.fastmcp.resources import FileResource
 from ads_mcp.coordinator import mcp
+from ads_mcp import api_calls
+from ads_mcp import cursors
+from ads_mcp import executor
+from ads_mcp import exports
+from ads_mcp import gaql_index
+from ads_mcp import query_cache
+from ads_mcp import single_flight
+from ads_mcp import telemetry
+from ads_mcp.tools import core
 import ads_mcp.utils as utils
 
+# Maximum number of accounts queried at once by search_customers. It is kept
+# below the worker pool size so a fan-out leaves workers for other tool calls.
+_FANOUT_CONCURRENCY_ENV = "GOOGLE_ADS_MCP_FANOUT_CONCURRENCY"
+_DEFAULT_FANOUT_CONCURRENCY = 4
+
+_FORMATS = ("rows", "columnar")
+
+_cursor_store = cursors.CursorStore()
+_query_cache = query_cache.QueryCache()
+# Identical searches running at the same time share one API call.
+_in_flight = single_flight.SingleFlight()
+
+SEARCH_ROWS = telemetry.counter(
+    "google_ads_mcp_search_rows_total", "Rows returned by search_stream."
+)
+SEARCH_BATCHES = telemetry.counter(
+    "google_ads_mcp_search_batches_total",
+    "Responses (batches of rows) received from search_stream.",
+)
+SEARCH_CACHE = telemetry.counter(
+    "google_ads_mcp_search_cache_total",
+    "Searches by whether they were served from the result cache.",
+    ("result",),
+)
+SEARCH_COALESCED = telemetry.counter(
+    "google_ads_mcp_search_coalesced_total",
+    "Searches that joined an identical search already in flight instead of "
+    "calling the API.",
+)
+SEARCH_FIRST_BATCH = telemetry.histogram(
+    "google_ads_mcp_search_first_batch_seconds",
+    "Time from sending a search to receiving its first batch.",
+)
+SEARCH_FORMAT = telemetry.histogram(
+    "google_ads_mcp_search_format_seconds",
+    "Time spent converting the rows of a search to dicts or value lists.",
+)
+
 
 def search(
     customer_id: str,
@@ -26,7 +78,11 @@ def search(
     conditions: List[str] = None,
     orderings: List[str] = None,
     limit: int | str = None,
-) -> List[Dict[str, Any]]:
+    page_size: int = None,
+    format: str = "rows",
+    dictionary_encode: bool = False,
+    export: str = None,
+) -> List[Dict[str, Any]] | Dict[str, Any]:
     """Fetches data from the Google Ads API using the search method
 
     Args:
@@ -36,10 +92,236 @@ def search(
         conditions: List of conditions to filter the data, combined using AND clauses
         orderings: How the data is ordered
         limit: The maximum number of rows to return
+        page_size: Optional. When set, returns at most this many rows as
+            {"rows": [...], "next_cursor": ...}; pass next_cursor to
+            search_next_page to fetch the following page
+        format: Optional. "rows" returns a {field: value} dict per row.
+            "columnar" returns {"columns": [...], "rows": [[...], ...]}, each
+            row listing its values in the order of columns, which is several
+            times smaller for wide or long results. Pages of a columnar
+            search hold such value lists too
+        dictionary_encode: Optional. With format "columnar" and no
+            page_size, replaces the values of repetitive text columns (names,
+            dates, ...) by their index in "dictionaries": {column: [...]}
+        export: Optional. "ndjson", "csv" or "parquet" streams all the rows
+            to a file on the server instead of returning them, and returns
+            {"path", "uri", "format", "row_count", "size_bytes", "columns"}
     """
+    columnar = _check_format(format, dictionary_encode, page_size, export)
+
+    # Rejects unknown or misused fields without a round trip to the API.
+    gaql_index.get_index().validate_query(
+        fields, resource, conditions, orderings
+    )
+
+    if export:
+        return _export(
+            customer_id, fields, resource, conditions, orderings, limit, export
+        )
 
+    cache_key = query_cache.make_key(
+        customer_id, fields, resource, conditions, orderings, limit
+    )
+    if columnar:
+        # Columnar results are cached as value lists, apart from the dicts.
+        cache_key += ("columnar",)
+    cached_rows = _query_cache.get(cache_key)
+    if cached_rows is not None:
+        SEARCH_CACHE.inc("hit")
+        utils.logger.info("ads_mcp.search served from cache")
+        if page_size:
+            return _open_cursor(iter(cached_rows), fields, page_size, columnar)
+        return _present(cached_rows, fields, columnar, dictionary_encode)
+
+    SEARCH_CACHE.inc("miss")
     ga_service = utils.get_googleads_service("GoogleAdsService")
 
+    query = _build_query(fields, resource, conditions, orderings, limit)
+    utils.logger.info(f"ads_mcp.search query {query}")
+
+    def open_stream():
+        # The first batch is already read when search_stream returns.
+        started = time.perf_counter()
+        return started, ga_service.search_stream(
+            customer_id=customer_id, query=query
+        )
+
+    if page_size:
+        # Later pages are read on demand, so only the first batch is retried.
+        started, query_result = api_calls.call(open_stream, customer_id)
+        return _open_cursor(
+            _iter_rows(query_result, fields, started, columnar),
+            fields,
+            page_size,
+            columnar,
+        )
+
+    def read_rows():
+        started, query_result = open_stream()
+        # IMPORTANT: use the requested `fields` list (not field_mask.paths)
+        return list(_iter_rows(query_result, fields, started, columnar))
+
+    def fetch():
+        rows = api_calls.call(read_rows, customer_id)
+        # Cached before the flight ends, so later callers find the rows.
+        _query_cache.put(
+            cache_key, rows, len(fields), _query_cache.ttl_for(conditions)
+        )
+        return rows
+
+    rows, shared = _in_flight.do(cache_key, fetch)
+    if shared:
+        SEARCH_COALESCED.inc()
+        utils.logger.info("ads_mcp.search joined an identical search")
+    return _present(rows, fields, columnar, dictionary_encode)
+
+
+def _check_format(
+    format: str,
+    dictionary_encode: bool,
+    page_size: int | None,
+    export: str | None = None,
+) -> bool:
+    """Validates the output options of a search, returns whether columnar."""
+    if export:
+        exports.check_format(export)
+        if page_size or dictionary_encode:
+            raise ValueError(
+                "export can't be used with page_size or dictionary_encode."
+            )
+    if format not in _FORMATS:
+        raise ValueError(
+            f"Unknown format {format!r}, expected one of: "
+            f"{', '.join(_FORMATS)}."
+        )
+    columnar = format == "columnar"
+    if dictionary_encode and not columnar:
+        raise ValueError('dictionary_encode requires format "columnar".')
+    if dictionary_encode and page_size:
+        raise ValueError("dictionary_encode can't be used with page_size.")
+    return columnar
+
+
+def _export(
+    customer_id: str,
+    fields: List[str],
+    resource: str,
+    conditions: List[str] | None,
+    orderings: List[str] | None,
+    limit: int | str | None,
+    format: str,
+) -> Dict[str, Any]:
+    """Streams the rows of a search to a file, bypassing the result cache."""
+    ga_service = utils.get_googleads_service("GoogleAdsService")
+    query = _build_query(fields, resource, conditions, orderings, limit)
+    utils.logger.info(f"ads_mcp.search export {format} query {query}")
+
+    def open_stream():
+        started = time.perf_counter()
+        return started, ga_service.search_stream(
+            customer_id=customer_id, query=query
+        )
+
+    # As for pages, only the first batch is retried.
+    started, query_result = api_calls.call(open_stream, customer_id)
+    rows = _iter_rows(query_result, fields, started, columnar=True)
+    # The rows of the stream are of the client's GoogleAdsRow type, whose
+    # descriptor gives the column types up front.
+    row_type = type(utils.get_googleads_type("GoogleAdsRow"))
+    column_types = list(utils.get_row_value_types(row_type, tuple(fields)))
+    # Cancels the stream right away if writing the file fails.
+    with contextlib.closing(rows):
+        result = exports.export(
+            rows,
+            fields,
+            format,
+            name=f"{resource}-{customer_id}",
+            column_types=column_types,
+        )
+    result["uri"] = None
+    if exports.serve_as_resources():
+        result["uri"] = _add_export_resource(result)
+    return result
+
+
+def _add_export_resource(result: Dict[str, Any]) -> str:
+    """Serves an exported file as an MCP resource, returns its URI."""
+    name = os.path.basename(result["path"])
+    uri = f"ads-mcp://exports/{name}"
+    mcp.add_resource(
+        FileResource(
+            uri=uri,
+            name=name,
+            description=f"{result['row_count']} rows exported by search",
+            mime_type=exports.MIME_TYPES[result["format"]],
+            path=result["path"],
+        )
+    )
+    return uri
+
+
+def _open_cursor(
+    rows: Iterator[Any], fields: List[str], page_size: int, columnar: bool
+) -> Dict[str, Any]:
+    page = _cursor_store.open(rows, page_size)
+    if columnar:
+        return {"columns": list(fields), **page}
+    return page
+
+
+def _present(
+    rows: List[Any], fields: List[str], columnar: bool, dictionary_encode: bool
+) -> List[Dict[str, Any]] | Dict[str, Any]:
+    """Returns the rows of a search in the requested format."""
+    if not columnar:
+        return rows
+    result = {"columns": list(fields), "rows": rows}
+    if dictionary_encode:
+        result["rows"], result["dictionaries"] = _dictionary_encode(
+            fields, rows
+        )
+    return result
+
+
+def _dictionary_encode(
+    fields: List[str], rows: List[List[Any]]
+) -> tuple[List[List[Any]], Dict[str, List[str]]]:
+    """Replaces the values of low-cardinality text columns by indexes.
+
+    A column is encoded when all its values are strings and it has at most
+    half as many distinct values as rows. The rows are copied, as they may be
+    held by the result cache.
+    """
+    dictionaries = {}
+    encoded = []
+    for index, field in enumerate(fields):
+        column = [row[index] for row in rows]
+        if not all(isinstance(value, str) for value in column):
+            continue
+        distinct = dict.fromkeys(column)
+        if not column or len(distinct) * 2 > len(column):
+            continue
+        dictionaries[field] = list(distinct)
+        encoded.append((index, {value: i for i, value in enumerate(distinct)}))
+    if not encoded:
+        return rows, dictionaries
+    encoded_rows = []
+    for row in rows:
+        row = list(row)
+        for index, codes in encoded:
+            row[index] = codes[row[index]]
+        encoded_rows.append(row)
+    return encoded_rows, dictionaries
+
+
+def _build_query(
+    fields: List[str],
+    resource: str,
+    conditions: List[str] = None,
+    orderings: List[str] = None,
+    limit: int | str = None,
+) -> str:
+    """Assembles the GAQL query of a search."""
     query_parts = [f"SELECT {', '.join(fields)} FROM {resource}"]
 
     if conditions:
@@ -51,33 +333,170 @@ def search(
     if limit:
         query_parts.append(f" LIMIT {limit}")
 
-    query = "".join(query_parts)
-    utils.logger.info(f"ads_mcp.search query {query}")
+    return "".join(query_parts)
 
-    query_result = ga_service.search_stream(customer_id=customer_id, query=query)
 
-    final_output: List[Dict[str, Any]] = []
-    for batch in query_result:
-        for row in batch.results:
-            # IMPORTANT: use the requested `fields` list (not field_mask.paths)
-            final_output.append(utils.format_output_row(row, fields))
+def search_next_page(cursor: str, page_size: int = None) -> Dict[str, Any]:
+    """Fetches the next page of a paginated search
 
-    return final_output
+    Args:
+        cursor: The next_cursor returned by search or a previous call to this tool
+        page_size: Optional. Overrides the page size the search was started with
+    """
+    return _cursor_store.next_page(cursor, page_size)
 
 
-def _search_tool_description() -> str:
-    """Returns the description for the `search` tool."""
-    file_content = (
-        "WARNING: The table of selectable fields is missing. "
-        "Tool may not function correctly."
+async def search_customers(
+    fields: List[str],
+    resource: str,
+    customer_ids: List[str] = None,
+    conditions: List[str] = None,
+    orderings: List[str] = None,
+    limit: int | str = None,
+    max_concurrency: int = None,
+) -> Dict[str, Any]:
+    """Runs the same search against several customers and merges the rows
+
+    Args:
+        fields: The fields to fetch
+        resource: The resource to return fields from
+        customer_ids: Optional. The ids of the customers, all customers directly accessible by the user when omitted
+        conditions: List of conditions to filter the data, combined using AND clauses
+        orderings: How the data is ordered within each customer
+        limit: The maximum number of rows to return per customer
+        max_concurrency: Optional. The maximum number of customers queried at once
+
+    Returns {"rows": [...], "errors": [...]}: every row has a customer_id
+    field, and a customer whose search failed is reported in errors as
+    {"customer_id": ..., "error": ...} without failing the others.
+    """
+    gaql_index.get_index().validate_query(
+        fields, resource, conditions, orderings
+    )
+    if not customer_ids:
+        customer_ids = await executor.run_in_worker(
+            core.list_accessible_customers
+        )
+    # Keeps the first occurrence of each id, in the order given.
+    customer_ids = list(dict.fromkeys(str(cid) for cid in customer_ids))
+
+    concurrency = get_fanout_concurrency()
+    if max_concurrency:
+        concurrency = max(1, min(concurrency, max_concurrency))
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def search_customer(customer_id: str) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await executor.run_in_worker(
+                search,
+                customer_id,
+                fields,
+                resource,
+                conditions,
+                orderings,
+                limit,
+            )
+
+    results = await asyncio.gather(
+        *(search_customer(cid) for cid in customer_ids),
+        return_exceptions=True,
     )
 
+    rows = []
+    errors = []
+    for customer_id, result in zip(customer_ids, results):
+        if isinstance(result, BaseException):
+            if not isinstance(result, Exception):
+                raise result
+            utils.logger.warning(
+                "ads_mcp.search_customers failed for customer %s",
+                customer_id,
+                exc_info=result,
+            )
+            errors.append(
+                {"customer_id": customer_id, "error": _describe_error(result)}
+            )
+            continue
+        rows.extend({"customer_id": customer_id, **row} for row in result)
+    return {"rows": rows, "errors": errors}
+
+
+def get_fanout_concurrency() -> int:
+    """Returns how many customers search_customers queries at once."""
+    value = os.environ.get(_FANOUT_CONCURRENCY_ENV)
+    if not value:
+        return _DEFAULT_FANOUT_CONCURRENCY
     try:
-        with open(utils.get_gaql_resources_filepath(), "r") as file:
-            file_content = file.read()
-    except FileNotFoundError:
-        utils.logger.error("The specified file was not found.")
+        concurrency = int(value)
+    except ValueError:
+        raise ValueError(
+            f"{_FANOUT_CONCURRENCY_ENV} must be an integer, got {value!r}."
+        )
+    if concurrency < 1:
+        raise ValueError(f"{_FANOUT_CONCURRENCY_ENV} must be at least 1.")
+    return concurrency
+
+
+def _describe_error(error: Exception) -> str:
+    """Returns a one-line description of a failed search."""
+    # GoogleAdsException carries the API error messages in its failure.
+    failure = getattr(error, "failure", None)
+    messages = [e.message for e in getattr(failure, "errors", ()) or ()]
+    if messages:
+        return "; ".join(messages)
+    return str(error) or type(error).__name__
 
+
+def _iter_rows(
+    query_result: Any,
+    fields: List[str],
+    started: float | None = None,
+    columnar: bool = False,
+) -> Iterator[Dict[str, Any] | List[Any]]:
+    """Yields formatted rows from a `search_stream` response.
+
+    The stream is cancelled if the iteration is abandoned before the last
+    batch, for example when a cursor expires. The numbers of rows and batches
+    and the formatting time are recorded once the iteration ends, and the
+    time to the first batch since `started` (a time.perf_counter value) when
+    given. Rows are lists of values in the order of `fields` when `columnar`
+    is set.
+    """
+    compile_extractor = (
+        utils.compile_row_values_extractor
+        if columnar
+        else utils.compile_row_extractor
+    )
+    exhausted = False
+    extract = None
+    row_count = 0
+    batch_count = 0
+    format_seconds = 0.0
+    clock = time.perf_counter
+    try:
+        for batch in query_result:
+            if not batch_count and started is not None:
+                SEARCH_FIRST_BATCH.observe(clock() - started)
+            batch_count += 1
+            for row in batch.results:
+                formatting = clock()
+                if extract is None:
+                    extract = compile_extractor(type(row), tuple(fields))
+                formatted = extract(row)
+                format_seconds += clock() - formatting
+                row_count += 1
+                yield formatted
+        exhausted = True
+    finally:
+        if not exhausted and hasattr(query_result, "cancel"):
+            query_result.cancel()
+        SEARCH_ROWS.inc(amount=row_count)
+        SEARCH_BATCHES.inc(amount=batch_count)
+        SEARCH_FORMAT.observe(format_seconds)
+
+
+def _search_tool_description() -> str:
+    """Returns the description for the `search` tool."""
     return f"""
 {search.__doc__}
 
@@ -99,19 +518,57 @@ def _search_tool_description() -> str:
 ### Hints for limits
     Requests to resource change_event must specify a LIMIT of less than or equal to 10000
 
+### Hints for large results
+    For reports that may return thousands of rows set page_size (for example 1000)
+    and call search_next_page with the returned next_cursor until it is null
+
+### Hints for exports
+    For reports of tens of thousands of rows or more that are processed outside the conversation, set export to "ndjson", "csv" or "parquet"
+    and read the returned path or uri instead of paging through the rows
+
 ### Hints for conversions questions
     https://developers.google.com/google-ads/api/docs/conversions/upload-summaries
 
 ### Hints for all fields
-    What follows is a table of resources and their selectable fields (fields), filterable fields (used in the condition) and sortable fields (use in the ordering)
+    Use list_gaql_resources to list the resources that can be searched
+    Use describe_gaql_resource to get the selectable fields (fields), filterable fields (used in the condition) and sortable fields (use in the ordering) of a resource
+    Use find_gaql_fields to look up fields by part of their name
+    Metrics and segments are described by the resources metrics and segments
     Fields are comma separated, the whole field must be used, wildcards and partial fields are not allowed
-    All fields must come from this table and be prefixed with the resource being searched
-    {file_content}
+    All fields must be prefixed with the resource being searched, or with metrics or segments
 """
 
 
 mcp.add_tool(
-    search,
+    executor.offload(search),
     title="Fetches data from the Google Ads API using the search method",
     description=_search_tool_description(),
 )
+
+mcp.add_tool(
+    executor.offload(search_next_page),
+    title="Fetches the next page of a paginated search",
+)
+
+
+mcp.add_tool(
+    search_customers,
+    title="Runs the same search against several Google Ads customers",
+    description=f"""
+{search_customers.__doc__}
+
+### Hints
+    Takes the same fields, resource, conditions, orderings and limit as the search tool, see its hints
+    Use this tool instead of calling search once per customer
+""",
+)
+
+
+@mcp.resource(
+    "ads-mcp://stats/query-cache",
+    name="query_cache_stats",
+    description="Hit/miss counters and size of the search result cache",
+    mime_type="application/json",
+)
+def query_cache_stats() -> Dict[str, int]:
+    return _query_cache.stats()
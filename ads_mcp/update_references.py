@@ -14,7 +14,7 @@
 
 """Tools for generating file containing a list of resources and their fields."""
 
-import utils
+import ads_mcp.utils as utils
 import json
 import collections
 
@@ -29,7 +29,12 @@ def update_gaql_resource_file():
     # Query to select the name and key attributes for ALL fields.
     # We no longer filter by category = 'RESOURCE' here, as we need attributes
     # for all fields associated with resources.
-    query = "SELECT name, selectable, filterable, sortable"
+    # selectable_with is only used on RESOURCE fields, where it lists the
+    # attributed resources, segments and metrics that can be selected with it.
+    query = (
+        "SELECT name, category, selectable, filterable, sortable, "
+        "selectable_with"
+    )
     request.query = query
 
     try:
@@ -43,12 +48,21 @@ def update_gaql_resource_file():
 
     # Dictionary to store the grouped results
     # Example: {'campaign': {'selectable': [], 'filterable': [], 'sortable': []}, ...}
+    # RESOURCE fields add a 'selectable_with' list to their resource.
     resource_data = collections.defaultdict(
         lambda: {"selectable": [], "filterable": [], "sortable": []}
     )
 
+    resource_category = utils.get_googleads_type(
+        "GoogleAdsFieldCategoryEnum"
+    ).GoogleAdsFieldCategory.RESOURCE
+
     for googleads_field in response:
         field_name = googleads_field.name
+        if googleads_field.category == resource_category:
+            resource_data[field_name]["selectable_with"] = list(
+                googleads_field.selectable_with
+            )
         # Extract the base resource name (e.g., 'campaign' from 'campaign.id')
         if "." in field_name:
             resource_name = field_name.split(".")[0]
@@ -65,14 +79,15 @@ def update_gaql_resource_file():
     # Prepare the final output structure
     output_list = []
     for resource, attributes in resource_data.items():
-        output_list.append(
-            {
-                "resource": resource,
-                "selectable": sorted(attributes["selectable"]),
-                "filterable": sorted(attributes["filterable"]),
-                "sortable": sorted(attributes["sortable"]),
-            }
-        )
+        entry = {
+            "resource": resource,
+            "selectable": sorted(attributes["selectable"]),
+            "filterable": sorted(attributes["filterable"]),
+            "sortable": sorted(attributes["sortable"]),
+        }
+        if "selectable_with" in attributes:
+            entry["selectable_with"] = sorted(attributes["selectable_with"])
+        output_list.append(entry)
 
     # Sort the list of resources for consistent output
     output_list.sort(key=lambda x: x["resource"])
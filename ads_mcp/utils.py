@@ -15,20 +15,24 @@
 """Common utilities used by the MCP server."""
 from __future__ import annotations
 
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
+import functools
 import logging
+import operator
 import os
 import importlib.resources
+import threading
 from collections.abc import Mapping
 
 import proto
-from google.ads.googleads.client import GoogleAdsClient
-from google.ads.googleads.v21.services.services.google_ads_service import (
-    GoogleAdsServiceClient,
-)
-from google.oauth2.credentials import Credentials
 
-from ads_mcp.mcp_header_interceptor import MCPHeaderInterceptor
+from ads_mcp import service_pool
+
+# The Google Ads client library and its generated service modules take about a
+# second to import, so they are only imported once the first client is built.
+if TYPE_CHECKING:
+    from google.ads.googleads.client import GoogleAdsClient
+    from google.oauth2.credentials import Credentials
 
 try:
     from google.protobuf.message import Message as ProtobufMessage
@@ -46,9 +50,15 @@ logging.basicConfig(level=logging.INFO)
 # Read-only scope for Google Ads API.
 _READ_ONLY_ADS_SCOPE = "https://www.googleapis.com/auth/adwords"
 
+# Address of a local fake Google Ads API, see ads_mcp.fake_server.
+_FAKE_SERVER_ENV = "GOOGLE_ADS_MCP_FAKE_SERVER"
+_FAKE_DEVELOPER_TOKEN = "fake-developer-token"
+
 
 def _create_credentials() -> Credentials:
     """Returns OAuth credentials from environment variables."""
+    from google.oauth2.credentials import Credentials
+
     client_id = os.environ.get("GOOGLE_ADS_CLIENT_ID")
     client_secret = os.environ.get("GOOGLE_ADS_CLIENT_SECRET")
     refresh_token = os.environ.get("GOOGLE_ADS_REFRESH_TOKEN")
@@ -83,6 +93,23 @@ def _get_login_customer_id() -> str | None:
 
 
 def _get_googleads_client() -> GoogleAdsClient:
+    from google.ads.googleads.client import GoogleAdsClient
+
+    fake_server = get_fake_server_address()
+    if fake_server:
+        from google.auth.credentials import AnonymousCredentials
+
+        # Plaintext channels carry no call credentials, so nothing is sent to
+        # Google; the developer token is only checked to be present.
+        return GoogleAdsClient(
+            credentials=AnonymousCredentials(),
+            developer_token=os.environ.get(
+                "GOOGLE_ADS_DEVELOPER_TOKEN", _FAKE_DEVELOPER_TOKEN
+            ),
+            login_customer_id=_get_login_customer_id(),
+            endpoint=fake_server,
+        )
+
     return GoogleAdsClient(
         credentials=_create_credentials(),
         developer_token=_get_developer_token(),
@@ -90,15 +117,78 @@ def _get_googleads_client() -> GoogleAdsClient:
     )
 
 
-_googleads_client = _get_googleads_client()
+_googleads_client: GoogleAdsClient | None = None
+_googleads_lock = threading.Lock()
+# Set by use_fake_server, takes precedence over GOOGLE_ADS_MCP_FAKE_SERVER.
+_fake_server_address: str | None = None
+
+
+def _get_extra_interceptors() -> list:
+    from ads_mcp.mcp_header_interceptor import MCPHeaderInterceptor
+    from ads_mcp.metrics_interceptor import MetricsInterceptor
+
+    # The metrics interceptor is outermost so it times the whole call.
+    return [MetricsInterceptor(), MCPHeaderInterceptor()]
+
+
+_service_pool = service_pool.ServicePool(_get_extra_interceptors)
+_fake_service_pool = service_pool.ServicePool(
+    _get_extra_interceptors, insecure=True
+)
+
+
+def get_fake_server_address() -> str | None:
+    """Returns the address of the fake Google Ads API in use, if any."""
+    return _fake_server_address or os.environ.get(_FAKE_SERVER_ENV) or None
+
 
+def use_fake_server(address: str | None) -> None:
+    """Points all Google Ads API calls at a fake server, or back at Google.
 
-def get_googleads_service(serviceName: str) -> GoogleAdsServiceClient:
-    return _googleads_client.get_service(serviceName, interceptors=[MCPHeaderInterceptor()])
+    The shared client is rebuilt and the pooled channels are closed, so the
+    switch applies to the next call.
+
+    Args:
+        address: the host:port of an `ads_mcp.fake_server`, or None to use
+            GOOGLE_ADS_MCP_FAKE_SERVER if set and the Google Ads API
+            otherwise.
+    """
+    global _googleads_client, _fake_server_address
+    with _googleads_lock:
+        _fake_server_address = address
+        _googleads_client = None
+    _service_pool.close()
+    _fake_service_pool.close()
+
+
+def get_googleads_client() -> GoogleAdsClient:
+    """Returns the shared GoogleAdsClient, building it on first use.
+
+    Raises:
+        ValueError: if the credentials or the developer token are not set.
+    """
+    global _googleads_client
+    if _googleads_client is None:
+        with _googleads_lock:
+            if _googleads_client is None:
+                _googleads_client = _get_googleads_client()
+    return _googleads_client
+
+
+def get_googleads_service(serviceName: str):
+    """Returns the client of a Google Ads API service, e.g. GoogleAdsService.
+
+    Service clients are pooled per service and credentials on a shared
+    keep-alive channel, and are safe to use from any thread.
+    """
+    client = get_googleads_client()
+    if get_fake_server_address():
+        return _fake_service_pool.get(client, serviceName)
+    return _service_pool.get(client, serviceName)
 
 
 def get_googleads_type(typeName: str):
-    return _googleads_client.get_type(typeName)
+    return get_googleads_client().get_type(typeName)
 
 
 def _is_repeated_container(value: Any) -> bool:
@@ -187,7 +277,27 @@ def format_output_value(value: Any) -> Any:
       - repeated containers -> list (recursively converted)
       - proto.Enum -> its name
       - proto.Message / protobuf Message -> dict recursively
+
+    Scalars, enums and messages are dispatched on their type to a converter
+    built once from the protobuf descriptor; everything else goes through
+    the generic conversion.
     """
+    value_type = type(value)
+    converter = _VALUE_CONVERTERS.get(value_type, _UNKNOWN)
+    if converter is _UNKNOWN:
+        converter = _VALUE_CONVERTERS.setdefault(
+            value_type, _get_value_converter(value_type)
+        )
+    if converter is not None:
+        try:
+            return converter(value)
+        except Exception:
+            pass
+    return _format_output_value_generic(value)
+
+
+def _format_output_value_generic(value: Any) -> Any:
+    """Converts a value by inspecting it, see `format_output_value`."""
     try:
         if value is None:
             return None
@@ -252,19 +362,348 @@ def format_output_value(value: Any) -> Any:
         return str(value)
 
 
-def format_output_row(row: Any, attributes: list[str]) -> dict[str, Any]:
-    out: dict[str, Any] = {}
-    for attr in attributes:
-        try:
-            raw_val = get_nested_attr_safe(row, attr)
-            out[attr] = format_output_value(raw_val)
-        except Exception:
+# Descriptor-driven conversion.
+#
+# Converters work on raw protobuf values (`message._pb` for proto-plus
+# messages) and reproduce what `_format_output_value_generic` returns for the
+# same value, without allocating proto-plus wrappers or walking the isinstance
+# chain. There are two flavours, because the generic conversion treats a value
+# differently depending on how it was obtained:
+#
+#   - proto-plus values (a field read through a proto-plus message): enums
+#     become their name, messages a dict of their set fields.
+#   - raw protobuf values (a field of a raw row, or a child of a message
+#     listed by `ListFields`): enums stay ints, messages go through
+#     `MessageToDict`.
+#
+# AdTextAsset messages become their text in both cases. Well-known types and
+# maps are left to the generic conversion, since proto-plus marshals them.
+
+_UNKNOWN = object()
+_SCALAR_TYPES = (type(None), bool, int, float, str, bytes)
+_WELL_KNOWN_TYPES_PREFIX = "google.protobuf."
+_AD_TEXT_ASSET = "AdTextAsset"
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_VALUE_CONVERTERS: dict[type, Callable[[Any], Any] | None] = {
+    t: _identity for t in _SCALAR_TYPES
+}
+_MESSAGE_CONVERTERS: dict[str, Callable[[Any], Any]] = {}
+
+
+def _is_well_known_type(descriptor: Any) -> bool:
+    return descriptor.full_name.startswith(_WELL_KNOWN_TYPES_PREFIX)
+
+
+def _is_map_field(field: Any) -> bool:
+    message_type = field.message_type
+    return message_type is not None and message_type.GetOptions().map_entry
+
+
+def _is_repeated_field(field: Any) -> bool:
+    # `label` is deprecated in recent protobuf releases.
+    is_repeated = getattr(field, "is_repeated", None)
+    if is_repeated is not None:
+        return is_repeated
+    return field.label == field.LABEL_REPEATED
+
+
+def _message_to_dict(pb: Any) -> Any:
+    return MessageToDict(pb, preserving_proto_field_name=True)
+
+
+def _get_raw_item_converter(field: Any) -> Callable[[Any], Any]:
+    """Returns the converter for one raw protobuf value of `field`."""
+    message_type = field.message_type
+    if message_type is None:
+        # Scalars pass through and raw enums are already ints.
+        return _identity
+    if message_type.name == _AD_TEXT_ASSET:
+        return operator.attrgetter("text")
+    return _message_to_dict
+
+
+def _get_raw_field_converter(field: Any) -> Callable[[Any], Any]:
+    """Returns the converter for a raw protobuf value of `field`."""
+    if _is_map_field(field):
+        return format_output_value
+    convert_item = _get_raw_item_converter(field)
+    if not _is_repeated_field(field):
+        return convert_item
+    if convert_item is _identity:
+        return list
+    return lambda values: [convert_item(v) for v in values]
+
+
+def _get_plus_item_converter(field: Any) -> Callable[[Any], Any] | None:
+    """Returns the converter for one proto-plus value of `field`.
+
+    Returns None for values that proto-plus marshals into something other
+    than a message wrapper, such as well-known types.
+    """
+    if field.enum_type is not None:
+        names = {v.number: v.name for v in field.enum_type.values}
+        # proto-plus returns unknown enum values as plain ints.
+        return lambda number: names.get(number, number)
+    if field.message_type is None:
+        return _identity
+    if _is_well_known_type(field.message_type):
+        return None
+    return _get_message_converter(field.message_type)
+
+
+def _get_plus_field_converter(field: Any) -> Callable[[Any], Any] | None:
+    """Returns the converter for a proto-plus value of `field`, or None."""
+    if _is_map_field(field):
+        return None
+    convert_item = _get_plus_item_converter(field)
+    if convert_item is None or not _is_repeated_field(field):
+        return convert_item
+    if convert_item is _identity:
+        return list
+    return lambda values: [convert_item(v) for v in values]
+
+
+def _get_message_converter(descriptor: Any) -> Callable[[Any], Any]:
+    """Returns the converter for a raw message read as a proto-plus message."""
+    converter = _MESSAGE_CONVERTERS.get(descriptor.full_name)
+    if converter is not None:
+        return converter
+
+    if descriptor.name == _AD_TEXT_ASSET:
+        converter = operator.attrgetter("text")
+    else:
+        field_converters = {
+            field.number: _get_raw_field_converter(field)
+            for field in descriptor.fields
+        }
+
+        def converter(pb: Any) -> dict[str, Any]:
+            return {
+                field.name: field_converters[field.number](value)
+                for field, value in pb.ListFields()
+            }
+
+    return _MESSAGE_CONVERTERS.setdefault(descriptor.full_name, converter)
+
+
+def _get_value_converter(value_type: type) -> Callable[[Any], Any] | None:
+    """Returns the converter for values of `value_type`, or None."""
+    if issubclass(value_type, proto.Enum):
+        return operator.attrgetter("name")
+    if issubclass(value_type, proto.Message):
+        descriptor = value_type.meta.pb.DESCRIPTOR
+        if _is_well_known_type(descriptor):
+            return None
+        convert = _get_message_converter(descriptor)
+        return lambda value: convert(value._pb)
+    if ProtobufMessage is not None and issubclass(value_type, ProtobufMessage):
+        if value_type.DESCRIPTOR.name == _AD_TEXT_ASSET:
+            return operator.attrgetter("text")
+        return _message_to_dict
+    return None
+
+
+def _get_message_descriptor(message_type: type) -> Any:
+    """Returns the protobuf descriptor of a proto-plus or protobuf class."""
+    if isinstance(message_type, type) and issubclass(
+        message_type, proto.Message
+    ):
+        return message_type.meta.pb.DESCRIPTOR
+    return getattr(message_type, "DESCRIPTOR", None)
+
+
+def _resolve_field_path(
+    descriptor: Any, path: str
+) -> tuple[str, list[Any]] | None:
+    """
+    Resolves a GAQL field path against a message descriptor.
+
+    Reserved-word suffixing is applied once per segment, so
+    'ad_group_ad.ad.type' resolves to 'ad_group_ad.ad.type_'. Returns the
+    attribute path and the descriptors of the fields along it, or None if the
+    path can't be resolved from the descriptors alone.
+    """
+    resolved = []
+    fields = []
+    for part in path.split("."):
+        if descriptor is None:
+            return None
+        fields_by_name = descriptor.fields_by_name
+        if part in fields_by_name:
+            name = part
+        elif f"{part}_" in fields_by_name:
+            name = f"{part}_"
+        elif part.endswith("_") and part[:-1] in fields_by_name:
+            name = part[:-1]
+        else:
+            return None
+        resolved.append(name)
+        fields.append(fields_by_name[name])
+        descriptor = fields[-1].message_type
+    return ".".join(resolved), fields
+
+
+def _compile_field(
+    row_type: type, path: str
+) -> tuple[Callable[[Any], Any], Callable[[Any], Any], bool]:
+    """
+    Compiles the accessor and converter for `path` on `row_type` rows.
+
+    Returns (getter, converter, reads_pb). When `reads_pb` is set the getter
+    must be applied to the raw protobuf message behind a proto-plus row.
+    """
+    resolution = _resolve_field_path(_get_message_descriptor(row_type), path)
+    if resolution is None:
+        return (
+            functools.partial(get_nested_attr_safe, path=path),
+            format_output_value,
+            False,
+        )
+
+    resolved, fields = resolution
+    getter = operator.attrgetter(resolved)
+    is_proto_plus = issubclass(row_type, proto.Message)
+    if not is_proto_plus:
+        return getter, _get_raw_field_converter(fields[-1]), False
+
+    # proto-plus marshals well-known types along the path, so those fields
+    # have to be read through the wrappers.
+    if any(
+        field.message_type is not None
+        and _is_well_known_type(field.message_type)
+        for field in fields
+    ):
+        return getter, format_output_value, False
+    converter = _get_plus_field_converter(fields[-1])
+    if converter is None:
+        return getter, format_output_value, False
+    return getter, converter, True
+
+
+@functools.lru_cache(maxsize=256)
+def compile_row_extractor(
+    row_type: type, fields: tuple[str, ...]
+) -> Callable[[Any], dict[str, Any]]:
+    """
+    Returns a function converting rows of `row_type` into output dicts.
+
+    Every field path is resolved against the row's message type once, and the
+    result is cached per (row type, fields), so formatting a row only runs the
+    precompiled accessors. Fields of proto-plus rows are read from the raw
+    protobuf message and converted by their descriptor, which gives the same
+    output as `format_output_value` on the proto-plus value. Paths that can't
+    be resolved from the descriptors fall back to `get_nested_attr_safe`.
+    """
+    compiled = [(field, *_compile_field(row_type, field)) for field in fields]
+
+    def extract(row: Any) -> dict[str, Any]:
+        pb = getattr(row, "_pb", row)
+        out: dict[str, Any] = {}
+        for field, getter, convert, reads_pb in compiled:
             try:
-                logger.exception("Failed to extract field '%s'", attr)
+                out[field] = convert(getter(pb if reads_pb else row))
             except Exception:
-                pass
-            out[attr] = None
-    return out
+                try:
+                    logger.exception("Failed to extract field '%s'", field)
+                except Exception:
+                    pass
+                out[field] = None
+        return out
+
+    return extract
+
+
+@functools.lru_cache(maxsize=256)
+def compile_row_values_extractor(
+    row_type: type, fields: tuple[str, ...]
+) -> Callable[[Any], list[Any]]:
+    """
+    Returns a function converting rows of `row_type` into lists of values.
+
+    The values are in the order of `fields` and converted as by
+    `compile_row_extractor`, but no dict is built per row, which is what the
+    columnar output of `search` needs.
+    """
+    compiled = [(field, *_compile_field(row_type, field)) for field in fields]
+
+    def extract(row: Any) -> list[Any]:
+        pb = getattr(row, "_pb", row)
+        values = []
+        for field, getter, convert, reads_pb in compiled:
+            try:
+                values.append(convert(getter(pb if reads_pb else row)))
+            except Exception:
+                try:
+                    logger.exception("Failed to extract field '%s'", field)
+                except Exception:
+                    pass
+                values.append(None)
+        return values
+
+    return extract
+
+
+@functools.lru_cache(maxsize=256)
+def get_row_value_types(
+    row_type: type, fields: tuple[str, ...]
+) -> tuple[tuple[str, bool] | None, ...]:
+    """
+    Returns the type of the values extracted from `row_type` rows per field.
+
+    Types are (name, repeated), the name being one of "integer", "number",
+    "boolean", "string", "bytes" or "object" (a dict), as read from the field
+    descriptors, so they hold for every row whatever values the first rows
+    have. Fields whose values depend on the generic conversion, such as
+    well-known types and maps, or that can't be resolved, are None.
+    """
+    descriptor = _get_message_descriptor(row_type)
+    is_proto_plus = isinstance(row_type, type) and issubclass(
+        row_type, proto.Message
+    )
+    types = []
+    for path in fields:
+        resolution = _resolve_field_path(descriptor, path)
+        if resolution is None or any(
+            field.message_type is not None
+            and (
+                _is_well_known_type(field.message_type) or _is_map_field(field)
+            )
+            for field in resolution[1]
+        ):
+            types.append(None)
+            continue
+        field = resolution[1][-1]
+        types.append(
+            (_get_value_type(field, is_proto_plus), _is_repeated_field(field))
+        )
+    return tuple(types)
+
+
+def _get_value_type(field: Any, is_proto_plus: bool) -> str:
+    """Returns the type name of the converted values of `field`."""
+    if field.message_type is not None:
+        if field.message_type.name == _AD_TEXT_ASSET:
+            return "string"
+        return "object"
+    if field.enum_type is not None:
+        # Enums of proto-plus rows become their name, raw ones stay ints.
+        return "string" if is_proto_plus else "integer"
+    if field.cpp_type in (field.CPPTYPE_DOUBLE, field.CPPTYPE_FLOAT):
+        return "number"
+    if field.cpp_type == field.CPPTYPE_BOOL:
+        return "boolean"
+    if field.cpp_type == field.CPPTYPE_STRING:
+        return "bytes" if field.type == field.TYPE_BYTES else "string"
+    return "integer"
+
+
+def format_output_row(row: Any, attributes: list[str]) -> dict[str, Any]:
+    return compile_row_extractor(type(row), tuple(attributes))(row)
 
 
 def get_gaql_resources_filepath():
@@ -0,0 +1,115 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""End-to-end latency and throughput of the search tool.
+
+Runs `search` through the real client path (service pool, interceptors and
+`search_stream` batching) against `ads_mcp.fake_server` started in-process,
+from several threads at once, and reports latency percentiles and rows/s.
+The result cache is cleared before every call, so each call reaches the
+server.
+
+Usage:
+    python -m benchmarks.fake_server_bench [--rows N] [--batch-size N]
+        [--batch-latency SECONDS] [--calls N] [--concurrency N] [--json]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from concurrent import futures
+
+from ads_mcp import fake_server
+from ads_mcp import utils
+from ads_mcp.tools import search as search_tool
+from benchmarks.format_output_bench import FIELDS
+
+RESOURCE = "keyword_view"
+
+
+def run(args: argparse.Namespace) -> dict:
+    config = fake_server.FakeServerConfig(
+        rows=args.rows,
+        batch_size=args.batch_size,
+        batch_latency=args.batch_latency,
+    )
+    with fake_server.FakeGoogleAdsServer(config) as server:
+        utils.use_fake_server(server.address)
+        try:
+
+            def call(i: int) -> float:
+                # Distinct customers keep the cache and cursors out of play.
+                started = time.perf_counter()
+                search_tool.search(str(1_000_000_000 + i), FIELDS, RESOURCE)
+                return time.perf_counter() - started
+
+            call(-1)  # Opens the channel and warms the row extractor.
+            started = time.perf_counter()
+            with futures.ThreadPoolExecutor(args.concurrency) as pool:
+                latencies = sorted(pool.map(call, range(args.calls)))
+            elapsed = time.perf_counter() - started
+        finally:
+            search_tool._query_cache.clear()
+            utils.use_fake_server(None)
+
+    def percentile(fraction: float) -> float:
+        return latencies[
+            min(len(latencies) - 1, int(fraction * len(latencies)))
+        ]
+
+    return {
+        "calls": args.calls,
+        "concurrency": args.concurrency,
+        "rows_per_call": args.rows,
+        "latency_ms": {
+            "p50": statistics.median(latencies) * 1e3,
+            "p95": percentile(0.95) * 1e3,
+            "max": latencies[-1] * 1e3,
+        },
+        "calls_per_second": args.calls / elapsed,
+        "rows_per_second": args.calls * args.rows / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--batch-latency", type=float, default=0.0)
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--json", action="store_true", help="print the results as JSON"
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    latency = results["latency_ms"]
+    print(
+        f"{args.calls} calls x {args.rows} rows, concurrency "
+        f"{args.concurrency}: p50 {latency['p50']:.1f} ms | "
+        f"p95 {latency['p95']:.1f} ms | "
+        f"{results['rows_per_second']:,.0f} rows/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
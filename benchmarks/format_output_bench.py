@@ -0,0 +1,152 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of the row formatting used by the search tool.
+
+Compares the generic path (`get_nested_attr_safe` followed by the isinstance
+chain of `format_output_value`, evaluated per field and per row) with the
+extractor compiled by `utils.compile_row_extractor`, on synthetic rows shaped
+like a typical keyword report.
+
+Usage:
+    python -m benchmarks.format_output_bench [--rows N] [--repeat N]
+"""
+
+import argparse
+import time
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
+
+from ads_mcp import utils
+
+FIELDS = [
+    "campaign.id",
+    "campaign.name",
+    "campaign.status",
+    "campaign.advertising_channel_type",
+    "ad_group.id",
+    "ad_group.name",
+    "ad_group.status",
+    "ad_group.type",
+    "ad_group_criterion.keyword.text",
+    "ad_group_criterion.keyword.match_type",
+    "ad_group_criterion.status",
+    "segments.date",
+    "segments.device",
+    "metrics.impressions",
+    "metrics.clicks",
+    "metrics.cost_micros",
+    "metrics.conversions",
+    "metrics.conversions_value",
+    "metrics.ctr",
+    "metrics.average_cpc",
+]
+
+
+def make_rows(count: int) -> list[GoogleAdsRow]:
+    """Returns `count` proto-plus rows with every field of FIELDS set."""
+    return [
+        GoogleAdsRow(
+            {
+                "campaign": {
+                    "id": 1000 + i % 7,
+                    "name": f"Campaign {i % 7}",
+                    "status": 2,
+                    "advertising_channel_type": 2,
+                },
+                "ad_group": {
+                    "id": 2000 + i % 50,
+                    "name": f"Ad group {i % 50}",
+                    "status": 2,
+                    "type_": 2,
+                },
+                "ad_group_criterion": {
+                    "keyword": {
+                        "text": f"keyword {i}",
+                        "match_type": 2 + i % 3,
+                    },
+                    "status": 2,
+                },
+                "segments": {"date": "2025-06-01", "device": 2 + i % 3},
+                "metrics": {
+                    "impressions": 100 + i,
+                    "clicks": i % 10,
+                    "cost_micros": 1_000_000 * (i % 10),
+                    "conversions": (i % 4) / 2,
+                    "conversions_value": float(i % 100),
+                    "ctr": 0.1,
+                    "average_cpc": 1_000_000.0,
+                },
+            }
+        )
+        for i in range(count)
+    ]
+
+
+def format_row_generic(row, fields):
+    """The per-field formatting `format_output_row` used before compiling."""
+    return {
+        field: utils._format_output_value_generic(
+            utils.get_nested_attr_safe(row, field)
+        )
+        for field in fields
+    }
+
+
+def format_row_compiled(row, fields):
+    return utils.compile_row_extractor(type(row), tuple(fields))(row)
+
+
+def measure(format_row, rows, repeat: int) -> float:
+    """Returns the best rows/second over `repeat` passes."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for row in rows:
+            format_row(row, FIELDS)
+        best = min(best, time.perf_counter() - started)
+    return len(rows) / best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plus_rows = make_rows(args.rows)
+    variants = {
+        # search_stream yields raw protobuf rows (use_proto_plus=False).
+        "protobuf rows": [GoogleAdsRow.pb(row) for row in plus_rows],
+        "proto-plus rows": plus_rows,
+    }
+
+    print(f"{args.rows} rows x {len(FIELDS)} fields, best of {args.repeat}")
+    for name, rows in variants.items():
+        assert format_row_generic(rows[0], FIELDS) == format_row_compiled(
+            rows[0], FIELDS
+        )
+        generic = measure(format_row_generic, rows, args.repeat)
+        compiled = measure(format_row_compiled, rows, args.repeat)
+        print(
+            f"{name:>16}: generic {generic:10,.0f} rows/s | "
+            f"compiled {compiled:10,.0f} rows/s | "
+            f"speedup {compiled / generic:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
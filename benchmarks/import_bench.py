@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of the startup cost of the MCP server.
+
+Imports the module in fresh interpreters with `python -X importtime`, the
+cost paid by every cold start, and reports the median cumulative import time
+along with the slowest direct imports.
+
+Usage:
+    python -m benchmarks.import_bench [--module M] [--repeat N] [--top N]
+"""
+
+import argparse
+import collections
+import statistics
+import subprocess
+import sys
+
+
+def import_times(module: str) -> tuple[int, dict[str, int]]:
+    """Imports `module` in a fresh interpreter.
+
+    Returns:
+        The cumulative import time of `module` in microseconds, and the
+        cumulative time of each module it imports directly.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    children = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        # Nested imports are indented by two spaces per level and are listed
+        # before the module importing them.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0:
+            if name == module:
+                return int(cumulative), children
+            children = {}
+        elif depth == 1:
+            children[name] = int(cumulative)
+    raise RuntimeError(f"No import time reported for {module}.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="ads_mcp.server")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    totals = []
+    direct_imports = collections.defaultdict(list)
+    for _ in range(args.repeat):
+        total, children = import_times(args.module)
+        totals.append(total)
+        for name, cumulative in children.items():
+            direct_imports[name].append(cumulative)
+
+    print(
+        f"import {args.module}: median {statistics.median(totals) / 1000:.1f}"
+        f" ms over {args.repeat} runs"
+    )
+    slowest = sorted(
+        direct_imports.items(),
+        key=lambda item: statistics.median(item[1]),
+        reverse=True,
+    )
+    for name, cumulative in slowest[: args.top]:
+        print(f"  {statistics.median(cumulative) / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark of the per-call cost of `utils.get_googleads_service`.
+
+Compares building a service client with `GoogleAdsClient.get_service` on
+every call, as `get_googleads_service` used to, with fetching it from the
+service pool. Neither path connects to the API; the pooled path also avoids
+the TLS handshake a fresh channel pays on its first request.
+
+Usage:
+    python -m benchmarks.service_client_bench [--calls N] [--service NAME]
+"""
+
+import argparse
+import time
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.oauth2.credentials import Credentials
+
+from ads_mcp import service_pool
+from ads_mcp.mcp_header_interceptor import MCPHeaderInterceptor
+
+
+def measure(get_service, calls: int) -> float:
+    """Returns the mean microseconds per call."""
+    started = time.perf_counter()
+    for _ in range(calls):
+        get_service()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--service", default="GoogleAdsService")
+    args = parser.parse_args()
+
+    client = GoogleAdsClient(
+        credentials=Credentials(token="token"),
+        developer_token="developer-token",
+    )
+    pool = service_pool.ServicePool(lambda: [MCPHeaderInterceptor()])
+    variants = {
+        "get_service per call": lambda: client.get_service(
+            args.service, interceptors=[MCPHeaderInterceptor()]
+        ),
+        "service pool": lambda: pool.get(client, args.service),
+    }
+
+    # Imports the service module so neither variant pays for it.
+    client.get_service(args.service)
+    print(f"{args.service}, {args.calls} calls")
+    for name, get_service in variants.items():
+        print(f"{name:>21}: {measure(get_service, args.calls):10.1f} us/call")
+    pool.close()
+
+
+if __name__ == "__main__":
+    main()
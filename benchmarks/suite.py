@@ -0,0 +1,319 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Offline benchmark suite of the formatting and sheets sync hot paths.
+
+Runs without network access: searches are answered by a stubbed
+GoogleAdsService streaming synthetic v21 rows, and sheet writes go to a
+stubbed Sheets service. Results can be written as JSON and compared with a
+stored baseline, failing when a benchmark regressed by more than the
+tolerance. Absolute numbers depend on the machine, so the baseline should be
+recorded on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite [--quick] [--output FILE]
+        [--compare BASELINE] [--tolerance FRACTION] [--filter TEXT]
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List
+from unittest import mock
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+    SearchGoogleAdsStreamResponse,
+)
+
+from ads_mcp import utils
+from ads_mcp.rate_limit import TokenBucket
+from ads_mcp.sheets_sync import config as sheets_config
+from ads_mcp.sheets_sync import sheets_writer
+from ads_mcp.tools import search as search_tool
+from benchmarks.format_output_bench import FIELDS, make_rows
+
+RESOURCE = "keyword_view"
+SHEET_SIZES = (10, 100, 1000)
+# The sheet benchmarks take milliseconds, so they are always repeated enough
+# to get a stable minimum.
+SHEET_MIN_REPEAT = 5
+STREAM_BATCH_SIZE = 10_000
+
+
+def _result(
+    name: str, value: float, unit: str, higher_is_better: bool
+) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "value": value,
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+    }
+
+
+def best_time(run: Callable[[], Any], repeat: int) -> float:
+    """Returns the shortest wall time of `repeat` calls of `run`, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def make_stream(rows: List[Any]) -> List[Any]:
+    """Returns raw protobuf stream batches, as yielded by `search_stream`."""
+    return [
+        SearchGoogleAdsStreamResponse.pb(
+            SearchGoogleAdsStreamResponse(
+                results=rows[start : start + STREAM_BATCH_SIZE]
+            )
+        )
+        for start in range(0, len(rows), STREAM_BATCH_SIZE)
+    ]
+
+
+def bench_format_output_row(rows: int, repeat: int) -> Iterator[Dict]:
+    pb_rows = [GoogleAdsRow.pb(row) for row in make_rows(rows)]
+
+    def run():
+        for row in pb_rows:
+            utils.format_output_row(row, FIELDS)
+
+    yield _result(
+        "format_output_row", rows / best_time(run, repeat), "rows/s", True
+    )
+
+
+def bench_format_output_value(rows: int, repeat: int) -> Iterator[Dict]:
+    values = [
+        utils.get_nested_attr_safe(row, field)
+        for row in (GoogleAdsRow.pb(row) for row in make_rows(rows // 10))
+        for field in FIELDS
+    ]
+
+    def run():
+        for value in values:
+            utils.format_output_value(value)
+
+    yield _result(
+        "format_output_value",
+        len(values) / best_time(run, repeat),
+        "values/s",
+        True,
+    )
+
+
+def bench_search(rows: int, repeat: int) -> Iterator[Dict]:
+    stream = make_stream(make_rows(rows))
+    service = mock.Mock()
+    service.search_stream.side_effect = lambda **kwargs: iter(stream)
+
+    def run():
+        search_tool._query_cache.clear()
+        search_tool.search("1234567890", FIELDS, RESOURCE)
+
+    with mock.patch.object(
+        utils, "get_googleads_service", return_value=service
+    ):
+        seconds = best_time(run, repeat)
+        tracemalloc.start()
+        try:
+            run()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            search_tool._query_cache.clear()
+
+    yield _result("search", rows / seconds, "rows/s", True)
+    # Per row, so that runs with different --rows stay comparable.
+    yield _result("search_peak_memory", peak / rows, "bytes/row", False)
+
+
+def make_sheet(accounts: int) -> List[List[Any]]:
+    """Returns the values of a sheet with a row per managed account."""
+    headers = ["Under Management"] + list(sheets_config.COLUMN_MAPPINGS)
+    values = [headers]
+    for i in range(accounts):
+        row = ["Yes", str(1_000_000_000 + i)]
+        values.append(row + [""] * (len(headers) - len(row)))
+    return values
+
+
+def make_metrics(account_id: str) -> Dict[str, Any]:
+    metrics = {
+        key: float(i) for i, key in enumerate(sheets_config.COLUMN_MAPPINGS)
+    }
+    metrics["customer_id"] = account_id
+    metrics["account_name"] = f"Account {account_id}"
+    return metrics
+
+
+def bench_sheets_writer(rows: int, repeat: int) -> Iterator[Dict]:
+    del rows  # The sheet sizes are fixed.
+    repeat = max(repeat, SHEET_MIN_REPEAT)
+    with (
+        mock.patch.object(sheets_writer, "_get_sheets_service"),
+        mock.patch.object(
+            sheets_writer, "_sheets_rate_limiter", TokenBucket(0)
+        ),
+    ):
+        for accounts in SHEET_SIZES:
+            values = make_sheet(accounts)
+            headers = values[0]
+            index = sheets_writer.SheetIndex(values, headers)
+            metrics = {
+                account_id: make_metrics(account_id)
+                for account_id in index.under_management
+            }
+
+            seconds = best_time(
+                lambda: sheets_writer.SheetIndex(values, headers), repeat
+            )
+            yield _result(
+                f"sheets_index[{accounts}]", seconds * 1e3, "ms", False
+            )
+
+            def write():
+                buffer = sheets_writer.SheetWriteBuffer(flush_cells=0)
+                for account_id in index.under_management:
+                    buffer.add_mapped_row(
+                        index.find_row(account_id),
+                        index.mapped_columns,
+                        metrics[account_id],
+                    )
+                buffer.flush()
+
+            yield _result(
+                f"sheets_write[{accounts}]",
+                best_time(write, repeat) * 1e3,
+                "ms",
+                False,
+            )
+
+
+BENCHMARKS = (
+    bench_format_output_row,
+    bench_format_output_value,
+    bench_search,
+    bench_sheets_writer,
+)
+
+
+def run_benchmarks(rows: int, repeat: int, name_filter: str = "") -> Dict:
+    """Runs the benchmarks whose function name contains `name_filter`."""
+    results = []
+    for benchmark in BENCHMARKS:
+        if name_filter in benchmark.__name__:
+            results.extend(benchmark(rows, repeat))
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rows": rows,
+        "repeat": repeat,
+        "benchmarks": results,
+    }
+
+
+def compare(
+    results: Dict, baseline: Dict, tolerance: float
+) -> List[Dict[str, Any]]:
+    """Returns the benchmarks more than `tolerance` worse than the baseline.
+
+    Each entry has the benchmark name, the current and baseline values and
+    the relative change, positive when the benchmark got worse. Benchmarks
+    missing from either side are ignored.
+    """
+    baseline_values = {
+        benchmark["name"]: benchmark["value"]
+        for benchmark in baseline["benchmarks"]
+    }
+    regressions = []
+    for benchmark in results["benchmarks"]:
+        previous = baseline_values.get(benchmark["name"])
+        if not previous:
+            continue
+        change = (benchmark["value"] - previous) / previous
+        if benchmark["higher_is_better"]:
+            change = -change
+        if change > tolerance:
+            regressions.append(
+                {
+                    "name": benchmark["name"],
+                    "value": benchmark["value"],
+                    "baseline": previous,
+                    "change": change,
+                }
+            )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--quick", action="store_true", help="use 2000 rows and 1 repeat"
+    )
+    parser.add_argument("--output", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline results to compare with")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="relative slowdown tolerated before failing (default 0.3)",
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks matching this text"
+    )
+    args = parser.parse_args()
+    # The search and sheet writes log every call.
+    logging.disable(logging.INFO)
+    if args.quick:
+        args.rows, args.repeat = 2000, 1
+
+    results = run_benchmarks(args.rows, args.repeat, args.filter)
+    for benchmark in results["benchmarks"]:
+        print(
+            f"{benchmark['name']:>24}: "
+            f"{benchmark['value']:14,.2f} {benchmark['unit']}"
+        )
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(
+                f"REGRESSION {regression['name']}: {regression['value']:,.2f}"
+                f" vs baseline {regression['baseline']:,.2f}"
+                f" ({regression['change']:+.0%})"
+            )
+        if regressions:
+            sys.exit(1)
+        print(f"No regression beyond {args.tolerance:.0%} of {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
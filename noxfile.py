@@ -33,6 +33,8 @@ FREEZE_COMMAND = ["python", "-m", "pip", "freeze"]
 TEST_DEPENDENCIES = [
     "pyfakefs>=5.0.0,<6.0",
     "coverage==6.5.0",
+    # Optional dependency of the parquet export.
+    "pyarrow",
 ]
 
 
@@ -83,3 +85,22 @@ def tests(session):
     session.run(
         *TEST_COMMAND,
     )
+
+
+@nox.session(python=PYTHON_VERSIONS[-1])
+def bench(session):
+    """Runs the offline benchmark suite and compares it with the baseline.
+
+    Extra arguments are passed to the suite, e.g. `nox -s bench -- --quick`.
+    Record a new baseline with
+    `python -m benchmarks.suite --output benchmarks/baseline.json`.
+    """
+    session.install(".")
+    session.run(
+        "python",
+        "-m",
+        "benchmarks.suite",
+        "--compare",
+        "benchmarks/baseline.json",
+        *session.posargs,
+    )
@@ -0,0 +1,218 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the api_calls module."""
+
+import unittest
+from unittest import mock
+
+from google.api_core import exceptions
+
+from ads_mcp import api_calls
+from ads_mcp import fake_server
+from ads_mcp import utils
+from ads_mcp.sheets_sync import metrics
+from ads_mcp.tools import search as search_tool
+
+_QUERY = "SELECT campaign.id, campaign.name FROM campaign"
+
+
+class _FakeTime:
+    """A clock advanced by the sleeps it records."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class _UpperBound:
+    """A jitter source always returning the largest backoff."""
+
+    def uniform(self, low, high):
+        return high
+
+
+def _failing(errors, result="ok"):
+    """Returns a call raising `errors` in turn, then returning `result`."""
+    errors = list(errors)
+    calls = []
+
+    def func():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    func.calls = calls
+    return func
+
+
+class TestCallPolicy(unittest.TestCase):
+    """Test cases for the CallPolicy class."""
+
+    def setUp(self):
+        self.time = _FakeTime()
+
+    def _policy(self, **kwargs):
+        kwargs.setdefault("developer_token_qps", 0)
+        kwargs.setdefault("customer_qps", 0)
+        kwargs.setdefault("max_retries", 3)
+        return api_calls.CallPolicy(
+            clock=self.time.clock,
+            sleep=self.time.sleep,
+            rng=_UpperBound(),
+            **kwargs,
+        )
+
+    def test_transient_errors_are_retried_with_backoff(self):
+        """Tests that transient errors are retried with growing delays."""
+        retries = api_calls.RETRIES.get("UNAVAILABLE")
+        func = _failing(
+            [exceptions.ServiceUnavailable("down")] * 2
+            + [exceptions.DeadlineExceeded("slow")]
+        )
+
+        self.assertEqual(self._policy().call(func, "1", "token"), "ok")
+
+        self.assertEqual(len(func.calls), 4)
+        self.assertEqual(self.time.sleeps, [1.0, 2.0, 4.0])
+        self.assertEqual(api_calls.RETRIES.get("UNAVAILABLE"), retries + 2)
+
+    def test_gives_up_after_max_retries(self):
+        """Tests that the last error is raised once retries are exhausted."""
+        gave_up = api_calls.GAVE_UP.get("UNAVAILABLE")
+        func = _failing([exceptions.ServiceUnavailable("down")] * 5)
+
+        with self.assertRaises(exceptions.ServiceUnavailable):
+            self._policy(max_retries=2).call(func, "1", "token")
+
+        self.assertEqual(len(func.calls), 3)
+        self.assertEqual(api_calls.GAVE_UP.get("UNAVAILABLE"), gave_up + 1)
+
+    def test_other_errors_are_not_retried(self):
+        """Tests that errors that aren't transient are raised right away."""
+        func = _failing([exceptions.InvalidArgument("bad query")])
+
+        with self.assertRaises(exceptions.InvalidArgument):
+            self._policy().call(func, "1", "token")
+
+        self.assertEqual(len(func.calls), 1)
+        self.assertFalse(api_calls.is_transient(ValueError("bad")))
+
+    def test_rate_limits_are_per_developer_token_and_customer(self):
+        """Tests that calls are spread out by the token buckets."""
+        throttled = api_calls.THROTTLED.get("customer")
+        policy = self._policy(developer_token_qps=10, customer_qps=1)
+
+        for _ in range(3):
+            policy.call(lambda: None, "1", "token")
+        policy.call(lambda: None, "2", "token")
+
+        # The second and third calls for customer 1 wait a second each.
+        self.assertEqual(self.time.sleeps, [1.0, 1.0])
+        self.assertEqual(api_calls.THROTTLED.get("customer"), throttled + 2)
+
+
+class TestQuotaErrors(unittest.TestCase):
+    """Test cases for quota errors reported by the fake server."""
+
+    def setUp(self):
+        self.config = fake_server.FakeServerConfig(rows=5, retry_delay=7)
+        self.server = fake_server.FakeGoogleAdsServer(self.config)
+        utils.use_fake_server(self.server.start())
+        self.addCleanup(self.server.stop)
+        self.addCleanup(utils.use_fake_server, None)
+        search_tool._query_cache.clear()
+        self.time = _FakeTime()
+        self.policy = api_calls.CallPolicy(
+            developer_token_qps=0,
+            customer_qps=0,
+            max_retries=3,
+            clock=self.time.clock,
+            sleep=self.time.sleep,
+            rng=_UpperBound(),
+        )
+        self.service = utils.get_googleads_service("GoogleAdsService")
+
+    def _search(self, customer_id="1"):
+        return self.policy.call(
+            lambda: list(
+                self.service.search_stream(
+                    customer_id=customer_id, query=_QUERY
+                )
+            ),
+            customer_id,
+            "token",
+        )
+
+    def test_retry_delay_holds_back_other_callers(self):
+        """Tests that the retry delay of a quota error applies to all calls."""
+        self.server.fail_next("RESOURCE_EXHAUSTED")
+
+        self.assertEqual(len(self._search()[0].results), 5)
+        # The first backoff is shorter than the server's retry delay.
+        self.assertEqual(self.time.sleeps, [7.0])
+
+        self.time.now -= 3
+        self._search("2")
+        self.assertEqual(self.time.sleeps, [7.0, 3.0])
+
+    def test_long_retry_delays_are_not_waited_for(self):
+        """Tests that exhausted daily quotas fail without retrying."""
+        self.config.retry_delay = 3600
+        self.server.fail_next("RESOURCE_EXHAUSTED")
+
+        with self.assertRaises(exceptions.ResourceExhausted):
+            self._search()
+
+        self.assertEqual(self.time.sleeps, [])
+
+    def test_search_retries_transient_errors(self):
+        """Tests that the search tool retries through the shared policy."""
+        self.server.fail_next("UNAVAILABLE", count=2)
+
+        with mock.patch.object(api_calls, "_policy", self.policy):
+            rows = search_tool.search(
+                "123", ["campaign.id", "campaign.name"], "campaign"
+            )
+
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(
+            [method for method, _ in self.server.calls], ["SearchStream"] * 3
+        )
+
+    def test_sync_query_fails_after_retries(self):
+        """Tests that sync queries raise instead of returning no rows."""
+        self.server.fail_next("UNAVAILABLE", count=4)
+
+        with mock.patch.object(metrics, "_ads_calls", self.policy):
+            with self.assertRaises(exceptions.ServiceUnavailable):
+                metrics._run_query_rows("1", _QUERY)
+            self.assertIsNone(
+                metrics._run_query_rows(
+                    "1", "SELECT campaign.nope FROM campaign"
+                )
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
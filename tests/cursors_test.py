@@ -0,0 +1,117 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the cursors module."""
+
+import time
+import unittest
+
+from ads_mcp import cursors
+
+
+class _TrackedRows:
+    """Row iterator that records how far it was read and whether it closed."""
+
+    def __init__(self, count):
+        self._it = iter(range(count))
+        self.consumed = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        value = next(self._it)
+        self.consumed += 1
+        return value
+
+    def close(self):
+        self.closed = True
+
+
+class TestCursorStore(unittest.TestCase):
+    """Test cases for the CursorStore class."""
+
+    def test_pages_through_rows_lazily(self):
+        """Tests that pages are read from the iterator on demand."""
+        store = cursors.CursorStore(ttl_seconds=60)
+        rows = _TrackedRows(5)
+
+        first = store.open(rows, page_size=2)
+        self.assertEqual(first["rows"], [0, 1])
+        self.assertIsNotNone(first["next_cursor"])
+        # One row of look-ahead, never the whole stream.
+        self.assertEqual(rows.consumed, 3)
+
+        second = store.next_page(first["next_cursor"])
+        self.assertEqual(second["rows"], [2, 3])
+        self.assertEqual(second["next_cursor"], first["next_cursor"])
+
+        last = store.next_page(first["next_cursor"])
+        self.assertEqual(last["rows"], [4])
+        self.assertIsNone(last["next_cursor"])
+        self.assertTrue(rows.closed)
+        self.assertEqual(len(store), 0)
+
+    def test_single_page_has_no_cursor(self):
+        """Tests that short results don't leave a cursor open."""
+        store = cursors.CursorStore(ttl_seconds=60)
+
+        page = store.open(iter([1, 2]), page_size=10)
+
+        self.assertEqual(page, {"rows": [1, 2], "next_cursor": None})
+        self.assertEqual(len(store), 0)
+
+    def test_page_size_override(self):
+        """Tests that follow-up calls may change the page size."""
+        store = cursors.CursorStore(ttl_seconds=60)
+
+        first = store.open(iter(range(10)), page_size=2)
+        second = store.next_page(first["next_cursor"], page_size=5)
+
+        self.assertEqual(second["rows"], [2, 3, 4, 5, 6])
+
+    def test_expired_cursor(self):
+        """Tests that idle cursors expire and close their iterator."""
+        store = cursors.CursorStore(ttl_seconds=0.05)
+        rows = _TrackedRows(10)
+
+        first = store.open(rows, page_size=2)
+        time.sleep(0.1)
+
+        with self.assertRaises(cursors.CursorNotFoundError):
+            store.next_page(first["next_cursor"])
+        self.assertTrue(rows.closed)
+
+    def test_least_recently_used_cursor_is_evicted(self):
+        """Tests that the number of open cursors is bounded."""
+        store = cursors.CursorStore(ttl_seconds=60, max_cursors=2)
+        rows = [_TrackedRows(10) for _ in range(3)]
+
+        pages = [store.open(r, page_size=2) for r in rows]
+
+        self.assertEqual(len(store), 2)
+        self.assertTrue(rows[0].closed)
+        with self.assertRaises(cursors.CursorNotFoundError):
+            store.next_page(pages[0]["next_cursor"])
+        self.assertEqual(
+            store.next_page(pages[2]["next_cursor"])["rows"], [2, 3]
+        )
+
+    def test_invalid_page_size(self):
+        """Tests that non-positive page sizes are rejected."""
+        store = cursors.CursorStore(ttl_seconds=60)
+
+        with self.assertRaises(ValueError):
+            store.open(iter([1]), page_size=0)
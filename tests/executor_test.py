@@ -0,0 +1,97 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the executor module."""
+
+import asyncio
+import inspect
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ads_mcp import executor
+
+
+def _blocking_tool(customer_id: str, limit: int = 10) -> dict:
+    """Docstring of the blocking tool."""
+    time.sleep(0.2)
+    return {
+        "customer_id": customer_id,
+        "limit": limit,
+        "thread": threading.current_thread().name,
+    }
+
+
+class TestExecutor(unittest.TestCase):
+    """Test cases for the executor module."""
+
+    def tearDown(self):
+        executor.shutdown()
+
+    def test_offload_preserves_tool_metadata(self):
+        """Tests that the wrapper can be registered in place of the tool."""
+        wrapped = executor.offload(_blocking_tool)
+
+        self.assertTrue(inspect.iscoroutinefunction(wrapped))
+        self.assertEqual(wrapped.__name__, "_blocking_tool")
+        self.assertEqual(wrapped.__doc__, _blocking_tool.__doc__)
+        self.assertEqual(
+            inspect.signature(wrapped), inspect.signature(_blocking_tool)
+        )
+
+    def test_offload_runs_off_the_event_loop(self):
+        """Tests that blocking tools don't stall other coroutines."""
+        wrapped = executor.offload(_blocking_tool)
+
+        async def main():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            results = await asyncio.gather(
+                wrapped("1", limit=1), wrapped("2", limit=2)
+            )
+            task.cancel()
+            return results, ticks
+
+        started = time.monotonic()
+        results, ticks = asyncio.run(main())
+        elapsed = time.monotonic() - started
+
+        self.assertEqual([r["limit"] for r in results], [1, 2])
+        for result in results:
+            self.assertTrue(result["thread"].startswith("ads-mcp-worker"))
+        # Both calls ran concurrently and the loop kept ticking meanwhile.
+        self.assertLess(elapsed, 0.35)
+        self.assertGreater(ticks, 5)
+
+    def test_offload_disabled(self):
+        """Tests that a worker count of 0 keeps tools synchronous."""
+        with mock.patch.dict(os.environ, {"GOOGLE_ADS_MCP_MAX_WORKERS": "0"}):
+            self.assertIs(executor.offload(_blocking_tool), _blocking_tool)
+
+    def test_invalid_max_workers(self):
+        """Tests that a malformed worker count is reported."""
+        with mock.patch.dict(
+            os.environ, {"GOOGLE_ADS_MCP_MAX_WORKERS": "lots"}
+        ):
+            with self.assertRaises(ValueError):
+                executor.get_max_workers()
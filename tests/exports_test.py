@@ -0,0 +1,174 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the exports module."""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from ads_mcp import exports
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+_FIELDS = ["campaign.id", "campaign.name", "campaign.labels"]
+_COLUMN_TYPES = [("integer", False), ("string", False), ("string", True)]
+_ROWS = [[1, "Brand", ["a", "b"]], [2, "Généric", []], [3, None, ["c"]]]
+
+
+class TestExport(unittest.TestCase):
+    """Test cases for the export function."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def test_ndjson(self):
+        """Tests that rows are written as one JSON object per line."""
+        result = exports.export(
+            iter(_ROWS), _FIELDS, "ndjson", "campaign", self.directory
+        )
+
+        with open(result["path"], encoding="utf-8") as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(lines, [dict(zip(_FIELDS, row)) for row in _ROWS])
+        self.assertEqual(result["row_count"], 3)
+        self.assertEqual(result["size_bytes"], os.path.getsize(result["path"]))
+        self.assertTrue(result["path"].endswith(".ndjson"))
+        self.assertEqual(
+            result["columns"],
+            [
+                {"name": "campaign.id", "type": "integer"},
+                {"name": "campaign.name", "type": "string"},
+                {"name": "campaign.labels", "type": "array"},
+            ],
+        )
+
+    def test_csv(self):
+        """Tests that rows follow a header and nested values are JSON."""
+        result = exports.export(
+            iter(_ROWS), _FIELDS, "csv", "campaign", self.directory
+        )
+
+        with open(result["path"], encoding="utf-8", newline="") as file:
+            lines = list(csv.reader(file))
+        self.assertEqual(
+            lines,
+            [
+                _FIELDS,
+                ["1", "Brand", '["a", "b"]'],
+                ["2", "Généric", "[]"],
+                ["3", "", '["c"]'],
+            ],
+        )
+
+    def test_failed_export_leaves_no_file(self):
+        """Tests that a partial file is removed when the rows fail."""
+
+        def rows():
+            yield _ROWS[0]
+            raise RuntimeError("stream reset")
+
+        with self.assertRaisesRegex(RuntimeError, "stream reset"):
+            exports.export(
+                rows(), _FIELDS, "ndjson", "campaign", self.directory
+            )
+
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_unavailable_format_is_rejected(self):
+        """Tests that unknown formats and parquet without pyarrow fail."""
+        with self.assertRaisesRegex(ValueError, "Unknown export format"):
+            exports.check_format("xlsx")
+        with mock.patch.dict(sys.modules, {"pyarrow": None}):
+            with self.assertRaisesRegex(ValueError, "requires pyarrow"):
+                exports.check_format("parquet")
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet(self):
+        """Tests that rows are written in several typed parquet row groups."""
+        from pyarrow import parquet
+
+        rows = [[i, f"Campaign {i}", ["a"], {"n": i}] for i in range(5)]
+        with mock.patch.object(exports, "PARQUET_ROW_GROUP_SIZE", 2):
+            result = exports.export(
+                iter(rows),
+                _FIELDS + ["campaign.network_settings"],
+                "parquet",
+                "campaign",
+                self.directory,
+                column_types=_COLUMN_TYPES + [("object", False)],
+            )
+
+        parquet_file = parquet.ParquetFile(result["path"])
+        table = parquet_file.read()
+        self.assertEqual(parquet_file.num_row_groups, 3)
+        self.assertEqual(
+            table.column("campaign.id").to_pylist(), list(range(5))
+        )
+        self.assertEqual(str(table.schema.field("campaign.id").type), "int64")
+        self.assertEqual(
+            table.column("campaign.network_settings").to_pylist()[1], '{"n": 1}'
+        )
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet_column_filled_after_first_row_group(self):
+        """Tests that values first seen in a later row group are written."""
+        from pyarrow import parquet
+
+        rows = [[1, None, []], [2, None, []], [3, "Brand", ["a"]]]
+        with mock.patch.object(exports, "PARQUET_ROW_GROUP_SIZE", 2):
+            result = exports.export(
+                iter(rows),
+                _FIELDS,
+                "parquet",
+                "campaign",
+                self.directory,
+                column_types=_COLUMN_TYPES,
+            )
+
+        table = parquet.read_table(result["path"])
+        self.assertEqual(
+            table.column("campaign.name").to_pylist(), [None, None, "Brand"]
+        )
+        self.assertEqual(
+            table.column("campaign.labels").to_pylist(), [[], [], ["a"]]
+        )
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_parquet_unknown_types_are_json(self):
+        """Tests that columns of unknown type are written as JSON strings."""
+        from pyarrow import parquet
+
+        result = exports.export(
+            iter(_ROWS), _FIELDS, "parquet", "campaign", self.directory
+        )
+
+        table = parquet.read_table(result["path"])
+        self.assertEqual(
+            table.column("campaign.labels").to_pylist(),
+            ['["a", "b"]', "[]", '["c"]'],
+        )
+        self.assertEqual(
+            table.column("campaign.id").to_pylist(), ["1", "2", "3"]
+        )
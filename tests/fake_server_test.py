@@ -0,0 +1,124 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the fake_server module."""
+
+import unittest
+
+from google.api_core import exceptions
+from google.ads.googleads.errors import GoogleAdsException
+
+from ads_mcp import fake_server
+from ads_mcp import utils
+from ads_mcp.tools import core
+from ads_mcp.tools import search as search_tool
+
+_QUERY = "SELECT campaign.id, campaign.name FROM campaign"
+
+
+class TestFakeServer(unittest.TestCase):
+    """Test cases for the fake Google Ads API server."""
+
+    def setUp(self):
+        self.config = fake_server.FakeServerConfig(rows=25, batch_size=10)
+        self.server = fake_server.FakeGoogleAdsServer(self.config)
+        utils.use_fake_server(self.server.start())
+        self.addCleanup(self.server.stop)
+        self.addCleanup(utils.use_fake_server, None)
+        search_tool._query_cache.clear()
+
+    def test_search_goes_through_the_client(self):
+        """Tests that search reaches the server through the interceptors."""
+        rows = search_tool.search(
+            "123", ["campaign.id", "campaign.name"], "campaign"
+        )
+
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[3], {"campaign.id": 3, "campaign.name": "name 3"})
+        method, metadata = self.server.calls[-1]
+        self.assertEqual(method, "SearchStream")
+        self.assertIn("google-ads-mcp/", metadata["x-goog-api-client"])
+        self.assertIn("developer-token", metadata)
+
+    def test_stream_batches_and_limit(self):
+        """Tests that rows are streamed in batches and LIMIT is honored."""
+        service = utils.get_googleads_service("GoogleAdsService")
+
+        batches = list(service.search_stream(customer_id="1", query=_QUERY))
+        limited = list(
+            service.search_stream(customer_id="1", query=_QUERY + " LIMIT 4")
+        )
+
+        self.assertEqual([len(batch.results) for batch in batches], [10, 10, 5])
+        self.assertEqual(
+            list(batches[0].field_mask.paths),
+            [
+                "campaign.id",
+                "campaign.name",
+            ],
+        )
+        self.assertEqual([len(batch.results) for batch in limited], [4])
+
+    def test_search_pages(self):
+        """Tests that the unary Search method is paged."""
+        self.config.page_size = 10
+        service = utils.get_googleads_service("GoogleAdsService")
+
+        rows = list(service.search(customer_id="1", query=_QUERY))
+
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(
+            [method for method, _ in self.server.calls], ["Search"] * 3
+        )
+
+    def test_list_accessible_customers(self):
+        """Tests that the configured number of customers is returned."""
+        self.config.customers = 2
+
+        self.assertEqual(
+            core.list_accessible_customers(), ["1000000000", "1000000001"]
+        )
+
+    def test_injected_errors(self):
+        """Tests that injected errors surface as the real API's would."""
+        service = utils.get_googleads_service("GoogleAdsService")
+        self.server.fail_next("UNAVAILABLE")
+        with self.assertRaises(exceptions.ServiceUnavailable):
+            list(service.search_stream(customer_id="1", query=_QUERY))
+
+        self.config.error_after_batches = 2
+        self.server.fail_next("RESOURCE_EXHAUSTED")
+        received = []
+        with self.assertRaises(exceptions.ResourceExhausted):
+            for batch in service.search_stream(customer_id="1", query=_QUERY):
+                received.append(len(batch.results))
+        self.assertEqual(received, [10, 10])
+
+        with self.assertRaises(ValueError):
+            self.server.fail_next("INTERNAL")
+
+    def test_unknown_field_is_a_google_ads_failure(self):
+        """Tests that unknown fields fail with a GoogleAdsFailure."""
+        service = utils.get_googleads_service("GoogleAdsService")
+
+        with self.assertRaises(GoogleAdsException) as context:
+            list(
+                service.search_stream(
+                    customer_id="1", query="SELECT campaign.nope FROM campaign"
+                )
+            )
+        self.assertIn(
+            "campaign.nope", context.exception.failure.errors[0].message
+        )
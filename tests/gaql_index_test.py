@@ -0,0 +1,148 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the gaql_index module."""
+
+import unittest
+
+from ads_mcp import gaql_index
+
+_RESOURCES = [
+    {
+        "resource": "campaign",
+        "selectable": ["campaign.id", "campaign.name", "campaign.status"],
+        "filterable": ["campaign.id", "campaign.status"],
+        "sortable": ["campaign.id", "campaign.name"],
+    },
+    {
+        "resource": "metrics",
+        "selectable": ["metrics.clicks", "metrics.search_click_share"],
+        "filterable": ["metrics.clicks"],
+        "sortable": ["metrics.clicks"],
+    },
+]
+
+
+class TestGaqlIndex(unittest.TestCase):
+    """Test cases for the gaql_index module."""
+
+    def setUp(self):
+        self.index = gaql_index.GaqlIndex(_RESOURCES)
+
+    def test_resource_names(self):
+        """Tests that resource names are returned sorted."""
+        self.assertEqual(self.index.resource_names(), ["campaign", "metrics"])
+
+    def test_describe(self):
+        """Tests that describe returns the field lists of a resource."""
+        self.assertEqual(
+            self.index.describe("campaign"),
+            {
+                "resource": "campaign",
+                "selectable": [
+                    "campaign.id",
+                    "campaign.name",
+                    "campaign.status",
+                ],
+                "filterable": ["campaign.id", "campaign.status"],
+                "sortable": ["campaign.id", "campaign.name"],
+            },
+        )
+
+    def test_describe_unknown_resource(self):
+        """Tests that unknown resources raise with a suggestion."""
+        with self.assertRaisesRegex(ValueError, "Did you mean: campaign"):
+            self.index.describe("campaing")
+
+    def test_find_fields_orders_prefix_matches_first(self):
+        """Tests that prefix matches come before substring matches."""
+        self.assertEqual(
+            self.index.find_fields("CLICK"),
+            ["metrics.clicks", "metrics.search_click_share"],
+        )
+        self.assertEqual(
+            self.index.find_fields("metrics.s"),
+            ["metrics.search_click_share"],
+        )
+        self.assertEqual(
+            self.index.find_fields("click", limit=1), ["metrics.clicks"]
+        )
+
+    def test_find_fields_in_resource(self):
+        """Tests that find_fields can be restricted to one resource."""
+        self.assertEqual(
+            self.index.find_fields("id", resource="campaign"),
+            ["campaign.id"],
+        )
+
+    def test_get_index_loads_resources_file(self):
+        """Tests that the shared index is loaded from gaql_resources.json."""
+        index = gaql_index.get_index()
+
+        self.assertIs(index, gaql_index.get_index())
+        self.assertIn("campaign", index.resource_names())
+        self.assertIn("metrics.clicks", index.describe("metrics")["selectable"])
+
+    def test_get_flags(self):
+        """Tests that each field carries its selectable/filterable/sortable bits."""
+        self.assertEqual(
+            self.index.get_flags("campaign.id"),
+            gaql_index.SELECTABLE | gaql_index.FILTERABLE | gaql_index.SORTABLE,
+        )
+        self.assertEqual(
+            self.index.get_flags("campaign.name"),
+            gaql_index.SELECTABLE | gaql_index.SORTABLE,
+        )
+        self.assertEqual(self.index.get_flags("campaign.nope"), 0)
+
+    def test_validate_query(self):
+        """Tests that valid queries pass and invalid parts are named."""
+        self.index.validate_query(
+            ["campaign.id", "metrics.clicks"],
+            "campaign",
+            conditions=["campaign.status = 'ENABLED'", "metrics.clicks > 0"],
+            orderings=["metrics.clicks DESC"],
+        )
+
+        with self.assertRaisesRegex(ValueError, "Did you mean: campaign.name"):
+            self.index.validate_query(["campaign.nam"], "campaign")
+        with self.assertRaisesRegex(
+            ValueError, "'campaign.name' in conditions is not filterable"
+        ):
+            self.index.validate_query(
+                ["campaign.id"], "campaign", conditions=["campaign.name = 'a'"]
+            )
+        with self.assertRaisesRegex(
+            ValueError, "'campaign.status' in orderings is not sortable"
+        ):
+            self.index.validate_query(
+                ["campaign.id"], "campaign", orderings=["campaign.status"]
+            )
+        with self.assertRaisesRegex(ValueError, "Unknown resource"):
+            self.index.validate_query(["campaign.id"], "campaing")
+
+    def test_validate_query_uses_selectable_with(self):
+        """Tests that selectable_with, when present, limits other resources."""
+        index = gaql_index.GaqlIndex(
+            [
+                dict(_RESOURCES[0], selectable_with=["metrics.clicks"]),
+                _RESOURCES[1],
+            ]
+        )
+
+        index.validate_query(["campaign.id", "metrics.clicks"], "campaign")
+        with self.assertRaisesRegex(ValueError, "can't be selected together"):
+            index.validate_query(
+                ["campaign.id", "metrics.search_click_share"], "campaign"
+            )
@@ -0,0 +1,216 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the jobs module."""
+
+import threading
+import unittest
+
+from starlette.testclient import TestClient
+
+from ads_mcp.sheets_sync import endpoint
+from ads_mcp.sheets_sync import jobs
+
+
+class _FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestJobRunner(unittest.TestCase):
+    """Test cases for the JobRunner class."""
+
+    def test_concurrent_triggers_are_coalesced(self):
+        """Tests that triggers received while a job runs join that job."""
+        release = threading.Event()
+        runs = []
+
+        def target(job):
+            runs.append(job.id)
+            release.wait(5)
+
+        runner = jobs.JobRunner(target)
+        first, created = runner.submit()
+        second, second_created = runner.submit()
+        release.set()
+        self.assertTrue(first.wait(5))
+
+        self.assertTrue(created)
+        self.assertFalse(second_created)
+        self.assertIs(first, second)
+        self.assertEqual(first.triggers, 2)
+        self.assertEqual(runs, [first.id])
+        self.assertEqual(first.status, jobs.SUCCEEDED)
+
+        third, created = runner.submit()
+        self.assertTrue(third.wait(5))
+        self.assertTrue(created)
+        self.assertIsNot(third, first)
+
+    def test_progress_and_eta(self):
+        """Tests that the status reports the accounts done and an ETA."""
+        clock = _FakeClock()
+        step = threading.Event()
+        proceed = threading.Event()
+
+        def target(job):
+            job.start(5)
+            clock.now += 10
+            job.account_finished()
+            job.account_finished(jobs.FAILED)
+            step.set()
+            proceed.wait(5)
+            job.account_finished()
+            job.account_finished(jobs.SKIPPED)
+            job.account_finished()
+            job.write_failed()
+
+        runner = jobs.JobRunner(target, clock=clock)
+        job, _ = runner.submit()
+        self.assertTrue(step.wait(5))
+
+        status = job.to_dict()
+        self.assertEqual(status["status"], jobs.RUNNING)
+        self.assertEqual(
+            status["accounts"],
+            {
+                "total": 5,
+                "done": 2,
+                "succeeded": 1,
+                "failed": 1,
+                "skipped": 0,
+            },
+        )
+        self.assertEqual(status["eta_seconds"], 15.0)
+
+        proceed.set()
+        self.assertTrue(job.wait(5))
+        status = job.to_dict()
+        self.assertEqual(status["status"], jobs.SUCCEEDED)
+        self.assertEqual(
+            status["accounts"],
+            {
+                "total": 5,
+                "done": 5,
+                "succeeded": 2,
+                "failed": 2,
+                "skipped": 1,
+            },
+        )
+        self.assertIsNone(status["eta_seconds"])
+
+    def test_failed_job(self):
+        """Tests that an exception of the sync marks the job as failed."""
+
+        def target(job):
+            raise RuntimeError("Sheet is empty")
+
+        runner = jobs.JobRunner(target)
+        job, _ = runner.submit()
+        self.assertTrue(job.wait(5))
+
+        self.assertEqual(job.status, jobs.FAILED)
+        self.assertEqual(job.error, "Sheet is empty")
+
+    def test_metrics(self):
+        """Tests that triggers, accounts and durations are recorded."""
+        started = jobs.SYNC_TRIGGERS.get("started")
+        write_failed = jobs.SYNC_ACCOUNTS.get("write_failed")
+        skipped = jobs.SYNC_ACCOUNTS.get(jobs.SKIPPED)
+        succeeded = jobs.SYNC_DURATION.get_count(jobs.SUCCEEDED)
+
+        def target(job):
+            job.start(3)
+            job.account_finished()
+            job.account_finished()
+            job.account_finished(jobs.SKIPPED)
+            job.write_failed()
+
+        job, _ = jobs.JobRunner(target).submit()
+        self.assertTrue(job.wait(5))
+
+        self.assertEqual(jobs.SYNC_TRIGGERS.get("started"), started + 1)
+        self.assertEqual(
+            jobs.SYNC_ACCOUNTS.get("write_failed"), write_failed + 1
+        )
+        self.assertEqual(jobs.SYNC_ACCOUNTS.get(jobs.SKIPPED), skipped + 1)
+        self.assertEqual(
+            jobs.SYNC_DURATION.get_count(jobs.SUCCEEDED), succeeded + 1
+        )
+
+    def test_history_is_bounded(self):
+        """Tests that only the most recent jobs are kept."""
+        runner = jobs.JobRunner(lambda job: None, history=2)
+        submitted = []
+        for _ in range(3):
+            job, _ = runner.submit()
+            job.wait(5)
+            submitted.append(job)
+
+        self.assertIsNone(runner.get(submitted[0].id))
+        self.assertIs(runner.get(submitted[2].id), submitted[2])
+        self.assertIs(runner.latest(), submitted[2])
+
+
+class TestEndpoint(unittest.TestCase):
+    """Test cases for the sync endpoint."""
+
+    def test_trigger_returns_job_id(self):
+        """Tests that the trigger returns at once with a pollable job."""
+        release = threading.Event()
+        runner = jobs.JobRunner(lambda job: release.wait(5))
+        original, endpoint.job_runner = endpoint.job_runner, runner
+        self.addCleanup(setattr, endpoint, "job_runner", original)
+        client = TestClient(endpoint.sync_app)
+
+        response = client.post("/sync-sheets")
+        coalesced = client.get("/sync-sheets")
+        release.set()
+        runner.latest().wait(5)
+        status = client.get(f"/sync-sheets/{response.json()['job_id']}")
+
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(response.json()["coalesced"])
+        self.assertTrue(coalesced.json()["coalesced"])
+        self.assertEqual(coalesced.json()["job_id"], response.json()["job_id"])
+        self.assertEqual(status.json()["status"], jobs.SUCCEEDED)
+        self.assertEqual(
+            client.get("/sync-sheets/latest").json(), status.json()
+        )
+        self.assertEqual(client.get("/sync-sheets/unknown").status_code, 404)
+
+    def test_trigger_with_other_options_conflicts(self):
+        """Tests that a full refresh isn't coalesced into a regular sync."""
+        release = threading.Event()
+        runner = jobs.JobRunner(lambda job: release.wait(5))
+        original, endpoint.job_runner = endpoint.job_runner, runner
+        self.addCleanup(setattr, endpoint, "job_runner", original)
+        client = TestClient(endpoint.sync_app)
+
+        response = client.post("/sync-sheets")
+        conflict = client.post("/sync-sheets?full_refresh=true")
+        release.set()
+        runner.latest().wait(5)
+
+        self.assertEqual(conflict.status_code, 409)
+        self.assertEqual(conflict.json()["job_id"], response.json()["job_id"])
+        self.assertEqual(runner.latest().triggers, 1)
+        self.assertEqual(
+            runner.latest().to_dict()["options"], {"full_refresh": False}
+        )
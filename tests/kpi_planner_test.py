@@ -0,0 +1,139 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the kpi_planner module."""
+
+import datetime
+import unittest
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
+
+from ads_mcp.sheets_sync import kpi_planner
+
+_D = datetime.date
+
+_KPI_PERIODS = {
+    "current": (_D(2025, 6, 1), _D(2025, 6, 14)),
+    "last_month": (_D(2025, 5, 1), _D(2025, 5, 31)),
+    "one_year_ago": (_D(2024, 6, 1), _D(2024, 6, 30)),
+}
+_DAILY_PERIODS = {"yesterday": (_D(2025, 6, 14), _D(2025, 6, 14))}
+
+
+def _row(values):
+    """Returns a raw protobuf row with the given GAQL field values."""
+    row = {}
+    for field, value in values.items():
+        *parents, name = field.split(".")
+        node = row
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[name] = value
+    return GoogleAdsRow.pb(GoogleAdsRow(row))
+
+
+class TestKpiPlanner(unittest.TestCase):
+    """Test cases for the kpi_planner module."""
+
+    def test_month_periods_share_one_ratio_query(self):
+        """Tests that month periods are planned as one segmented query."""
+        plan = kpi_planner.plan_queries(_KPI_PERIODS, _DAILY_PERIODS)
+
+        self.assertEqual(
+            [planned.segment for planned in plan],
+            ["segments.date", "segments.month"],
+        )
+        self.assertIn("BETWEEN '2024-06-01' AND '2025-06-14'", plan[0].query)
+        self.assertEqual(
+            plan[1].periods,
+            {
+                "2025-06-01": "current",
+                "2025-05-01": "last_month",
+                "2024-06-01": "one_year_ago",
+            },
+        )
+
+    def test_other_periods_get_their_own_ratio_query(self):
+        """Tests that periods not aligned on months are queried alone."""
+        periods = dict(
+            _KPI_PERIODS, last_7_days=(_D(2025, 6, 8), _D(2025, 6, 14))
+        )
+
+        plan = kpi_planner.plan_queries(periods, {})
+
+        self.assertEqual(len(plan), 3)
+        self.assertEqual(plan[2].periods, {None: "last_7_days"})
+        self.assertIn("BETWEEN '2025-06-08' AND '2025-06-14'", plan[2].query)
+
+    def test_collect_period_values(self):
+        """Tests that days are summed per period and ratios re-derived."""
+        plan = kpi_planner.plan_queries(_KPI_PERIODS, _DAILY_PERIODS)
+        days = [
+            _row(
+                {
+                    "segments.date": date,
+                    "customer.descriptive_name": "Acme",
+                    "metrics.cost_micros": cost,
+                    "metrics.impressions": 100,
+                    "metrics.clicks": clicks,
+                }
+            )
+            for date, cost, clicks in [
+                ("2025-05-31", 5_000_000, 5),
+                ("2025-06-13", 2_000_000, 1),
+                ("2025-06-14", 4_000_000, 3),
+            ]
+        ]
+        months = [
+            _row(
+                {
+                    "segments.month": "2025-06-01",
+                    "metrics.search_impression_share": 0.5,
+                }
+            )
+        ]
+
+        values = kpi_planner.collect_period_values(
+            plan, [days, months], _KPI_PERIODS, _DAILY_PERIODS
+        )
+
+        current = values["current"]
+        self.assertEqual(current["metrics.cost_micros"], 6_000_000)
+        self.assertEqual(current["metrics.clicks"], 4)
+        self.assertEqual(current["metrics.ctr"], 0.02)
+        self.assertEqual(current["metrics.average_cpc"], 1_500_000)
+        self.assertEqual(current["metrics.search_impression_share"], 0.5)
+        self.assertEqual(current["customer.descriptive_name"], "Acme")
+        self.assertEqual(values["last_month"]["metrics.clicks"], 5)
+        self.assertEqual(
+            values["last_month"]["metrics.search_impression_share"], 0
+        )
+        self.assertEqual(values["yesterday"]["metrics.cost_micros"], 4_000_000)
+        self.assertEqual(values["one_year_ago"]["metrics.average_cpc"], 0)
+
+    def test_failed_queries_leave_fields_out(self):
+        """Tests that fields of a failed query are not reported."""
+        plan = kpi_planner.plan_queries(_KPI_PERIODS, _DAILY_PERIODS)
+
+        values = kpi_planner.collect_period_values(
+            plan, [None, []], _KPI_PERIODS, _DAILY_PERIODS
+        )
+
+        self.assertNotIn("metrics.cost_micros", values["current"])
+        self.assertEqual(
+            values["current"]["metrics.search_impression_share"], 0
+        )
+        self.assertEqual(values["yesterday"], {})
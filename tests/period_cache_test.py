@@ -0,0 +1,92 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the period_cache module."""
+
+import datetime
+import os
+import tempfile
+import unittest
+
+from ads_mcp.sheets_sync import period_cache
+
+_D = datetime.date
+
+
+class TestPeriodCache(unittest.TestCase):
+    """Test cases for the PeriodCache class."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "cache", "periods.sqlite3")
+
+    def test_values_are_persisted(self):
+        """Tests that stored values are read back by a new cache."""
+        cache = period_cache.PeriodCache(self.path)
+        cache.put("1", _D(2025, 5, 1), _D(2025, 5, 31), "kpi", {"clicks": 3})
+        cache.close()
+
+        cache = period_cache.PeriodCache(self.path)
+        self.addCleanup(cache.close)
+        self.assertEqual(
+            cache.get("1", _D(2025, 5, 1), _D(2025, 5, 31), "kpi"),
+            {"clicks": 3},
+        )
+        self.assertIsNone(
+            cache.get("2", _D(2025, 5, 1), _D(2025, 5, 31), "kpi")
+        )
+        self.assertIsNone(
+            cache.get("1", _D(2025, 5, 1), _D(2025, 5, 30), "kpi")
+        )
+        self.assertIsNone(
+            cache.get("1", _D(2025, 5, 1), _D(2025, 5, 31), "other")
+        )
+
+    def test_put_replaces_values(self):
+        """Tests that storing a period again replaces its values."""
+        cache = period_cache.PeriodCache(self.path)
+        self.addCleanup(cache.close)
+        start = datetime.datetime(2025, 5, 1, 9)
+        end = datetime.datetime(2025, 5, 31, 9)
+
+        cache.put("1", start, end, "kpi", {"clicks": 3})
+        cache.put("1", start, end, "kpi", {"clicks": 4})
+
+        self.assertEqual(
+            cache.get("1", start.date(), end.date(), "kpi"), {"clicks": 4}
+        )
+
+    def test_is_closed(self):
+        """Tests that periods close once the conversion lag has passed."""
+        today = _D(2025, 7, 1)
+
+        self.assertTrue(period_cache.is_closed(_D(2025, 5, 31), today, 30))
+        self.assertTrue(period_cache.is_closed(_D(2025, 6, 1), today, 30))
+        self.assertFalse(period_cache.is_closed(_D(2025, 6, 2), today, 30))
+        self.assertTrue(
+            period_cache.is_closed(datetime.datetime(2025, 6, 30), today, 0)
+        )
+
+    def test_metric_set_id(self):
+        """Tests that the metric set ID ignores the order of the fields."""
+        self.assertEqual(
+            period_cache.metric_set_id(["metrics.clicks", "metrics.ctr"]),
+            period_cache.metric_set_id(["metrics.ctr", "metrics.clicks"]),
+        )
+        self.assertNotEqual(
+            period_cache.metric_set_id(["metrics.clicks"]),
+            period_cache.metric_set_id(["metrics.clicks", "metrics.ctr"]),
+        )
@@ -0,0 +1,201 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the profiling module."""
+
+import asyncio
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+import unittest
+from unittest import mock
+
+from ads_mcp import coordinator
+from ads_mcp import executor
+from ads_mcp import profiling
+from ads_mcp.tools import core  # noqa: F401
+
+
+def _busy_wait(seconds):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def _allocate():
+    return [str(i) * 10 for i in range(20000)]
+
+
+class TestProfile(unittest.TestCase):
+    """Test cases for the profile context manager."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        patcher = mock.patch.dict(
+            os.environ, {"GOOGLE_ADS_MCP_PROFILE_DIR": self.directory}
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_disabled_by_default(self):
+        """Tests that nothing is profiled unless enabled or forced."""
+        with profiling.profile("search") as session:
+            _busy_wait(0.01)
+
+        self.assertIsNone(session)
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_writes_samples_and_allocations(self):
+        """Tests that the stacks and allocations of the block are written."""
+        with profiling.profile("tool-search", force=True) as session:
+            _busy_wait(0.1)
+            rows = _allocate()
+
+        collapsed_path, summary_path = session.paths
+        self.assertEqual(os.path.dirname(collapsed_path), self.directory)
+        with open(collapsed_path) as file:
+            collapsed = file.read()
+        with open(summary_path) as file:
+            summary = file.read()
+        self.assertGreater(session.sample_count, 5)
+        self.assertIn("_busy_wait (profiling_test.py:", collapsed)
+        stack, count = collapsed.splitlines()[0].rsplit(" ", 1)
+        self.assertEqual(stack.split(";")[0], "MainThread")
+        self.assertGreater(int(count), 0)
+        self.assertIn("name: tool-search", summary)
+        self.assertIn("profiling_test.py", summary)
+        self.assertGreater(session.peak_bytes, 20000 * 50)
+        self.assertEqual(len(rows), 20000)
+
+    def test_memory_tracing_can_be_skipped(self):
+        """Tests that GOOGLE_ADS_MCP_PROFILE_MEMORY=0 only samples stacks."""
+        with mock.patch.object(profiling, "trace_memory", False):
+            with profiling.profile("search", force=True) as session:
+                _busy_wait(0.05)
+
+        with open(session.paths[1]) as file:
+            summary = file.read()
+        self.assertNotIn("traced memory peak", summary)
+        self.assertFalse(tracemalloc.is_tracing())
+        self.assertGreater(session.sample_count, 0)
+
+    def test_bound_threads_are_sampled_and_profiles_do_not_nest(self):
+        """Tests that bound workers join the profile under their label."""
+        with profiling.profile("sync", force=True) as session:
+            with profiling.profile("inner", force=True) as inner:
+                pass
+            with concurrent.futures.ThreadPoolExecutor(1) as pool:
+                pool.submit(
+                    profiling.bind(_busy_wait, label="1234567890"), 0.1
+                ).result()
+
+        self.assertIsNone(inner)
+        roots = {stack[0] for stack in session.samples}
+        self.assertIn("1234567890", roots)
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+        self.assertIs(profiling.bind(_busy_wait), _busy_wait)
+
+    def test_async_profile_leaves_the_event_loop_out(self):
+        """Tests that other tasks on the loop aren't sampled or blocked."""
+        stopped_in = []
+        stop = profiling.Profile.stop
+
+        def record_stop(session):
+            stopped_in.append(threading.current_thread())
+            stop(session)
+
+        def _other_request():
+            _busy_wait(0.1)
+
+        async def main():
+            async with profiling.profile_async(
+                "tool-search", force=True
+            ) as session:
+                loop = asyncio.get_running_loop()
+                worker = loop.run_in_executor(
+                    None, profiling.bind(_busy_wait), 0.1
+                )
+                # Runs on the loop thread while the worker is busy.
+                await asyncio.sleep(0.01)
+                _other_request()
+                await worker
+            return session
+
+        with mock.patch.object(profiling.Profile, "stop", record_stop):
+            session = asyncio.run(main())
+
+        functions = {frame for stack in session.samples for frame in stack}
+        self.assertTrue(any("_busy_wait" in frame for frame in functions))
+        self.assertFalse(any("_other_request" in frame for frame in functions))
+        self.assertIsNot(stopped_in[0], threading.main_thread())
+        self.assertEqual(len(os.listdir(self.directory)), 2)
+
+    def test_requested_by_header_or_meta(self):
+        """Tests that a tool call asks for a profile by header or _meta."""
+        request = types.SimpleNamespace(headers={"x-ads-mcp-profile": "1"})
+        meta = types.SimpleNamespace(profile=True)
+
+        self.assertFalse(profiling.requested(None))
+        self.assertTrue(
+            profiling.requested(
+                types.SimpleNamespace(request=request, meta=None)
+            )
+        )
+        self.assertTrue(
+            profiling.requested(types.SimpleNamespace(request=None, meta=meta))
+        )
+        self.assertFalse(
+            profiling.requested(
+                types.SimpleNamespace(request=types.SimpleNamespace(headers={}))
+            )
+        )
+
+    def test_tool_calls_are_profiled_with_their_workers(self):
+        """Tests that a tool call's profile covers its worker thread."""
+        with (
+            mock.patch.object(profiling, "enabled", True),
+            mock.patch(
+                "ads_mcp.tools.core.utils.get_googleads_service"
+            ) as get_service,
+        ):
+            get_service.return_value.list_accessible_customers.side_effect = (
+                lambda: _busy_wait(0.1)
+                or types.SimpleNamespace(resource_names=[])
+            )
+            asyncio.run(
+                coordinator.mcp.call_tool("list_accessible_customers", {})
+            )
+
+        names = os.listdir(self.directory)
+        self.assertEqual(len(names), 2)
+        self.assertTrue(
+            all("tool-list_accessible_customers" in name for name in names)
+        )
+        collapsed = next(name for name in names if name.endswith(".collapsed"))
+        with open(os.path.join(self.directory, collapsed)) as file:
+            content = file.read()
+        if executor.get_max_workers():
+            self.assertIn("ads-mcp-worker", content)
+        self.assertIn("_busy_wait", content)
+
+
+if __name__ == "__main__":
+    unittest.main()
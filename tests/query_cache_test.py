@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the query_cache module."""
+
+import datetime
+import time
+import unittest
+
+from ads_mcp import query_cache
+
+_TODAY = datetime.date(2025, 6, 15)
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test cases for the query_cache module."""
+
+    def test_make_key_canonicalizes_conditions(self):
+        """Tests that equivalent queries share a key."""
+        key = query_cache.make_key(
+            "123",
+            ["campaign.id"],
+            "campaign",
+            ["campaign.status = 'ENABLED'", "metrics.clicks > 0"],
+        )
+
+        self.assertEqual(
+            key,
+            query_cache.make_key(
+                " 123 ",
+                ["campaign.id"],
+                " campaign",
+                ["metrics.clicks   >  0", "campaign.status =  'ENABLED'"],
+            ),
+        )
+        # Whitespace inside literals is significant.
+        self.assertNotEqual(
+            query_cache.make_key(
+                "123", ["campaign.id"], "campaign", ["campaign.name = 'a  b'"]
+            ),
+            query_cache.make_key(
+                "123", ["campaign.id"], "campaign", ["campaign.name = 'a b'"]
+            ),
+        )
+
+    def test_ttl_depends_on_date_window(self):
+        """Tests that closed date windows are cached the longest."""
+        cache = query_cache.QueryCache(conversion_lag_days=30)
+
+        def ttl(*conditions):
+            return cache.ttl_for(list(conditions), today=_TODAY)
+
+        self.assertEqual(
+            ttl("segments.date BETWEEN '2025-01-01' AND '2025-01-31'"),
+            query_cache.CLOSED_TTL_SECONDS,
+        )
+        self.assertEqual(
+            ttl(
+                "segments.date >= '2025-06-01'",
+                "segments.date <= '2025-06-10'",
+            ),
+            query_cache.RECENT_TTL_SECONDS,
+        )
+        self.assertEqual(
+            ttl("segments.date >= '2025-06-01'"),
+            query_cache.LIVE_TTL_SECONDS,
+        )
+        self.assertEqual(
+            ttl("segments.date = '2025-06-14'"),
+            query_cache.LIVE_TTL_SECONDS,
+        )
+        self.assertEqual(
+            ttl("segments.date DURING LAST_30_DAYS"),
+            query_cache.LIVE_TTL_SECONDS,
+        )
+        self.assertEqual(
+            ttl("campaign.status = 'ENABLED'"), query_cache.LIVE_TTL_SECONDS
+        )
+
+    def test_get_and_put(self):
+        """Tests hits, misses and expiry."""
+        cache = query_cache.QueryCache(max_entries=10, max_cells=100)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertTrue(cache.put("a", [{"x": 1}], width=1, ttl=60))
+        self.assertTrue(cache.put("b", [{"x": 2}], width=1, ttl=0.05))
+        self.assertEqual(cache.get("a"), [{"x": 1}])
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("b"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["expirations"], 1)
+        self.assertEqual(stats["entries"], 1)
+
+    def test_lru_eviction_by_cells(self):
+        """Tests that the cell budget evicts least recently used entries."""
+        cache = query_cache.QueryCache(max_entries=10, max_cells=10)
+
+        cache.put("a", [{}] * 4, width=1, ttl=60)
+        cache.put("b", [{}] * 4, width=1, ttl=60)
+        cache.get("a")
+        cache.put("c", [{}] * 4, width=1, ttl=60)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertFalse(cache.put("d", [{}] * 11, width=1, ttl=60))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disabled(self):
+        """Tests that max_entries=0 disables the cache."""
+        cache = query_cache.QueryCache(max_entries=0)
+
+        self.assertFalse(cache.put("a", [{}], width=1, ttl=60))
+        self.assertIsNone(cache.get("a"))
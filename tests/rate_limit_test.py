@@ -0,0 +1,75 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the rate_limit module."""
+
+import unittest
+
+from ads_mcp import rate_limit
+
+
+class _FakeClock:
+    """A clock that only moves when sleep is called."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the rate_limit module."""
+
+    def setUp(self):
+        self.clock = _FakeClock()
+
+    def _make_bucket(self, rate, capacity=None):
+        return rate_limit.TokenBucket(
+            rate, capacity, clock=self.clock, sleep=self.clock.sleep
+        )
+
+    def test_burst_then_steady_rate(self):
+        """Tests that a full bucket serves a burst, then `rate` per second."""
+        bucket = self._make_bucket(rate=2, capacity=4)
+
+        waits = [bucket.acquire() for _ in range(8)]
+
+        self.assertEqual(waits[:4], [0, 0, 0, 0])
+        self.assertEqual(waits[4:], [0.5, 0.5, 0.5, 0.5])
+        self.assertEqual(self.clock.now, 2.0)
+
+    def test_try_acquire_does_not_wait(self):
+        """Tests that try_acquire fails instead of waiting."""
+        bucket = self._make_bucket(rate=1)
+
+        self.assertTrue(bucket.try_acquire())
+        self.assertFalse(bucket.try_acquire())
+        self.clock.now += 1
+        self.assertTrue(bucket.try_acquire())
+
+    def test_disabled_bucket(self):
+        """Tests that a rate of 0 never waits."""
+        bucket = self._make_bucket(rate=0)
+
+        self.assertFalse(bucket.enabled)
+        self.assertEqual(sum(bucket.acquire() for _ in range(100)), 0)
+
+    def test_acquire_more_than_capacity(self):
+        """Tests that requests larger than the bucket are rejected."""
+        with self.assertRaises(ValueError):
+            self._make_bucket(rate=1, capacity=2).acquire(3)
@@ -0,0 +1,45 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the run_sync module."""
+
+import unittest
+from concurrent.futures import Future
+
+from ads_mcp.sheets_sync import jobs
+from ads_mcp.sheets_sync import run_sync
+
+
+def _finished(result=None, error=None):
+    future = Future()
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+    return future
+
+
+class TestAccountResult(unittest.TestCase):
+    """Test cases for the job outcome of processed accounts."""
+
+    def test_account_result(self):
+        """Tests that accounts without a row are skipped, not succeeded."""
+        self.assertEqual(run_sync._account_result(_finished(3)), jobs.SUCCEEDED)
+        self.assertEqual(run_sync._account_result(_finished(0)), jobs.SUCCEEDED)
+        self.assertEqual(run_sync._account_result(_finished()), jobs.SKIPPED)
+        self.assertEqual(
+            run_sync._account_result(_finished(error=RuntimeError("quota"))),
+            jobs.FAILED,
+        )
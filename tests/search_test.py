@@ -0,0 +1,363 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the search tool."""
+
+import asyncio
+import concurrent.futures
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+    SearchGoogleAdsStreamResponse,
+)
+
+from ads_mcp import query_cache
+from ads_mcp.tools import search as search_tool
+
+
+def _make_stream(row_count, batch_size=3):
+    """Returns raw protobuf batches, as yielded by `search_stream`."""
+    batches = []
+    for start in range(0, row_count, batch_size):
+        rows = [
+            GoogleAdsRow({"campaign": {"id": i, "name": f"Campaign {i}"}})
+            for i in range(start, min(start + batch_size, row_count))
+        ]
+        response = SearchGoogleAdsStreamResponse(results=rows)
+        batches.append(SearchGoogleAdsStreamResponse.pb(response))
+    return batches
+
+
+class TestSearch(unittest.TestCase):
+    """Test cases for the search tool."""
+
+    def setUp(self):
+        self.service = mock.Mock()
+        patcher = mock.patch.object(
+            search_tool.utils,
+            "get_googleads_service",
+            return_value=self.service,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        search_tool._query_cache.clear()
+
+    def test_search_builds_query(self):
+        """Tests that the GAQL query is assembled from the arguments."""
+        self.service.search_stream.return_value = iter(_make_stream(2))
+
+        rows = search_tool.search(
+            "123",
+            ["campaign.id", "campaign.name"],
+            "campaign",
+            conditions=["campaign.id > 0"],
+            orderings=["campaign.id"],
+            limit=5,
+        )
+
+        self.service.search_stream.assert_called_once_with(
+            customer_id="123",
+            query=(
+                "SELECT campaign.id, campaign.name FROM campaign"
+                " WHERE campaign.id > 0 ORDER BY campaign.id LIMIT 5"
+            ),
+        )
+        self.assertEqual(
+            rows,
+            [
+                {"campaign.id": 0, "campaign.name": "Campaign 0"},
+                {"campaign.id": 1, "campaign.name": "Campaign 1"},
+            ],
+        )
+
+    def test_paginated_search_reads_stream_once(self):
+        """Tests that pages resume the stream instead of re-querying."""
+        self.service.search_stream.return_value = iter(_make_stream(7))
+
+        first = search_tool.search(
+            "123", ["campaign.id"], "campaign", page_size=4
+        )
+        second = search_tool.search_next_page(first["next_cursor"])
+
+        self.assertEqual(
+            [row["campaign.id"] for row in first["rows"]], [0, 1, 2, 3]
+        )
+        self.assertEqual(
+            [row["campaign.id"] for row in second["rows"]], [4, 5, 6]
+        )
+        self.assertIsNone(second["next_cursor"])
+        self.service.search_stream.assert_called_once()
+
+    def test_repeated_search_is_served_from_cache(self):
+        """Tests that identical searches only query the API once."""
+        self.service.search_stream.return_value = iter(_make_stream(2))
+
+        first = search_tool.search(
+            "123",
+            ["campaign.id"],
+            "campaign",
+            conditions=["segments.date >= '2024-01-01'", "campaign.id > 0"],
+        )
+        second = search_tool.search(
+            "123",
+            ["campaign.id"],
+            "campaign",
+            conditions=["campaign.id  >  0", "segments.date >= '2024-01-01'"],
+        )
+
+        self.assertEqual(first, second)
+        self.service.search_stream.assert_called_once()
+
+    def test_concurrent_identical_searches_share_one_call(self):
+        """Tests that identical searches in flight share one API call."""
+        started = threading.Event()
+        release = threading.Event()
+
+        def search_stream(customer_id, query):
+            started.set()
+            release.wait(5)
+            return iter(_make_stream(2))
+
+        self.service.search_stream.side_effect = search_stream
+        coalesced = search_tool.SEARCH_COALESCED.get()
+        # Without a cache, only the in-flight call can be shared.
+        uncached = mock.patch.object(
+            search_tool, "_query_cache", query_cache.QueryCache(max_entries=0)
+        )
+
+        with uncached, concurrent.futures.ThreadPoolExecutor(3) as pool:
+            futures = [
+                pool.submit(
+                    search_tool.search, "123", ["campaign.id"], "campaign"
+                )
+            ]
+            self.assertTrue(started.wait(5))
+            futures += [
+                pool.submit(
+                    search_tool.search, "123", ["campaign.id"], "campaign"
+                )
+                for _ in range(2)
+            ]
+            # Gives the other searches time to join before the call returns.
+            time.sleep(0.2)
+            release.set()
+            results = [future.result(5) for future in futures]
+            search_tool.search("123", ["campaign.id"], "campaign")
+
+        self.assertEqual(results[1], results[0])
+        self.assertEqual(results[2], results[0])
+        self.assertEqual(search_tool.SEARCH_COALESCED.get(), coalesced + 2)
+        # The search made after the others completed queried again.
+        self.assertEqual(self.service.search_stream.call_count, 2)
+
+    def test_columnar_search(self):
+        """Tests that columnar results list values in the column order."""
+        self.service.search_stream.side_effect = lambda **_: iter(
+            _make_stream(2)
+        )
+        fields = ["campaign.name", "campaign.id"]
+
+        result = search_tool.search(
+            "123", fields, "campaign", format="columnar"
+        )
+        rows = search_tool.search("123", fields, "campaign")
+
+        self.assertEqual(
+            result,
+            {
+                "columns": ["campaign.name", "campaign.id"],
+                "rows": [["Campaign 0", 0], ["Campaign 1", 1]],
+            },
+        )
+        # Dict rows aren't served from the columnar cache entry.
+        self.assertEqual(
+            rows,
+            [
+                {"campaign.name": "Campaign 0", "campaign.id": 0},
+                {"campaign.name": "Campaign 1", "campaign.id": 1},
+            ],
+        )
+        self.assertEqual(self.service.search_stream.call_count, 2)
+
+    def test_columnar_search_pages(self):
+        """Tests that pages of a columnar search hold value lists."""
+        self.service.search_stream.return_value = iter(_make_stream(5))
+
+        first = search_tool.search(
+            "123", ["campaign.id"], "campaign", page_size=3, format="columnar"
+        )
+        second = search_tool.search_next_page(first["next_cursor"])
+
+        self.assertEqual(first["columns"], ["campaign.id"])
+        self.assertEqual(first["rows"], [[0], [1], [2]])
+        self.assertEqual(second["rows"], [[3], [4]])
+
+    def test_dictionary_encoding(self):
+        """Tests that repetitive text columns are dictionary encoded."""
+        batch = SearchGoogleAdsStreamResponse(
+            results=[
+                GoogleAdsRow(
+                    {"campaign": {"id": i, "name": f"Campaign {i % 2}"}}
+                )
+                for i in range(4)
+            ]
+        )
+        self.service.search_stream.return_value = iter(
+            [SearchGoogleAdsStreamResponse.pb(batch)]
+        )
+
+        fields = ["campaign.id", "campaign.name"]
+        encoded = search_tool.search(
+            "123", fields, "campaign", format="columnar", dictionary_encode=True
+        )
+        plain = search_tool.search("123", fields, "campaign", format="columnar")
+
+        self.assertEqual(
+            encoded["dictionaries"],
+            {"campaign.name": ["Campaign 0", "Campaign 1"]},
+        )
+        self.assertEqual(encoded["rows"], [[0, 0], [1, 1], [2, 0], [3, 1]])
+        # The cached rows are left untouched by the encoding.
+        self.assertEqual(plain["rows"][2], [2, "Campaign 0"])
+        self.service.search_stream.assert_called_once()
+
+    def test_invalid_format_is_rejected(self):
+        """Tests that unknown or conflicting output options are rejected."""
+        with self.assertRaisesRegex(ValueError, "Unknown format"):
+            search_tool.search("123", ["campaign.id"], "campaign", format="csv")
+        with self.assertRaisesRegex(ValueError, "columnar"):
+            search_tool.search(
+                "123", ["campaign.id"], "campaign", dictionary_encode=True
+            )
+        with self.assertRaisesRegex(ValueError, "page_size"):
+            search_tool.search(
+                "123",
+                ["campaign.id"],
+                "campaign",
+                page_size=10,
+                format="columnar",
+                dictionary_encode=True,
+            )
+
+        self.service.search_stream.assert_not_called()
+
+    def test_export_streams_rows_to_a_file(self):
+        """Tests that an export writes the rows and serves the file."""
+        self.service.search_stream.return_value = iter(_make_stream(5))
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        environment = {
+            "GOOGLE_ADS_MCP_EXPORT_DIR": directory.name,
+            "GOOGLE_ADS_MCP_EXPORT_RESOURCES": "1",
+        }
+
+        row_type = mock.patch.object(
+            search_tool.utils,
+            "get_googleads_type",
+            return_value=GoogleAdsRow.pb(GoogleAdsRow()),
+        )
+
+        with row_type, mock.patch.dict(os.environ, environment):
+            result = search_tool.search(
+                "123",
+                ["campaign.id", "campaign.name"],
+                "campaign",
+                export="csv",
+            )
+
+        self.assertEqual(os.path.dirname(result["path"]), directory.name)
+        self.assertEqual(result["row_count"], 5)
+        self.assertEqual(
+            [column["type"] for column in result["columns"]],
+            ["integer", "string"],
+        )
+        with open(result["path"], encoding="utf-8") as file:
+            self.assertEqual(
+                file.readline().strip(), "campaign.id,campaign.name"
+            )
+        contents = asyncio.run(search_tool.mcp.read_resource(result["uri"]))
+        self.assertIn("4,Campaign 4", contents[0].content)
+        # Exports aren't cached.
+        self.assertEqual(search_tool._query_cache.stats()["entries"], 0)
+
+    def test_tool_description_is_compact(self):
+        """Tests that the field table is not inlined in the description."""
+        description = search_tool._search_tool_description()
+
+        self.assertIn("describe_gaql_resource", description)
+        self.assertLess(len(description), 10_000)
+
+    def test_invalid_query_is_rejected_locally(self):
+        """Tests that invalid fields fail before calling the API."""
+        with self.assertRaisesRegex(ValueError, "campaign.name"):
+            search_tool.search("123", ["campaign.nme"], "campaign")
+        with self.assertRaisesRegex(ValueError, "not sortable"):
+            search_tool.search(
+                "123",
+                ["campaign.id"],
+                "campaign",
+                orderings=["campaign.bidding_strategy DESC"],
+            )
+
+        self.service.search_stream.assert_not_called()
+
+    def test_search_customers_tags_rows_and_isolates_errors(self):
+        """Tests that rows are merged per customer and failures are reported."""
+
+        def search_stream(customer_id, query):
+            if customer_id == "2":
+                raise RuntimeError("customer 2 is not enabled")
+            return iter(_make_stream(int(customer_id)))
+
+        self.service.search_stream.side_effect = search_stream
+
+        result = asyncio.run(
+            search_tool.search_customers(
+                ["campaign.id"], "campaign", customer_ids=["1", "2", "3", "1"]
+            )
+        )
+
+        tagged_ids = [
+            (row["customer_id"], row["campaign.id"]) for row in result["rows"]
+        ]
+        self.assertEqual(tagged_ids, [("1", 0), ("3", 0), ("3", 1), ("3", 2)])
+        self.assertEqual(
+            result["errors"],
+            [{"customer_id": "2", "error": "customer 2 is not enabled"}],
+        )
+        self.assertEqual(self.service.search_stream.call_count, 3)
+
+    def test_search_customers_defaults_to_accessible_customers(self):
+        """Tests that all accessible customers are searched by default."""
+        self.service.list_accessible_customers.return_value = mock.Mock(
+            resource_names=["customers/1", "customers/2"]
+        )
+        self.service.search_stream.side_effect = lambda **_: iter(
+            _make_stream(1)
+        )
+
+        result = asyncio.run(
+            search_tool.search_customers(["campaign.id"], "campaign")
+        )
+
+        self.assertEqual(
+            [row["customer_id"] for row in result["rows"]], ["1", "2"]
+        )
+        self.assertEqual(result["errors"], [])
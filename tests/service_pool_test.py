@@ -0,0 +1,88 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the service_pool module."""
+
+import concurrent.futures
+import unittest
+
+from google.ads.googleads.client import GoogleAdsClient
+from google.oauth2.credentials import Credentials
+
+from ads_mcp import service_pool
+
+
+def _make_client(login_customer_id=None):
+    return GoogleAdsClient(
+        credentials=Credentials(token="token"),
+        developer_token="developer-token",
+        login_customer_id=login_customer_id,
+    )
+
+
+class TestServicePool(unittest.TestCase):
+    """Test cases for the service_pool module."""
+
+    def setUp(self):
+        self.pool = service_pool.ServicePool(keepalive_seconds=30)
+        self.addCleanup(self.pool.close)
+
+    def test_service_clients_are_cached(self):
+        """Tests that a service client is built once per name and client."""
+        client = _make_client()
+
+        service = self.pool.get(client, "GoogleAdsService")
+
+        self.assertIs(self.pool.get(client, "GoogleAdsService"), service)
+        self.assertIsNot(
+            self.pool.get(_make_client("1234567890"), "GoogleAdsService"),
+            service,
+        )
+
+    def test_services_share_a_channel(self):
+        """Tests that services of the same client share one channel."""
+        client = _make_client()
+
+        ads_service = self.pool.get(client, "GoogleAdsService")
+        customer_service = self.pool.get(client, "CustomerService")
+
+        self.assertIs(
+            ads_service.transport.grpc_channel,
+            customer_service.transport.grpc_channel,
+        )
+
+    def test_concurrent_gets_build_one_client(self):
+        """Tests that threads racing for a service get the same client."""
+        client = _make_client()
+
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            services = set(
+                map(
+                    id,
+                    pool.map(
+                        lambda _: self.pool.get(client, "GoogleAdsService"),
+                        range(32),
+                    ),
+                )
+            )
+
+        self.assertEqual(len(services), 1)
+
+    def test_keepalive_options(self):
+        """Tests that keep-alive pings can be disabled."""
+        self.assertEqual(service_pool._keepalive_options(0), [])
+        self.assertIn(
+            ("grpc.keepalive_time_ms", 30000),
+            service_pool._keepalive_options(30),
+        )
@@ -0,0 +1,203 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Test cases for the sheets_writer module."""
+
+import threading
+import unittest
+from unittest import mock
+
+from ads_mcp.sheets_sync import sheets_writer
+
+_HEADERS = ["ACCOUNT-ID", "Notes", "Clicks", "Impressions", "Owner", "CTR"]
+_SHEET = f"'{sheets_writer.SHEET_NAME}'"
+
+
+def _metrics(clicks):
+    return {
+        "customer_id": "1",
+        "clicks": clicks,
+        "impressions": clicks * 10,
+        "ctr": None,
+    }
+
+
+class TestSheetWriteBuffer(unittest.TestCase):
+    """Test cases for the sheets_writer module."""
+
+    def setUp(self):
+        self.service = mock.Mock()
+        patcher = mock.patch.object(
+            sheets_writer, "_get_sheets_service", return_value=self.service
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(
+            sheets_writer,
+            "_sheets_rate_limiter",
+            sheets_writer.TokenBucket(0),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.batch_update = (
+            self.service.spreadsheets.return_value.values.return_value.batchUpdate
+        )
+
+    def _sent_data(self):
+        return [
+            call.kwargs["body"]["data"]
+            for call in self.batch_update.call_args_list
+        ]
+
+    def test_adjacent_cells_and_rows_are_merged(self):
+        """Tests that runs of columns and consecutive rows share a range."""
+        buffer = sheets_writer.SheetWriteBuffer(flush_cells=0)
+        for row_index in (1, 2, 4):
+            self.assertTrue(buffer.add_row(row_index, _HEADERS, _metrics(1)))
+
+        self.assertEqual(buffer.flush(), set())
+
+        self.assertEqual(
+            self._sent_data(),
+            [
+                [
+                    {"range": f"{_SHEET}!A2:A3", "values": [["1"], ["1"]]},
+                    {"range": f"{_SHEET}!A5:A5", "values": [["1"]]},
+                    {
+                        "range": f"{_SHEET}!C2:D3",
+                        "values": [[1, 10], [1, 10]],
+                    },
+                    {"range": f"{_SHEET}!C5:D5", "values": [[1, 10]]},
+                    {"range": f"{_SHEET}!F2:F3", "values": [[""], [""]]},
+                    {"range": f"{_SHEET}!F5:F5", "values": [[""]]},
+                ]
+            ],
+        )
+
+    def test_requests_are_split_by_size(self):
+        """Tests that large flushes are split into several requests."""
+        buffer = sheets_writer.SheetWriteBuffer(
+            flush_cells=0, max_request_bytes=150
+        )
+        for row_index in (1, 3, 5):
+            buffer.add_row(row_index, _HEADERS, _metrics(row_index))
+
+        buffer.flush()
+
+        self.assertGreater(self.batch_update.call_count, 1)
+        ranges = [r["range"] for data in self._sent_data() for r in data]
+        self.assertEqual(len(ranges), 9)
+
+    def test_flushes_when_full(self):
+        """Tests that the buffer writes early once flush_cells is reached."""
+        buffer = sheets_writer.SheetWriteBuffer(flush_cells=8)
+
+        buffer.add_row(1, _HEADERS, _metrics(1))
+        self.batch_update.assert_not_called()
+        buffer.add_row(2, _HEADERS, _metrics(2))
+
+        self.batch_update.assert_called_once()
+        self.assertEqual(buffer.pending_cells(), 0)
+
+    def test_failed_rows_are_reported(self):
+        """Tests that rows of a failed request are recorded."""
+        self.batch_update.return_value.execute.side_effect = RuntimeError(
+            "quota"
+        )
+        buffer = sheets_writer.SheetWriteBuffer(flush_cells=0)
+        buffer.add_row(1, _HEADERS, _metrics(1))
+
+        self.assertEqual(buffer.flush(), {1})
+        self.assertEqual(buffer.failed_rows, {1})
+        self.assertFalse(sheets_writer.update_account_row(1, _HEADERS, {}))
+
+
+class TestSheetIndex(unittest.TestCase):
+    """Test cases for the SheetIndex class."""
+
+    def test_lookups(self):
+        """Tests that rows, mapped columns and managed accounts are indexed."""
+        values = [
+            ["Account ID", "Clicks", "Under Management"],
+            ["123-456-7890", 1, "Yes"],
+            ["111.0", 2, "no"],
+            ["1234567890", 3, "YES"],
+            ["222"],
+        ]
+
+        index = sheets_writer.SheetIndex(values, values[0])
+
+        self.assertEqual(index.find_row("1234567890"), 1)
+        self.assertEqual(index.find_row("111"), 2)
+        self.assertEqual(index.find_row("222"), 4)
+        self.assertEqual(index.find_row("333"), -1)
+        self.assertEqual(index.mapped_columns, [(1, "clicks")])
+        self.assertEqual(index.under_management, ["1234567890", "1234567890"])
+        self.assertEqual(
+            sheets_writer.find_under_management_accounts(values, values[0]),
+            index.under_management,
+        )
+
+    def test_without_management_column(self):
+        """Tests that every account is managed without the column."""
+        values = [["ACCOUNT-ID"], ["1"], [""], ["2"]]
+
+        index = sheets_writer.SheetIndex(values, values[0])
+
+        self.assertEqual(index.under_management, ["1", "2"])
+
+
+class TestSheetsService(unittest.TestCase):
+    """Test cases for the shared Sheets API service."""
+
+    def setUp(self):
+        for name, value in (
+            ("_sheets_service", None),
+            ("_thread_local", threading.local()),
+            ("_get_credentials", mock.Mock(return_value=mock.Mock())),
+        ):
+            patcher = mock.patch.object(sheets_writer, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    @mock.patch.object(sheets_writer, "build")
+    def test_service_is_built_once(self, mock_build):
+        """Tests that the service is built once from the bundled document."""
+        first = sheets_writer._get_sheets_service()
+        second = sheets_writer._get_sheets_service()
+
+        self.assertIs(first, second)
+        mock_build.assert_called_once()
+        self.assertTrue(mock_build.call_args.kwargs["static_discovery"])
+        self.assertIs(
+            mock_build.call_args.kwargs["requestBuilder"],
+            sheets_writer._build_request,
+        )
+
+    def test_transport_is_reused_per_thread(self):
+        """Tests that each thread reuses a transport of its own."""
+        first = sheets_writer._get_http()
+        other = []
+        thread = threading.Thread(
+            target=lambda: other.append(sheets_writer._get_http())
+        )
+        thread.start()
+        thread.join()
+
+        self.assertIs(sheets_writer._get_http(), first)
+        self.assertIsNot(other[0], first)
+        request = sheets_writer._build_request(
+            None, mock.Mock(), "https://sheets.googleapis.com/", method="GET"
+        )
+        self.assertIs(request.http, first)
@@ -0,0 +1,94 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the single_flight module."""
+
+import concurrent.futures
+import threading
+import time
+import unittest
+
+from ads_mcp import single_flight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test cases for the SingleFlight class."""
+
+    def setUp(self):
+        self.flight = single_flight.SingleFlight()
+
+    def _run_with_followers(self, outcome):
+        """Runs a call, joined by three followers while it is in flight.
+
+        Returns the leader's future then the followers' ones, and the number
+        of times the call ran.
+        """
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return outcome()
+
+        with concurrent.futures.ThreadPoolExecutor(4) as pool:
+            futures = [pool.submit(self.flight.do, "query", func)]
+            self.assertTrue(started.wait(5))
+            futures += [
+                pool.submit(self.flight.do, "query", func) for _ in range(3)
+            ]
+            # Gives the followers time to join before the call returns.
+            time.sleep(0.2)
+            release.set()
+            concurrent.futures.wait(futures, 5)
+        return futures, len(calls)
+
+    def test_concurrent_calls_share_one_result(self):
+        """Tests that callers joining a call in flight get its result."""
+        futures, calls = self._run_with_followers(lambda: ["row"])
+
+        results = [future.result() for future in futures]
+        self.assertEqual(calls, 1)
+        self.assertEqual(
+            [shared for _, shared in results], [False, True, True, True]
+        )
+        self.assertTrue(all(rows is results[0][0] for rows, _ in results))
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_errors_are_shared(self):
+        """Tests that callers joining a failed call get its error."""
+
+        def fail():
+            raise RuntimeError("quota")
+
+        futures, calls = self._run_with_followers(fail)
+
+        self.assertEqual(calls, 1)
+        for future in futures:
+            with self.assertRaises(RuntimeError):
+                future.result()
+        self.assertEqual(self.flight.in_flight(), 0)
+
+    def test_calls_after_completion_run_again(self):
+        """Tests that nothing is kept once a call has returned."""
+        self.assertEqual(self.flight.do("query", lambda: 1), (1, False))
+        self.assertEqual(self.flight.do("query", lambda: 2), (2, False))
+        self.assertEqual(self.flight.do("other", lambda: 3), (3, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,196 @@
+# Copyright 2025 Google LLC.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+"""Test cases for the telemetry module."""
+
+import asyncio
+import unittest
+from unittest import mock
+
+from starlette.testclient import TestClient
+
+from ads_mcp import coordinator
+from ads_mcp import fake_server
+from ads_mcp import metrics_interceptor
+from ads_mcp import telemetry
+from ads_mcp import utils
+from ads_mcp.sheets_sync import endpoint
+from ads_mcp.tools import core, reference  # noqa: F401
+from ads_mcp.tools import search as search_tool
+
+_QUERY = "SELECT campaign.id, campaign.name FROM campaign"
+
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for counters, histograms and their rendering."""
+
+    def setUp(self):
+        self.registry = telemetry.Registry()
+
+    def test_counter_renders_per_label_values(self):
+        """Tests that a counter is rendered with one sample per label set."""
+        counter = self.registry.counter("calls_total", "Calls.", ("code",))
+        counter.inc("OK")
+        counter.inc("OK", amount=2)
+        counter.inc('bad "x"')
+
+        self.assertEqual(counter.get("OK"), 3)
+        self.assertEqual(
+            self.registry.render(),
+            "# HELP calls_total Calls.\n"
+            "# TYPE calls_total counter\n"
+            'calls_total{code="OK"} 3\n'
+            'calls_total{code="bad \\"x\\""} 1\n',
+        )
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Tests that histogram buckets count every value up to their bound."""
+        histogram = self.registry.histogram(
+            "latency_seconds", "Latency.", buckets=(0.1, 1)
+        )
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.get_count(), 4)
+        self.assertAlmostEqual(histogram.get_sum(), 3.65)
+        self.assertEqual(
+            self.registry.render().splitlines()[2:],
+            [
+                'latency_seconds_bucket{le="0.1"} 2',
+                'latency_seconds_bucket{le="1"} 3',
+                'latency_seconds_bucket{le="+Inf"} 4',
+                "latency_seconds_sum 3.65",
+                "latency_seconds_count 4",
+            ],
+        )
+
+    def test_duplicate_names_are_rejected(self):
+        """Tests that a metric name can only be registered once."""
+        self.registry.counter("calls_total", "Calls.")
+
+        with self.assertRaises(ValueError):
+            self.registry.histogram("calls_total", "Calls.")
+
+    def test_disabled_metrics_record_nothing(self):
+        """Tests that GOOGLE_ADS_MCP_METRICS=0 turns recording off."""
+        counter = self.registry.counter("calls_total", "Calls.")
+        histogram = self.registry.histogram("latency_seconds", "Latency.")
+
+        with mock.patch.object(telemetry, "enabled", False):
+            counter.inc()
+            histogram.observe(1)
+
+        self.assertEqual(counter.get(), 0)
+        self.assertEqual(histogram.get_count(), 0)
+
+
+class TestInstrumentation(unittest.TestCase):
+    """Test cases for the metrics recorded by the server."""
+
+    def setUp(self):
+        self.config = fake_server.FakeServerConfig(
+            rows=25, batch_size=10, batch_latency=0.02
+        )
+        self.server = fake_server.FakeGoogleAdsServer(self.config)
+        utils.use_fake_server(self.server.start())
+        self.addCleanup(self.server.stop)
+        self.addCleanup(utils.use_fake_server, None)
+        search_tool._query_cache.clear()
+
+    def test_rpc_duration_covers_the_stream(self):
+        """Tests that RPCs are timed until their last batch, per status."""
+        duration = metrics_interceptor.RPC_DURATION
+        ok = ("GoogleAdsService", "SearchStream", "OK")
+        unavailable = ("GoogleAdsService", "SearchStream", "UNAVAILABLE")
+        ok_count = duration.get_count(*ok)
+        ok_sum = duration.get_sum(*ok)
+        unavailable_count = duration.get_count(*unavailable)
+        service = utils.get_googleads_service("GoogleAdsService")
+
+        list(service.search_stream(customer_id="1", query=_QUERY))
+        self.server.fail_next("UNAVAILABLE")
+        with self.assertRaises(Exception):
+            list(service.search_stream(customer_id="1", query=_QUERY))
+
+        self.assertEqual(duration.get_count(*ok), ok_count + 1)
+        # Three batches, each delayed by batch_latency.
+        self.assertGreaterEqual(duration.get_sum(*ok) - ok_sum, 0.06)
+        self.assertEqual(
+            duration.get_count(*unavailable), unavailable_count + 1
+        )
+
+    def test_search_records_rows_batches_and_cache(self):
+        """Tests that search counts rows, batches and cache lookups."""
+        rows = search_tool.SEARCH_ROWS.get()
+        batches = search_tool.SEARCH_BATCHES.get()
+        misses = search_tool.SEARCH_CACHE.get("miss")
+        hits = search_tool.SEARCH_CACHE.get("hit")
+        first_batches = search_tool.SEARCH_FIRST_BATCH.get_count()
+
+        for _ in range(2):
+            search_tool.search(
+                "123", ["campaign.id", "campaign.name"], "campaign"
+            )
+
+        self.assertEqual(search_tool.SEARCH_ROWS.get(), rows + 25)
+        self.assertEqual(search_tool.SEARCH_BATCHES.get(), batches + 3)
+        self.assertEqual(search_tool.SEARCH_CACHE.get("miss"), misses + 1)
+        self.assertEqual(search_tool.SEARCH_CACHE.get("hit"), hits + 1)
+        self.assertEqual(
+            search_tool.SEARCH_FIRST_BATCH.get_count(), first_batches + 1
+        )
+
+    def test_tool_calls_are_timed(self):
+        """Tests that tool calls are timed by tool and status."""
+        duration = coordinator.TOOL_DURATION
+        ok_count = duration.get_count("list_accessible_customers", "ok")
+        error_count = duration.get_count("find_gaql_fields", "error")
+
+        asyncio.run(coordinator.mcp.call_tool("list_accessible_customers", {}))
+        with self.assertRaises(Exception):
+            asyncio.run(
+                coordinator.mcp.call_tool(
+                    "find_gaql_fields", {"text": "x", "resource": "nope"}
+                )
+            )
+
+        self.assertEqual(
+            duration.get_count("list_accessible_customers", "ok"), ok_count + 1
+        )
+        self.assertEqual(
+            duration.get_count("find_gaql_fields", "error"), error_count + 1
+        )
+
+    def test_metrics_are_served(self):
+        """Tests that both HTTP apps serve the metrics."""
+        for app in (coordinator.mcp.sse_app(), endpoint.sync_app):
+            response = TestClient(app).get("/metrics")
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                response.headers["content-type"], telemetry.CONTENT_TYPE
+            )
+            self.assertIn(
+                "# TYPE google_ads_mcp_rpc_duration_seconds histogram",
+                response.text,
+            )
+            self.assertIn(
+                "# TYPE sheets_sync_job_duration_seconds histogram",
+                response.text,
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
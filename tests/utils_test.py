@@ -15,9 +15,13 @@
 """Test cases for the utils module."""
 
 import unittest
+from unittest import mock
 from google.ads.googleads.v21.enums.types.campaign_status import (
     CampaignStatusEnum,
 )
+from google.ads.googleads.v21.services.types.google_ads_service import (
+    GoogleAdsRow,
+)
 
 from ads_mcp import utils
 
@@ -35,3 +39,156 @@ class TestUtils(unittest.TestCase):
             ),
             "ENABLED",
         )
+
+    def test_googleads_client_is_built_once(self):
+        """Tests that the client is built lazily, once."""
+        client = mock.Mock()
+        with (
+            mock.patch.object(utils, "_googleads_client", None),
+            mock.patch.object(
+                utils, "_get_googleads_client", return_value=client
+            ) as build,
+        ):
+            self.assertIs(utils.get_googleads_client(), client)
+            self.assertIs(utils.get_googleads_client(), client)
+
+        build.assert_called_once()
+
+    def test_format_output_row_resolves_reserved_names(self):
+        """Tests that reserved proto field names are resolved."""
+        row = GoogleAdsRow({"ad_group_ad": {"ad": {"type_": 15}}})
+
+        self.assertEqual(
+            utils.format_output_row(row, ["ad_group_ad.ad.type"]),
+            {"ad_group_ad.ad.type": "RESPONSIVE_SEARCH_AD"},
+        )
+        self.assertEqual(
+            utils.format_output_row(
+                GoogleAdsRow.pb(row), ["ad_group_ad.ad.type"]
+            ),
+            {"ad_group_ad.ad.type": 15},
+        )
+
+    def test_compile_row_extractor_is_cached(self):
+        """Tests that field paths are compiled once per row type."""
+        fields = ("campaign.id", "campaign.name", "campaign.unknown_field")
+        extract = utils.compile_row_extractor(GoogleAdsRow, fields)
+
+        self.assertIs(
+            utils.compile_row_extractor(GoogleAdsRow, fields), extract
+        )
+        with self.assertLogs(utils.logger, level="ERROR"):
+            self.assertEqual(
+                extract(GoogleAdsRow({"campaign": {"id": 7, "name": "c"}})),
+                {
+                    "campaign.id": 7,
+                    "campaign.name": "c",
+                    "campaign.unknown_field": None,
+                },
+            )
+
+    def test_compile_row_values_extractor(self):
+        """Tests that rows are converted to values in the order of fields."""
+        fields = ("campaign.name", "campaign.id", "campaign.unknown_field")
+        extract = utils.compile_row_values_extractor(GoogleAdsRow, fields)
+        row = GoogleAdsRow({"campaign": {"id": 7, "name": "c"}})
+
+        with self.assertLogs(utils.logger, level="ERROR"):
+            self.assertEqual(extract(row), ["c", 7, None])
+        with self.assertLogs(utils.logger, level="ERROR"):
+            self.assertEqual(
+                extract(GoogleAdsRow.pb(row)),
+                list(
+                    utils.compile_row_extractor(GoogleAdsRow, fields)(
+                        row
+                    ).values()
+                ),
+            )
+
+    def test_get_row_value_types(self):
+        """Tests that value types are read from the field descriptors."""
+        fields = (
+            "campaign.id",
+            "campaign.status",
+            "metrics.ctr",
+            "ad_group_ad.ad.final_urls",
+            "ad_group_ad.ad.responsive_search_ad.headlines",
+            "campaign.network_settings",
+            "campaign.unknown_field",
+        )
+        raw_row_type = type(GoogleAdsRow.pb(GoogleAdsRow()))
+
+        self.assertEqual(
+            utils.get_row_value_types(raw_row_type, fields),
+            (
+                ("integer", False),
+                ("integer", False),
+                ("number", False),
+                ("string", True),
+                ("string", True),
+                ("object", False),
+                None,
+            ),
+        )
+        self.assertEqual(
+            utils.get_row_value_types(GoogleAdsRow, fields)[1],
+            ("string", False),
+        )
+
+    def test_descriptor_converters_match_generic_conversion(self):
+        """Tests that the descriptor-driven fast path keeps the output."""
+        row = GoogleAdsRow(
+            {
+                "campaign": {
+                    "id": 1,
+                    "status": 2,
+                    "excluded_parent_asset_field_types": [2, 3],
+                    "frequency_caps": [{"cap": 3}],
+                },
+                "ad_group_ad": {
+                    "ad": {
+                        "type_": 15,
+                        "final_urls": ["https://example.com"],
+                        "responsive_search_ad": {
+                            "headlines": [{"text": "h1"}, {"text": "h2"}]
+                        },
+                    }
+                },
+                "change_event": {"changed_fields": {"paths": ["name"]}},
+            }
+        )
+        fields = [
+            "campaign.id",
+            "campaign.status",
+            "campaign.excluded_parent_asset_field_types",
+            "campaign.frequency_caps",
+            "ad_group_ad.ad.type",
+            "ad_group_ad.ad.final_urls",
+            "ad_group_ad.ad.responsive_search_ad",
+            "ad_group_ad.ad.responsive_search_ad.headlines",
+            "change_event.changed_fields",
+            "campaign",
+        ]
+
+        for message in (row, GoogleAdsRow.pb(row)):
+            expected = {
+                field: utils._format_output_value_generic(
+                    utils.get_nested_attr_safe(message, field)
+                )
+                for field in fields
+            }
+            self.assertEqual(utils.format_output_row(message, fields), expected)
+            self.assertEqual(
+                utils.format_output_value(message),
+                utils._format_output_value_generic(message),
+            )
+        self.assertEqual(
+            utils.format_output_row(
+                row, ["ad_group_ad.ad.responsive_search_ad"]
+            ),
+            {
+                "ad_group_ad.ad.responsive_search_ad": {
+                    "headlines": ["h1", "h2"]
+                }
+            },
+        )